@@ -1 +1,4 @@
+from time import perf_counter
 
+# Recorded as early as possible so startup can report how long imports took.
+IMPORT_STARTED = perf_counter()
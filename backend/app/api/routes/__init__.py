@@ -1,3 +1,3 @@
-from app.api.routes import auth, github, review
+from app.api.routes import auth, github, metrics, review
 
-__all__ = ["auth", "github", "review"]
+__all__ = ["auth", "github", "metrics", "review"]
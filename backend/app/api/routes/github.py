@@ -1,12 +1,16 @@
+import json
 import secrets
+from typing import AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import RedirectResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import RedirectResponse, StreamingResponse
 from jose import JWTError
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.core.config import get_settings
+from app.core import metrics
+from app.core.cache import StaleWhileRevalidateCache
 from app.core.database import get_db
 from app.core.security import (
     create_access_token,
@@ -18,12 +22,31 @@ from app.models.user import User
 from app.schemas.github import ReposPendingPullsResponse
 from app.services.github_service import GitHubService
 from app.services.github_oauth_service import GitHubOAuthService
+from app.services.review_service import ReviewService
 from app.services.token_crypto import decrypt_secret, encrypt_secret
+from app.services.webhook_service import (
+    REVIEWABLE_ACTIONS,
+    WebhookReviewQueue,
+    build_jobs,
+    find_connected_users,
+    verify_signature,
+)
 
 router = APIRouter(prefix="/github", tags=["github"])
 settings = get_settings()
 oauth_service = GitHubOAuthService()
 github_service = GitHubService()
+webhook_queue = WebhookReviewQueue(ReviewService())
+pending_prs_cache = StaleWhileRevalidateCache(
+    name="repos_pending_prs",
+    soft_ttl=settings.REPOS_CACHE_SOFT_TTL_SECONDS,
+    hard_ttl=settings.REPOS_CACHE_HARD_TTL_SECONDS,
+    max_entries=settings.REPOS_CACHE_MAX_ENTRIES,
+)
+
+
+def _invalidate_pending_prs(user_id: int) -> None:
+    pending_prs_cache.invalidate(lambda key: key[0] == user_id)
 
 
 def _get_connected_token(current_user: User) -> str:
@@ -54,21 +77,97 @@ def github_status(current_user: User = Depends(get_current_user)):
     }
 
 
+async def _ndjson(events: AsyncIterator[dict]) -> AsyncIterator[str]:
+    async for event in events:
+        yield json.dumps(event) + "\n"
+
+
+async def _snapshot_events(snapshot: ReposPendingPullsResponse) -> AsyncIterator[dict]:
+    yield {"type": "started", "total_repos_scanned": snapshot.total_repos_scanned}
+    for position, repo in enumerate(snapshot.repos):
+        yield {"type": "repo", "position": position, **repo.model_dump()}
+    yield {
+        "type": "summary",
+        "total_repos_scanned": snapshot.total_repos_scanned,
+        "repos": len(snapshot.repos),
+        "errors": 0,
+    }
+
+
+async def _stream_live_pending_prs(
+    token: str, cache_key: tuple, cache_status: str, **params
+) -> StreamingResponse:
+    epoch = pending_prs_cache.epoch
+    events = github_service.stream_repos_with_pending_prs(token=token, **params)
+    # The repo listing happens before the first event, so token and rate-limit errors
+    # still get their own status code instead of a broken 200 stream.
+    started = await anext(events)
+
+    async def body() -> AsyncIterator[dict]:
+        entries = []
+        try:
+            yield started
+            async for event in events:
+                if event["type"] == "repo":
+                    entries.append(event)
+                elif event["type"] == "summary" and not event["errors"]:
+                    entries.sort(key=lambda entry: entry["position"])
+                    snapshot = ReposPendingPullsResponse(
+                        total_repos_scanned=event["total_repos_scanned"], repos=entries
+                    )
+                    pending_prs_cache.put(cache_key, snapshot, epoch)
+                yield event
+        finally:
+            await events.aclose()
+
+    metrics.CACHE_EVENTS_TOTAL.inc(cache=pending_prs_cache.name, event=cache_status)
+    headers = {"Age": "0", "X-Cache": cache_status.upper(), "Vary": "Accept"}
+    return StreamingResponse(_ndjson(body()), media_type="application/x-ndjson", headers=headers)
+
+
 @router.get("/repos-pending-prs", response_model=ReposPendingPullsResponse)
 async def list_repos_pending_prs(
+    request: Request,
+    response: Response,
     max_repos: int = Query(default=25, ge=1, le=100),
     pulls_per_repo: int = Query(default=5, ge=1, le=20),
     only_with_open: bool = Query(default=False),
+    refresh: bool = Query(default=False),
     current_user: User = Depends(get_current_user),
 ):
     token = _get_connected_token(current_user)
-    total_repos_scanned, repos = await github_service.list_repos_with_pending_prs(
-        token=token,
-        max_repos=max_repos,
-        pulls_per_repo=pulls_per_repo,
-        only_with_open=only_with_open,
-    )
-    return ReposPendingPullsResponse(total_repos_scanned=total_repos_scanned, repos=repos)
+
+    async def load() -> ReposPendingPullsResponse:
+        total_repos_scanned, repos = await github_service.list_repos_with_pending_prs(
+            token=token,
+            max_repos=max_repos,
+            pulls_per_repo=pulls_per_repo,
+            only_with_open=only_with_open,
+        )
+        return ReposPendingPullsResponse(total_repos_scanned=total_repos_scanned, repos=repos)
+
+    cache_key = (current_user.id, max_repos, pulls_per_repo, only_with_open)
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        if refresh or not pending_prs_cache.peek(cache_key):
+            return await _stream_live_pending_prs(
+                token,
+                cache_key,
+                "refresh" if refresh else "miss",
+                max_repos=max_repos,
+                pulls_per_repo=pulls_per_repo,
+                only_with_open=only_with_open,
+            )
+        snapshot, age, cache_status = await pending_prs_cache.get(cache_key, load)
+        headers = {"Age": str(int(age)), "X-Cache": cache_status.upper(), "Vary": "Accept"}
+        return StreamingResponse(
+            _ndjson(_snapshot_events(snapshot)), media_type="application/x-ndjson", headers=headers
+        )
+
+    snapshot, age, cache_status = await pending_prs_cache.get(cache_key, load, force_refresh=refresh)
+    response.headers["Age"] = str(int(age))
+    response.headers["X-Cache"] = cache_status.upper()
+    response.headers["Vary"] = "Accept"
+    return snapshot
 
 
 @router.post("/disconnect")
@@ -81,9 +180,58 @@ def disconnect_github(
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    _invalidate_pending_prs(current_user.id)
     return {"connected": False}
 
 
+@router.post("/webhook", status_code=status.HTTP_202_ACCEPTED)
+async def github_webhook(
+    request: Request,
+    x_github_event: str = Header(default=""),
+    x_github_delivery: str = Header(default=""),
+    x_hub_signature_256: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    if not settings.GITHUB_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="GitHub webhooks are not configured")
+
+    body = await request.body()
+    if not verify_signature(settings.GITHUB_WEBHOOK_SECRET, body, x_hub_signature_256):
+        metrics.WEBHOOK_EVENTS_TOTAL.inc(outcome="bad_signature")
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    if x_github_event == "ping":
+        return {"status": "pong"}
+
+    try:
+        payload = json.loads(body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Webhook body is not valid JSON") from exc
+
+    if x_github_event != "pull_request" or payload.get("action") not in REVIEWABLE_ACTIONS:
+        metrics.WEBHOOK_EVENTS_TOTAL.inc(outcome="ignored")
+        return {"status": "ignored"}
+
+    if x_github_delivery and not webhook_queue.mark_delivery(x_github_delivery):
+        metrics.WEBHOOK_EVENTS_TOTAL.inc(outcome="duplicate")
+        return {"status": "duplicate"}
+
+    jobs = build_jobs(x_github_delivery, payload, find_connected_users(db, payload))
+    if not jobs:
+        metrics.WEBHOOK_EVENTS_TOTAL.inc(outcome="no_connected_user")
+        return {"status": "ignored"}
+
+    try:
+        queued = webhook_queue.enqueue(jobs)
+    except HTTPException:
+        # Let a GitHub redelivery through once the queue has drained.
+        webhook_queue.forget_delivery(x_github_delivery)
+        metrics.WEBHOOK_EVENTS_TOTAL.inc(outcome="queue_full")
+        raise
+    metrics.WEBHOOK_EVENTS_TOTAL.inc(outcome="queued")
+    return {"status": "queued", "reviews": queued}
+
+
 @router.get("/callback")
 async def github_callback(
     code: str | None = Query(default=None),
@@ -133,6 +281,7 @@ async def github_callback(
         user.github_username = username
         db.add(user)
         db.commit()
+        _invalidate_pending_prs(user.id)
         return RedirectResponse(f"{dashboard_url}?github=connected")
 
     github_id_raw = github_user.get("id")
@@ -1,15 +1,44 @@
-from fastapi import APIRouter, Depends
+import json
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
 from app.models.review import Review
 from app.models.user import User
-from app.schemas.review import ReviewRequest, ReviewResponse
+from app.schemas.review import (
+    BatchReviewRequest,
+    FlaggedFile,
+    PublishReviewRequest,
+    ReviewIssueOut,
+    ReviewPerformanceResponse,
+    ReviewPublicationResponse,
+    ReviewRequest,
+    ReviewResponse,
+    ReviewSearchHit,
+    ReviewSearchResponse,
+    ReviewStatsResponse,
+)
+from app.services.export_service import ReviewExportService
+from app.services.issue_service import ReviewIssueService
+from app.services.publish_service import ReviewPublishService
 from app.services.review_service import ReviewService, summarize_severity
+from app.services.search_service import ReviewSearchService
+from app.services.stats_service import ReviewStatsService
+from app.services.usage_service import ReviewUsageService
 
 router = APIRouter(tags=["reviews"])
 review_service = ReviewService()
+search_service = ReviewSearchService()
+issue_service = ReviewIssueService()
+stats_service = ReviewStatsService()
+export_service = ReviewExportService()
+usage_service = ReviewUsageService()
+publish_service = ReviewPublishService()
 
 
 @router.post("/review", response_model=ReviewResponse)
@@ -33,6 +62,22 @@ async def create_review(
     )
 
 
+@router.post("/review/batch")
+async def create_batch_review(
+    payload: BatchReviewRequest,
+    current_user: User = Depends(get_current_user),
+):
+    token = review_service.resolve_token(payload.github_token, current_user)
+    await review_service.ensure_token_valid(token)
+    targets = await review_service.resolve_batch_targets(payload, token)
+
+    async def event_stream():
+        async for event in review_service.stream_batch_review(targets, token, current_user.id):
+            yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
 @router.get("/reviews", response_model=list[ReviewResponse])
 def list_reviews(
     db: Session = Depends(get_db),
@@ -62,3 +107,122 @@ def list_reviews(
         )
 
     return response
+
+
+@router.get("/reviews/export")
+def export_reviews(
+    format: Literal["ndjson", "csv"] = Query(default="ndjson"),
+    repo: str | None = Query(default=None, max_length=255, description="owner/name"),
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    current_user: User = Depends(get_current_user),
+):
+    filters = {"repo_name": repo, "since": since, "until": until}
+    if format == "csv":
+        body, media_type = export_service.csv(current_user.id, **filters), "text/csv; charset=utf-8"
+    else:
+        body, media_type = export_service.ndjson(current_user.id, **filters), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="reviews.{format}"'},
+    )
+
+
+@router.get("/reviews/search", response_model=ReviewSearchResponse)
+def search_reviews(
+    q: str | None = Query(default=None, max_length=200),
+    severity: Literal["low", "medium", "high"] | None = Query(default=None),
+    file: str | None = Query(default=None, max_length=255),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    # Fetch one extra row to know whether another page exists without a COUNT query.
+    rows = search_service.search(db, current_user.id, q, severity, file, limit + 1, offset)
+    return ReviewSearchResponse(
+        query=q,
+        limit=limit,
+        offset=offset,
+        has_more=len(rows) > limit,
+        results=[ReviewSearchHit(**row) for row in rows[:limit]],
+    )
+
+
+@router.get("/reviews/issues", response_model=list[ReviewIssueOut])
+def list_review_issues(
+    severity: Literal["low", "medium", "high"] | None = Query(default=None),
+    repo: str | None = Query(default=None, max_length=255, description="owner/name"),
+    file: str | None = Query(default=None, max_length=1024),
+    file_prefix: str | None = Query(default=None, max_length=1024),
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return issue_service.list_issues(
+        db,
+        current_user.id,
+        severity=severity,
+        repo_name=repo,
+        file=file,
+        file_prefix=file_prefix,
+        since=since,
+        until=until,
+        limit=limit,
+        offset=offset,
+    )
+
+
+@router.get("/reviews/issues/files", response_model=list[FlaggedFile])
+def list_flagged_files(
+    repo: str | None = Query(default=None, max_length=255, description="owner/name"),
+    severity: Literal["low", "medium", "high"] | None = Query(default=None),
+    since: datetime | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return issue_service.top_files(
+        db, current_user.id, repo_name=repo, severity=severity, since=since, limit=limit
+    )
+
+
+@router.get("/reviews/stats", response_model=ReviewStatsResponse)
+def review_stats(
+    repo: str | None = Query(default=None, max_length=255, description="owner/name"),
+    days: int = Query(default=30, ge=1, le=366),
+    top_files: int = Query(default=10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return stats_service.stats(db, current_user.id, repo, days, top_files)
+
+
+@router.get("/reviews/stats/performance", response_model=ReviewPerformanceResponse)
+def review_performance(
+    repo: str | None = Query(default=None, max_length=255, description="owner/name"),
+    days: int = Query(default=30, ge=1, le=366),
+    top_repos: int = Query(default=20, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return usage_service.performance(db, current_user.id, repo, days, top_repos)
+
+
+@router.post("/reviews/{review_id}/publish", response_model=ReviewPublicationResponse)
+async def publish_review(
+    review_id: int,
+    payload: PublishReviewRequest | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    payload = payload or PublishReviewRequest()
+    review = db.query(Review).filter(Review.id == review_id, Review.user_id == current_user.id).first()
+    if review is None:
+        raise HTTPException(status_code=404, detail="Review not found")
+    token = review_service.resolve_token(payload.github_token, current_user)
+    return await publish_service.publish(db, review, token, payload.max_comments)
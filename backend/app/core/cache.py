@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return monotonic() - self.fetched_at
+
+
+class StaleWhileRevalidateCache:
+    """Bounded LRU that serves cached values immediately and refreshes them in the background.
+
+    Entries older than `soft_ttl` are returned as-is while a single background
+    refresh runs; entries older than `hard_ttl` are reloaded before returning.
+    Concurrent misses for the same key share one load.
+    """
+
+    def __init__(self, name: str, soft_ttl: float, hard_ttl: float, max_entries: int) -> None:
+        self.name = name
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = max(hard_ttl, soft_ttl)
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._generation: dict[Hashable, int] = {}
+        # Bumped by every invalidate(); lets put() drop values that were loaded before one.
+        self.epoch = 0
+
+    def _store(self, key: Hashable, value: Any) -> CacheEntry:
+        entry = CacheEntry(value=value, fetched_at=monotonic())
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            metrics.CACHE_EVENTS_TOTAL.inc(cache=self.name, event="evicted")
+        return entry
+
+    def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+
+        generation = self._generation.get(key, 0)
+
+        async def run() -> CacheEntry:
+            try:
+                value = await loader()
+                if self._generation.get(key, 0) != generation:
+                    # Invalidated while loading: hand the value to the waiting caller only.
+                    return CacheEntry(value=value, fetched_at=monotonic())
+                return self._store(key, value)
+            finally:
+                self._inflight.pop(key, None)
+                self._generation.pop(key, None)
+
+        task = asyncio.create_task(run())
+        self._inflight[key] = task
+        return task
+
+    def _refresh_in_background(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._inflight:
+            return
+        task = self._load(key, loader)
+
+        def log_failure(finished: asyncio.Task) -> None:
+            if not finished.cancelled() and finished.exception() is not None:
+                metrics.CACHE_EVENTS_TOTAL.inc(cache=self.name, event="refresh_failed")
+                logger.warning("Background refresh of %s failed: %s", self.name, finished.exception())
+
+        task.add_done_callback(log_failure)
+
+    async def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        force_refresh: bool = False,
+    ) -> tuple[Any, float, str]:
+        """Return (value, age_seconds, status) where status is hit, stale, miss or refresh."""
+        entry = self._entries.get(key)
+
+        if entry is not None and not force_refresh and entry.age < self.hard_ttl:
+            self._entries.move_to_end(key)
+            if entry.age >= self.soft_ttl:
+                self._refresh_in_background(key, loader)
+                metrics.CACHE_EVENTS_TOTAL.inc(cache=self.name, event="stale")
+                return entry.value, entry.age, "stale"
+            metrics.CACHE_EVENTS_TOTAL.inc(cache=self.name, event="hit")
+            return entry.value, entry.age, "hit"
+
+        status = "refresh" if force_refresh else "miss"
+        metrics.CACHE_EVENTS_TOTAL.inc(cache=self.name, event=status)
+        loaded = await asyncio.shield(self._load(key, loader))
+        return loaded.value, loaded.age, status
+
+    def peek(self, key: Hashable) -> bool:
+        """Whether get() would answer from the cache without waiting for a load."""
+        entry = self._entries.get(key)
+        return entry is not None and entry.age < self.hard_ttl
+
+    def put(self, key: Hashable, value: Any, epoch: int) -> None:
+        """Store a value loaded outside get(); `epoch` is self.epoch from before the load started."""
+        if epoch == self.epoch:
+            self._store(key, value)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        self.epoch += 1
+        removed = [key for key in list(self._entries) if predicate(key)]
+        for key in removed:
+            del self._entries[key]
+        for key in list(self._inflight):
+            if predicate(key):
+                # Loads already running must not write their result back.
+                self._generation[key] = self._generation.get(key, 0) + 1
+        return len(removed)
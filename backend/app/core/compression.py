@@ -0,0 +1,92 @@
+import base64
+import gzip
+import json
+import logging
+from typing import Any
+
+from sqlalchemy import JSON
+from sqlalchemy.types import TypeDecorator
+
+from app.core.config import get_settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+CODEC_KEY = "__codec__"
+SUPPORTED_CODECS = ("gzip", "zstd")
+
+
+def resolve_codec(requested: str | None = None) -> str | None:
+    codec = (requested if requested is not None else settings.RESULT_COMPRESSION).strip().lower()
+    if codec in ("", "none", "off"):
+        return None
+    if codec == "zstd" and zstandard is None:
+        logger.warning("RESULT_COMPRESSION=zstd but 'zstandard' is not installed; falling back to gzip")
+        return "gzip"
+    if codec not in SUPPORTED_CODECS:
+        logger.warning("Unknown RESULT_COMPRESSION %r; storing results uncompressed", codec)
+        return None
+    return codec
+
+
+def compress_bytes(raw: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    return gzip.compress(raw, compresslevel=6, mtime=0)
+
+
+def decompress_bytes(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Stored payload is zstd-compressed but 'zstandard' is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    raise ValueError(f"Unsupported payload codec: {codec}")
+
+
+def dumps_compact(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def encode_payload(value: Any, codec: str | None = None, min_bytes: int | None = None) -> Any:
+    """Wrap a JSON value in a compressed envelope when it is worth it."""
+    codec = resolve_codec(codec)
+    if codec is None or value is None:
+        return value
+
+    raw = dumps_compact(value)
+    threshold = settings.RESULT_COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+    if len(raw) < threshold:
+        return value
+
+    packed = base64.b64encode(compress_bytes(raw, codec)).decode("ascii")
+    return {CODEC_KEY: codec, "data": packed}
+
+
+def decode_payload(value: Any) -> Any:
+    if not isinstance(value, dict) or CODEC_KEY not in value:
+        return value
+    data = base64.b64decode(value.get("data", ""))
+    return json.loads(decompress_bytes(data, str(value[CODEC_KEY])))
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON column that transparently stores large values in a compressed envelope.
+
+    Rows written before compression was enabled are plain JSON and are returned unchanged.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Any:
+        return encode_payload(value)
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        return decode_payload(value)
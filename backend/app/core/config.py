@@ -9,11 +9,27 @@ load_dotenv(BASE_DIR / ".env")
 load_dotenv()
 
 
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "on"}
+
+
 class Settings:
     APP_NAME: str = os.getenv("APP_NAME", "AI PR Review Agent API")
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
 
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT_SECONDS: int = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PRE_PING: bool = _env_bool("DB_POOL_PRE_PING", "false")
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_QUERY_CACHE_SIZE: int = int(os.getenv("DB_QUERY_CACHE_SIZE", "1000"))
+    DB_PREPARE_THRESHOLD: int = int(os.getenv("DB_PREPARE_THRESHOLD", "5"))
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
 
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "change-me-in-production")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
@@ -45,21 +61,95 @@ class Settings:
     )
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:5173")
     TOKEN_ENCRYPTION_KEY: str = os.getenv("TOKEN_ENCRYPTION_KEY", "")
+    REPOS_CACHE_SOFT_TTL_SECONDS: int = int(os.getenv("REPOS_CACHE_SOFT_TTL_SECONDS", "60"))
+    REPOS_CACHE_HARD_TTL_SECONDS: int = int(os.getenv("REPOS_CACHE_HARD_TTL_SECONDS", "900"))
+    REPOS_CACHE_MAX_ENTRIES: int = int(os.getenv("REPOS_CACHE_MAX_ENTRIES", "1000"))
+    GITHUB_WEBHOOK_SECRET: str = os.getenv("GITHUB_WEBHOOK_SECRET", "")
+    WEBHOOK_QUEUE_SIZE: int = int(os.getenv("WEBHOOK_QUEUE_SIZE", "100"))
+    WEBHOOK_WORKERS: int = int(os.getenv("WEBHOOK_WORKERS", "1"))
+    WEBHOOK_DEDUP_SIZE: int = int(os.getenv("WEBHOOK_DEDUP_SIZE", "5000"))
 
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "ollama").strip().lower()
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    OLLAMA_BASE_URLS_RAW: str = os.getenv("OLLAMA_BASE_URLS", "")
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama3")
+    OLLAMA_NUM_CTX: int = int(os.getenv("OLLAMA_NUM_CTX", "8192"))
+    OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    OLLAMA_WARMUP_ON_STARTUP: bool = _env_bool("OLLAMA_WARMUP_ON_STARTUP", "true")
+    OLLAMA_HEALTH_CHECK_INTERVAL_SECONDS: int = int(os.getenv("OLLAMA_HEALTH_CHECK_INTERVAL_SECONDS", "15"))
+    OLLAMA_EJECT_AFTER_FAILURES: int = int(os.getenv("OLLAMA_EJECT_AFTER_FAILURES", "3"))
+    OLLAMA_EJECT_SECONDS: int = int(os.getenv("OLLAMA_EJECT_SECONDS", "30"))
+    OPENAI_BASE_URLS_RAW: str = os.getenv("OPENAI_BASE_URLS", "http://localhost:8080")
+    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "")
+    OPENAI_PARALLEL_SLOTS: int = int(os.getenv("OPENAI_PARALLEL_SLOTS", "4"))
     LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
     LLM_TIMEOUT_SECONDS: int = int(os.getenv("LLM_TIMEOUT_SECONDS", "90"))
     MAX_DIFF_CHARS: int = int(os.getenv("MAX_DIFF_CHARS", "18000"))
+    LLM_TRIAGE_MODEL: str = os.getenv("LLM_TRIAGE_MODEL", "").strip()
+    LLM_ESCALATE_SEVERITY: str = os.getenv("LLM_ESCALATE_SEVERITY", "high").strip().lower()
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "2"))
+    BATCH_DIFF_CONCURRENCY: int = int(os.getenv("BATCH_DIFF_CONCURRENCY", "4"))
+    BATCH_MAX_PULLS: int = int(os.getenv("BATCH_MAX_PULLS", "50"))
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+    DIFF_MINIMIZE_ENABLED: bool = _env_bool("DIFF_MINIMIZE_ENABLED", "true")
+    DIFF_CONTEXT_LINES: int = int(os.getenv("DIFF_CONTEXT_LINES", "2"))
+    DIFF_MAX_LINE_CHARS: int = int(os.getenv("DIFF_MAX_LINE_CHARS", "300"))
+    PUBLISH_MAX_COMMENTS: int = int(os.getenv("PUBLISH_MAX_COMMENTS", "25"))
+    HUNK_MEMO_ENABLED: bool = _env_bool("HUNK_MEMO_ENABLED", "true")
+    HUNK_MEMO_RETENTION_DAYS: int = int(os.getenv("HUNK_MEMO_RETENTION_DAYS", "30"))
+    STATIC_SCAN_ENABLED: bool = _env_bool("STATIC_SCAN_ENABLED", "true")
+    STATIC_SCAN_WORKERS: int = int(os.getenv("STATIC_SCAN_WORKERS", "2"))
+    STATIC_SCAN_CHECKERS_RAW: str = os.getenv("STATIC_SCAN_CHECKERS", "secrets,sql_injection,python_ast")
+    STATIC_SCAN_SKIP_TRIVIAL: bool = _env_bool("STATIC_SCAN_SKIP_TRIVIAL", "true")
+
+    LOOP_LAG_CHECK_INTERVAL_MS: int = int(os.getenv("LOOP_LAG_CHECK_INTERVAL_MS", "100"))
+    SHED_MAX_LOOP_LAG_MS: int = int(os.getenv("SHED_MAX_LOOP_LAG_MS", "500"))
+    SHED_MAX_QUEUE_DEPTH: int = int(os.getenv("SHED_MAX_QUEUE_DEPTH", "20"))
+    SHED_RETRY_AFTER_SECONDS: int = int(os.getenv("SHED_RETRY_AFTER_SECONDS", "5"))
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "2"))
+    HEALTH_GITHUB_TTL_SECONDS: int = int(os.getenv("HEALTH_GITHUB_TTL_SECONDS", "60"))
 
     GENERAL_RATE_LIMIT_PER_MIN: int = int(os.getenv("GENERAL_RATE_LIMIT_PER_MIN", "120"))
     REVIEW_RATE_LIMIT_PER_MIN: int = int(os.getenv("REVIEW_RATE_LIMIT_PER_MIN", "20"))
 
+    RESULT_COMPRESSION: str = os.getenv("RESULT_COMPRESSION", "none").strip().lower()
+    RESULT_COMPRESSION_MIN_BYTES: int = int(os.getenv("RESULT_COMPRESSION_MIN_BYTES", "1024"))
+    RESPONSE_COMPRESSION_ENABLED: bool = _env_bool("RESPONSE_COMPRESSION_ENABLED", "true")
+    RESPONSE_COMPRESSION_MIN_BYTES: int = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+    REVIEW_RETENTION_DAYS: int = int(os.getenv("REVIEW_RETENTION_DAYS", "180"))
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+
+    METRICS_ENABLED: bool = _env_bool("METRICS_ENABLED", "true")
+    REQUEST_TIMING_ENABLED: bool = _env_bool("REQUEST_TIMING_ENABLED", "true")
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "./profiles")
+
     @property
     def cors_origins(self) -> list[str]:
         origins = [origin.strip() for origin in self.CORS_ORIGINS_RAW.split(",") if origin.strip()]
         return origins or ["http://localhost:5173"]
 
+    @property
+    def ollama_base_urls(self) -> list[str]:
+        urls = [url.strip().rstrip("/") for url in self.OLLAMA_BASE_URLS_RAW.split(",") if url.strip()]
+        return urls or [self.OLLAMA_BASE_URL.rstrip("/")]
+
+    @property
+    def openai_base_urls(self) -> list[str]:
+        return [url.strip().rstrip("/") for url in self.OPENAI_BASE_URLS_RAW.split(",") if url.strip()]
+
+    @property
+    def llm_model(self) -> str:
+        if self.LLM_BACKEND == "openai" and self.OPENAI_MODEL:
+            return self.OPENAI_MODEL
+        return self.OLLAMA_MODEL
+
+    @property
+    def static_scan_checkers(self) -> list[str]:
+        return [name.strip() for name in self.STATIC_SCAN_CHECKERS_RAW.split(",") if name.strip()]
+
     @property
     def cors_allow_origin_regex(self) -> str | None:
         regex = self.CORS_ALLOW_ORIGIN_REGEX.strip()
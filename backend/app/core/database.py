@@ -1,46 +1,98 @@
-from sqlalchemy import create_engine, inspect, text
+from time import perf_counter
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-from app.core.config import get_settings
+from app.core import metrics
+from app.core.config import Settings, get_settings
 
 settings = get_settings()
 
 is_sqlite = settings.DATABASE_URL.startswith("sqlite")
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if is_sqlite else {},
-    pool_pre_ping=True,
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
 
+def _sqlite_engine_options(config: Settings) -> dict:
+    return {
+        "connect_args": {
+            "check_same_thread": False,
+            "timeout": config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+        "query_cache_size": config.DB_QUERY_CACHE_SIZE,
+    }
+
+
+def _postgres_engine_options(config: Settings) -> dict:
+    connect_args: dict = {}
+    if config.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["options"] = f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"
+    if make_url(config.DATABASE_URL).get_driver_name() == "psycopg":
+        # psycopg 3 prepares server-side after this many executions; psycopg2 has no equivalent.
+        connect_args["prepare_threshold"] = config.DB_PREPARE_THRESHOLD
 
-def _apply_user_table_migrations() -> None:
-    inspector = inspect(engine)
-    table_names = inspector.get_table_names()
-    if "users" not in table_names:
-        return
+    return {
+        "connect_args": connect_args,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": config.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+        "pool_use_lifo": True,
+        "query_cache_size": config.DB_QUERY_CACHE_SIZE,
+    }
 
-    columns = {column["name"] for column in inspector.get_columns("users")}
 
-    with engine.begin() as connection:
-        if "github_token_encrypted" not in columns:
-            connection.execute(text("ALTER TABLE users ADD COLUMN github_token_encrypted VARCHAR(1024)"))
-        if "github_username" not in columns:
-            connection.execute(text("ALTER TABLE users ADD COLUMN github_username VARCHAR(255)"))
-        if "github_id" not in columns:
-            connection.execute(text("ALTER TABLE users ADD COLUMN github_id VARCHAR(100)"))
+def engine_options(config: Settings) -> dict:
+    if config.DATABASE_URL.startswith("sqlite"):
+        return _sqlite_engine_options(config)
+    return _postgres_engine_options(config)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    in_memory = make_url(settings.DATABASE_URL).database in (None, "", ":memory:")
+    cursor = dbapi_connection.cursor()
+    try:
+        if not in_memory:
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    finally:
+        cursor.close()
+
+
+def _track_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    metrics.DB_POOL_CHECKED_OUT.inc()
+
+
+def _track_checkin(dbapi_connection, connection_record) -> None:
+    metrics.DB_POOL_CHECKED_OUT.dec()
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings))
+if is_sqlite:
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+event.listen(engine.pool, "checkout", _track_checkout)
+event.listen(engine.pool, "checkin", _track_checkin)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base = declarative_base()
+
 
+def init_db() -> int:
+    # Imported lazily: migrations needs every model, and the models import Base from here.
+    from app.core.migrations import run_migrations
 
-def init_db() -> None:
-    Base.metadata.create_all(bind=engine)
-    _apply_user_table_migrations()
+    return run_migrations(engine)
 
 
 def get_db():
     db = SessionLocal()
     try:
+        # Check the connection out up front so time spent waiting on the pool is measured.
+        started = perf_counter()
+        db.connection()
+        metrics.DB_POOL_CHECKOUT_WAIT_SECONDS.observe(perf_counter() - started)
         yield db
     finally:
         db.close()
@@ -0,0 +1,45 @@
+from typing import Callable
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.loop_monitor import EventLoopMonitor
+
+# Routes that hold an LLM slot or fan out to GitHub; cheap reads are always admitted.
+SHED_ROUTES = {
+    ("POST", "/review"),
+    ("POST", "/review/batch"),
+    ("GET", "/github/repos-pending-prs"),
+}
+
+
+def overload_reason(monitor: EventLoopMonitor, queue_depth: int) -> str | None:
+    settings = get_settings()
+    if settings.SHED_MAX_LOOP_LAG_MS > 0 and monitor.lag() * 1000 >= settings.SHED_MAX_LOOP_LAG_MS:
+        return "loop_lag"
+    if settings.SHED_MAX_QUEUE_DEPTH > 0 and queue_depth >= settings.SHED_MAX_QUEUE_DEPTH:
+        return "queue_depth"
+    return None
+
+
+class LoadSheddingMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, monitor: EventLoopMonitor, queue_depth: Callable[[], int]):
+        super().__init__(app)
+        self.monitor = monitor
+        self.queue_depth = queue_depth
+        self.retry_after = str(get_settings().SHED_RETRY_AFTER_SECONDS)
+
+    async def dispatch(self, request: Request, call_next):
+        if (request.method, request.url.path) in SHED_ROUTES:
+            reason = overload_reason(self.monitor, self.queue_depth())
+            if reason:
+                metrics.LOAD_SHED_TOTAL.inc(reason=reason)
+                return JSONResponse(
+                    status_code=503,
+                    content={"detail": "Server is overloaded. Please retry shortly."},
+                    headers={"Retry-After": self.retry_after},
+                )
+        return await call_next(request)
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from collections import deque
+from time import monotonic
+
+from app.core import metrics
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class EventLoopMonitor:
+    """Measures how late a periodic sleep wakes up, i.e. how long callbacks wait for the loop.
+
+    `lag()` is the worst sample in the last `window` seconds, or the current overshoot
+    when the next tick is already overdue, so a stall is visible while it is happening.
+    """
+
+    def __init__(self, interval: float = 0.1, window: float = 5.0, warn_after: float = 1.0) -> None:
+        self.interval = interval
+        self.window = window
+        self.warn_after = warn_after
+        self._samples: deque[tuple[float, float]] = deque()
+        self._deadline: float | None = None
+        self._task: asyncio.Task | None = None
+
+    def lag(self) -> float:
+        now = monotonic()
+        while self._samples and now - self._samples[0][0] > self.window:
+            self._samples.popleft()
+        worst = max((lag for _, lag in self._samples), default=0.0)
+        if self._deadline is not None:
+            worst = max(worst, now - self._deadline)
+        return worst
+
+    async def _run(self) -> None:
+        while True:
+            self._deadline = monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = monotonic()
+            lag = max(0.0, now - self._deadline)
+            self._samples.append((now, lag))
+            metrics.EVENT_LOOP_LAG_SECONDS.observe(lag)
+            if lag >= self.warn_after:
+                logger.warning("Event loop was blocked for %.0f ms", lag * 1000)
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._deadline = None
+
+
+loop_monitor = EventLoopMonitor(interval=settings.LOOP_LAG_CHECK_INTERVAL_MS / 1000)
@@ -0,0 +1,364 @@
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+from typing import Iterator
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+SIZE_BUCKETS = (1_000, 4_000, 16_000, 64_000, 256_000, 1_000_000, 4_000_000)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(ABC):
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        ...
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self.header()
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self.header()
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: [per-bucket counts (non-cumulative)..., sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 1)
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - started, **labels)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = self.header()
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric {metric.name} already registered as {existing.metric_type}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+GITHUB_TOKEN_VALIDATION_SECONDS = registry.histogram(
+    "github_token_validation_seconds",
+    "Latency of GitHub token validation calls.",
+)
+GITHUB_DIFF_FETCH_SECONDS = registry.histogram(
+    "github_diff_fetch_seconds",
+    "Latency of pull request diff downloads.",
+)
+GITHUB_DIFF_BYTES = registry.histogram(
+    "github_diff_bytes",
+    "Size of downloaded pull request diffs in bytes.",
+    buckets=SIZE_BUCKETS,
+)
+GITHUB_RATE_LIMIT_REMAINING = registry.gauge(
+    "github_rate_limit_remaining",
+    "Last X-RateLimit-Remaining value reported by GitHub.",
+    ("resource",),
+)
+LLM_PROMPT_CHARS = registry.histogram(
+    "llm_prompt_chars",
+    "Size of prompts sent to the LLM in characters.",
+    buckets=SIZE_BUCKETS,
+)
+LLM_REQUEST_SECONDS = registry.histogram(
+    "llm_request_seconds",
+    "Latency of individual LLM backend calls.",
+    ("outcome",),
+)
+LLM_ENDPOINT_IN_FLIGHT = registry.gauge(
+    "llm_endpoint_in_flight",
+    "Outstanding requests per Ollama endpoint.",
+    ("endpoint",),
+)
+LLM_ENDPOINT_UP = registry.gauge(
+    "llm_endpoint_up",
+    "1 while an Ollama endpoint is in rotation, 0 while it is ejected.",
+    ("endpoint",),
+)
+LLM_WARMUP_SECONDS = registry.gauge(
+    "llm_warmup_seconds",
+    "Time the last startup warm-up took to load the model per endpoint.",
+    ("endpoint",),
+)
+DIFF_MINIMIZE_CHARS_TOTAL = registry.counter(
+    "diff_minimize_chars_total",
+    "Diff characters before and after minimization, by stage.",
+    ("stage",),
+)
+LLM_SKIPPED_TOTAL = registry.counter(
+    "llm_skipped_total",
+    "Reviews answered by the static scan alone, by reason.",
+    ("reason",),
+)
+STATIC_SCAN_SECONDS = registry.histogram(
+    "static_scan_seconds",
+    "Latency of the pre-LLM static scan, including the process pool hop.",
+)
+LLM_QUEUE_DEPTH = registry.gauge(
+    "llm_queue_depth",
+    "LLM calls waiting for an inference slot.",
+)
+LLM_TOKENS_TOTAL = registry.counter(
+    "llm_tokens_total",
+    "Tokens Ollama evaluated, by model and kind (prompt or output).",
+    ("model", "kind"),
+)
+LLM_OUTPUT_TOKENS_PER_SECOND = registry.histogram(
+    "llm_output_tokens_per_second",
+    "Generation speed reported by Ollama per call.",
+    ("model",),
+    buckets=(1, 2, 5, 10, 20, 40, 80, 160, 320),
+)
+LLM_COLD_LOADS_TOTAL = registry.counter(
+    "llm_cold_loads_total",
+    "LLM calls that had to load the model first.",
+    ("model",),
+)
+LLM_CASCADE_FILES_TOTAL = registry.counter(
+    "llm_cascade_files_total",
+    "Files the triage model kept (triaged) or passed to the large model (escalated).",
+    ("decision",),
+)
+LLM_CASCADE_SECONDS_TOTAL = registry.counter(
+    "llm_cascade_seconds_total",
+    "Cascade review time, next to the estimated time of sending every diff to the large model.",
+    ("path",),
+)
+HUNK_MEMO_LOOKUPS_TOTAL = registry.counter(
+    "hunk_memo_lookups_total",
+    "Diff hunks looked up in the findings memo, by hit or miss.",
+    ("outcome",),
+)
+LLM_RETRIES_TOTAL = registry.counter(
+    "llm_retries_total",
+    "LLM attempts that were retried after a failure.",
+)
+LLM_PARSE_FAILURES_TOTAL = registry.counter(
+    "llm_parse_failures_total",
+    "LLM responses that could not be parsed into the issue schema.",
+)
+LLM_ANALYSIS_FAILURES_TOTAL = registry.counter(
+    "llm_analysis_failures_total",
+    "Reviews that fell back to the placeholder result after exhausting retries.",
+)
+REVIEW_DB_COMMIT_SECONDS = registry.histogram(
+    "review_db_commit_seconds",
+    "Time spent committing a review row.",
+)
+REVIEW_DURATION_SECONDS = registry.histogram(
+    "review_duration_seconds",
+    "End-to-end duration of ReviewService.run_review.",
+    ("outcome",),
+)
+REVIEW_CACHE_HITS_TOTAL = registry.counter(
+    "review_cache_hits_total",
+    "Reviews answered from a stored result for the same PR head commit.",
+)
+WEBHOOK_EVENTS_TOTAL = registry.counter(
+    "webhook_events_total",
+    "GitHub webhook deliveries by outcome.",
+    ("outcome",),
+)
+WEBHOOK_QUEUE_DEPTH = registry.gauge(
+    "webhook_queue_depth",
+    "Pre-computed reviews waiting in the webhook queue.",
+)
+CACHE_EVENTS_TOTAL = registry.counter(
+    "cache_events_total",
+    "In-process cache lookups and maintenance events.",
+    ("cache", "event"),
+)
+RATE_LIMIT_REJECTIONS_TOTAL = registry.counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by the rate limiter.",
+    ("limit",),
+)
+DB_POOL_CHECKOUT_WAIT_SECONDS = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time a request waited to check a connection out of the pool.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CHECKED_OUT = registry.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+)
+EVENT_LOOP_LAG_SECONDS = registry.histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop monitor's periodic wake-up ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REVIEW_PUBLISH_FINDINGS_TOTAL = registry.counter(
+    "review_publish_findings_total",
+    "Findings posted to GitHub, by placement (inline comment or review summary).",
+    ("placement",),
+)
+LOAD_SHED_TOTAL = registry.counter(
+    "load_shed_total",
+    "Expensive requests rejected with 503 because the worker was overloaded.",
+    ("reason",),
+)
+APP_COLD_START_SECONDS = registry.gauge(
+    "app_cold_start_seconds",
+    "Worker startup time by phase (import, init_db, total).",
+    ("phase",),
+)
+
+
+def render_latest() -> str:
+    return registry.render()
@@ -0,0 +1,245 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+
+from app import models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.database import Base
+from app.models.hunk_finding import HunkFinding
+from app.models.review import Review
+from app.models.review_archive import ReviewArchive
+from app.models.review_issue import ReviewIssue
+from app.models.review_publication import ReviewPublication
+from app.models.review_stats import ReviewDailyStats, ReviewFileStats
+from app.models.review_usage import ReviewLLMUsage
+from app.services.issue_service import backfill_review_issues
+from app.services.search_service import create_search_index, index_all_reviews
+from app.services.stats_service import ReviewStatsService
+from app.services.usage_service import backfill_review_usage
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant shared by every worker so they serialise on the same advisory lock.
+POSTGRES_MIGRATION_LOCK_KEY = 724_311_026
+
+_version_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def _create_initial_schema(connection: Connection) -> None:
+    Base.metadata.create_all(bind=connection)
+
+
+def _add_columns_if_missing(connection: Connection, table: str, columns: dict[str, str]) -> None:
+    inspector = inspect(connection)
+    if table not in inspector.get_table_names():
+        return
+
+    existing = {column["name"] for column in inspector.get_columns(table)}
+    for name, ddl_type in columns.items():
+        if name not in existing:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl_type}"))
+
+
+def _add_user_github_columns(connection: Connection) -> None:
+    # Databases created before schema versioning may lack these columns.
+    _add_columns_if_missing(
+        connection,
+        "users",
+        {
+            "github_token_encrypted": "VARCHAR(1024)",
+            "github_username": "VARCHAR(255)",
+            "github_id": "VARCHAR(100)",
+        },
+    )
+
+
+def _add_review_head_sha(connection: Connection) -> None:
+    _add_columns_if_missing(connection, "reviews", {"head_sha": "VARCHAR(64)"})
+    for index in Review.__table__.indexes:
+        if index.name == "ix_reviews_user_repo_pr":
+            index.create(connection, checkfirst=True)
+
+
+def _create_review_search(connection: Connection) -> None:
+    create_search_index(connection)
+    session = Session(bind=connection)
+    try:
+        index_all_reviews(session, batch_size=500, commit=False)
+    finally:
+        session.close()
+
+
+def _create_review_issues(connection: Connection) -> None:
+    ReviewIssue.__table__.create(connection, checkfirst=True)
+    session = Session(bind=connection)
+    try:
+        backfill_review_issues(session, batch_size=500, commit=False)
+    finally:
+        session.close()
+
+
+def _create_review_stats(connection: Connection) -> None:
+    ReviewDailyStats.__table__.create(connection, checkfirst=True)
+    ReviewFileStats.__table__.create(connection, checkfirst=True)
+    session = Session(bind=connection)
+    try:
+        ReviewStatsService().rebuild(session, batch_size=500, commit=False)
+    finally:
+        session.close()
+
+
+def _create_hunk_findings(connection: Connection) -> None:
+    HunkFinding.__table__.create(connection, checkfirst=True)
+
+
+def _create_review_llm_usage(connection: Connection) -> None:
+    ReviewLLMUsage.__table__.create(connection, checkfirst=True)
+    session = Session(bind=connection)
+    try:
+        backfill_review_usage(session, batch_size=500, commit=False)
+    finally:
+        session.close()
+
+
+def _create_review_publications(connection: Connection) -> None:
+    ReviewPublication.__table__.create(connection, checkfirst=True)
+
+
+def _rebuild_table(connection: Connection, table: Table, columns: dict[str, str]) -> None:
+    """Recreate `table` from its model and copy the rows across; `columns` maps each new column to the
+    old column (or SQL expression) it is filled from."""
+    metadata = MetaData()
+    for foreign_key in table.foreign_keys:
+        foreign_key.column.table.to_metadata(metadata)
+    staging = table.to_metadata(metadata, name=f"{table.name}_rebuild")
+    # Index names are global; they are created on the final table below.
+    staging.indexes.clear()
+    staging.create(connection)
+    connection.execute(
+        text(
+            f"INSERT INTO {staging.name} ({', '.join(columns)}) "
+            f"SELECT {', '.join(columns.values())} FROM {table.name}"
+        )
+    )
+    connection.execute(text(f"DROP TABLE {table.name}"))
+    connection.execute(text(f"ALTER TABLE {staging.name} RENAME TO {table.name}"))
+    for index in table.indexes:
+        index.create(connection)
+
+
+def _stop_review_id_reuse(connection: Connection) -> None:
+    inspector = inspect(connection)
+    archive_columns = {column["name"] for column in inspector.get_columns("review_archive")}
+    if "review_id" not in archive_columns:
+        # Archived rows keep their original id as review_id and get a fresh surrogate id.
+        copied = {name: name for name in archive_columns if name != "id"}
+        _rebuild_table(connection, ReviewArchive.__table__, {**copied, "review_id": "id"})
+
+    if connection.dialect.name != "sqlite":
+        return  # SERIAL never hands an id out twice.
+    ddl = connection.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'reviews'")
+    ).scalar()
+    if "AUTOINCREMENT" not in (ddl or "").upper():
+        columns = {column["name"]: column["name"] for column in inspector.get_columns("reviews")}
+        _rebuild_table(connection, Review.__table__, columns)
+    # Continue after every id already used, including those of reviews archived since.
+    highest = connection.execute(
+        text(
+            "SELECT MAX(id) FROM (SELECT MAX(id) AS id FROM reviews UNION ALL "
+            "SELECT MAX(review_id) FROM review_archive UNION ALL SELECT MAX(review_id) FROM review_llm_usage)"
+        )
+    ).scalar()
+    if highest:
+        connection.execute(text("DELETE FROM sqlite_sequence WHERE name = 'reviews'"))
+        connection.execute(
+            text("INSERT INTO sqlite_sequence (name, seq) VALUES ('reviews', :seq)"), {"seq": highest}
+        )
+
+
+def _add_review_llm_usage_id(connection: Connection) -> None:
+    columns = {column["name"] for column in inspect(connection).get_columns("review_llm_usage")}
+    if "id" not in columns:
+        _rebuild_table(connection, ReviewLLMUsage.__table__, {name: name for name in columns})
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "initial_schema", _create_initial_schema),
+    Migration(2, "user_github_columns", _add_user_github_columns),
+    Migration(3, "review_head_sha", _add_review_head_sha),
+    Migration(4, "review_search", _create_review_search),
+    Migration(5, "review_issues", _create_review_issues),
+    Migration(6, "review_stats_rollups", _create_review_stats),
+    Migration(7, "hunk_findings", _create_hunk_findings),
+    Migration(8, "review_llm_usage", _create_review_llm_usage),
+    Migration(9, "review_publications", _create_review_publications),
+    Migration(10, "stop_review_id_reuse", _stop_review_id_reuse),
+    Migration(11, "review_llm_usage_id", _add_review_llm_usage_id),
+]
+
+LATEST_VERSION = max(migration.version for migration in MIGRATIONS)
+
+
+def current_version(connection: Connection) -> int:
+    return connection.execute(select(func.coalesce(func.max(schema_migrations.c.version), 0))).scalar_one()
+
+
+def _read_version(engine: Engine) -> int:
+    try:
+        with engine.connect() as connection:
+            return current_version(connection)
+    except DBAPIError:
+        # schema_migrations does not exist yet.
+        return 0
+
+
+def _acquire_lock(connection: Connection) -> None:
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": POSTGRES_MIGRATION_LOCK_KEY})
+    elif dialect == "sqlite":
+        # The first write opens the transaction and takes SQLite's RESERVED lock, so
+        # concurrent workers wait here until the migrating worker commits.
+        connection.execute(schema_migrations.delete().where(schema_migrations.c.version < 0))
+
+
+def run_migrations(engine: Engine) -> int:
+    if _read_version(engine) >= LATEST_VERSION:
+        return LATEST_VERSION
+
+    with engine.begin() as connection:
+        connection.execute(CreateTable(schema_migrations, if_not_exists=True))
+
+    with engine.begin() as connection:
+        _acquire_lock(connection)
+        version = current_version(connection)
+        for migration in MIGRATIONS:
+            if migration.version <= version:
+                continue
+            logger.info("Applying schema migration %s (%s)", migration.version, migration.name)
+            migration.apply(connection)
+            connection.execute(
+                schema_migrations.insert().values(version=migration.version, name=migration.name)
+            )
+            version = migration.version
+
+    return version
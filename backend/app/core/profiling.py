@@ -0,0 +1,75 @@
+import cProfile
+import hmac
+import logging
+import random
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile-token"
+
+
+class ProfilingMiddleware:
+    """Opt-in cProfile capture for a sample of requests.
+
+    Only installed when PROFILING_SAMPLE_RATE > 0 or PROFILING_TOKEN is set, so
+    it costs nothing otherwise. A request can force a profile by sending the
+    configured token in the `X-Profile-Token` header. cProfile observes the whole
+    thread, so concurrent requests on the same worker show up in the profile too;
+    only one profile is captured at a time.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        settings = get_settings()
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.token = settings.PROFILING_TOKEN
+        self.output_dir = Path(settings.PROFILING_DIR)
+        self._active = Lock()
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if self.token:
+            supplied = Headers(scope=scope).get(PROFILE_HEADER)
+            if supplied and hmac.compare_digest(supplied, self.token):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _profile_path(self, scope: Scope) -> Path:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", scope.get("path", "")).strip("_") or "root"
+        return self.output_dir / f"{stamp}-{scope.get('method', 'GET')}-{slug}.prof"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not self._active.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                profiler.disable()
+            path = self._profile_path(scope)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(str(path))
+            except OSError as exc:
+                logger.warning("Could not write request profile to %s: %s", path, exc)
+            else:
+                logger.info("Wrote request profile to %s", path)
+        finally:
+            self._active.release()
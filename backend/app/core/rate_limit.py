@@ -6,6 +6,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
+from app.core import metrics
 from app.core.config import get_settings
 
 
@@ -24,10 +25,14 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             return self.review_limit
         return self.default_limit
 
+    @staticmethod
+    def _limit_name(path: str) -> str:
+        return "review" if path.startswith("/review") else "general"
+
     async def dispatch(self, request: Request, call_next):
         path = request.url.path
 
-        if path.startswith("/docs") or path.startswith("/openapi"):
+        if path.startswith("/docs") or path.startswith("/openapi") or path in ("/metrics", "/health/ready"):
             return await call_next(request)
 
         client_ip = request.client.host if request.client else "unknown"
@@ -41,6 +46,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 timestamps.popleft()
 
             if len(timestamps) >= limit:
+                metrics.RATE_LIMIT_REJECTIONS_TOTAL.inc(limit=self._limit_name(path))
                 return JSONResponse(
                     status_code=429,
                     content={"detail": "Rate limit exceeded. Please retry in a minute."},
@@ -0,0 +1,94 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+
+class CompressionMiddleware:
+    """Gzip responses without buffering streamed bodies.
+
+    Each streamed chunk is sync-flushed so NDJSON/event streams still reach the
+    client as soon as the route yields them.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int | None = None, compresslevel: int = 6) -> None:
+        self.app = app
+        settings = get_settings()
+        self.minimum_size = settings.RESPONSE_COMPRESSION_MIN_BYTES if minimum_size is None else minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        if "gzip" not in accept_encoding.lower():
+            await self.app(scope, receive, send)
+            return
+
+        responder = _GZipResponder(send, self.minimum_size, self.compresslevel)
+        await self.app(scope, receive, responder.send)
+
+
+class _GZipResponder:
+    def __init__(self, send: Send, minimum_size: int, compresslevel: int) -> None:
+        self._send = send
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.start_message: Message | None = None
+        self.passthrough = False
+        self.compressor = None
+
+    def _new_compressor(self):
+        return zlib.compressobj(self.compresslevel, zlib.DEFLATED, 31)
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers
+            return
+
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+
+            if self.passthrough or (not more_body and len(body) < self.minimum_size):
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = "gzip"
+            headers.add_vary_header("Accept-Encoding")
+            self.compressor = self._new_compressor()
+
+            if not more_body:
+                compressed = self.compressor.compress(body) + self.compressor.flush(zlib.Z_FINISH)
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+            del headers["Content-Length"]
+            await self._send(start)
+
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        flush_mode = zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+        chunk = self.compressor.compress(body) + self.compressor.flush(flush_mode)
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -1,16 +1,75 @@
+import logging
+from contextlib import asynccontextmanager
+from time import perf_counter
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
-from app.api.routes import auth, github, review
+from app import IMPORT_STARTED
+from app.api.routes import auth, github, metrics, review
+from app.core import metrics as app_metrics
 from app.core.config import get_settings
 from app.core.database import init_db
+from app.core.load_shedding import LoadSheddingMiddleware
+from app.core.loop_monitor import loop_monitor
 from app.core.rate_limit import RateLimitMiddleware
+from app.core.response_compression import CompressionMiddleware
+from app.core.timing import TimingMiddleware
+from app.services.health_service import ReadinessService
+from app.services.llm_service import inference_queue_depth, llm_backend, ollama_options
+from app.services.static_scan import static_scanner
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+IMPORTS_FINISHED = perf_counter()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_started = perf_counter()
+    schema_version = await run_in_threadpool(init_db)
+    ready = perf_counter()
+
+    phases = {
+        "import": IMPORTS_FINISHED - IMPORT_STARTED,
+        "init_db": ready - init_started,
+        "total": ready - IMPORT_STARTED,
+    }
+    for phase, seconds in phases.items():
+        app_metrics.APP_COLD_START_SECONDS.set(seconds, phase=phase)
+    app.state.cold_start = {phase: round(seconds * 1000, 1) for phase, seconds in phases.items()}
+    logger.info(
+        "Worker ready in %.1f ms (imports %.1f ms, init_db %.1f ms, schema v%s)",
+        phases["total"] * 1000,
+        phases["import"] * 1000,
+        phases["init_db"] * 1000,
+        schema_version,
+    )
+    loop_monitor.start()
+    github.webhook_queue.start()
+    warm_up = settings.OLLAMA_WARMUP_ON_STARTUP and llm_backend.loads_models_on_demand
+    warm_up_models = [settings.LLM_TRIAGE_MODEL, settings.llm_model] if warm_up else []
+    # Warm-up runs in the background so a slow model load never delays readiness.
+    llm_backend.pool.start(
+        warm_up_models=[model for model in warm_up_models if model],
+        keep_alive=settings.OLLAMA_KEEP_ALIVE,
+        options=ollama_options(),
+        timeout=settings.LLM_TIMEOUT_SECONDS,
+    )
+    static_scanner.start()
+    try:
+        yield
+    finally:
+        static_scanner.shutdown()
+        await llm_backend.pool.stop()
+        await github.webhook_queue.stop()
+        await loop_monitor.stop()
 
-init_db()
 
-app = FastAPI(title=settings.APP_NAME)
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,12 +80,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(RateLimitMiddleware)
+app.add_middleware(LoadSheddingMiddleware, monitor=loop_monitor, queue_depth=inference_queue_depth)
+if settings.PROFILING_SAMPLE_RATE > 0 or settings.PROFILING_TOKEN:
+    # cProfile is only imported when profiling is actually configured.
+    from app.core.profiling import ProfilingMiddleware
+
+    app.add_middleware(ProfilingMiddleware)
+if settings.REQUEST_TIMING_ENABLED:
+    app.add_middleware(TimingMiddleware)
+if settings.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
 
 app.include_router(auth.router)
 app.include_router(github.router)
 app.include_router(review.router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
+
+
+readiness = ReadinessService(loop_monitor, llm_backend, inference_queue_depth)
 
 
 @app.get("/")
 def health_check():
     return {"status": "ok", "service": settings.APP_NAME}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    ready, report = await readiness.check()
+    return JSONResponse(status_code=200 if ready else 503, content=report)
@@ -0,0 +1,98 @@
+import argparse
+import logging
+from pathlib import Path
+
+from app import models  # noqa: F401  (registers every table before init_db)
+from app.core.config import get_settings
+from app.core.database import SessionLocal, init_db
+from app.services.hunk_memo import HunkMemoService
+from app.services.retention_service import RetentionService
+from app.services.search_service import ReviewSearchService
+from app.services.stats_service import ReviewStatsService
+
+settings = get_settings()
+
+
+def archive_command(args: argparse.Namespace) -> int:
+    service = RetentionService(batch_size=args.batch_size)
+    db = SessionLocal()
+    try:
+        if args.dry_run:
+            count = service.count_archivable(db, args.days)
+            print(f"{count} reviews older than {args.days} days would be archived")
+            return 0
+
+        archived = service.archive(db, args.days, archive_file=args.file)
+        target = args.file or "review_archive table"
+        print(f"Archived {archived} reviews older than {args.days} days to {target}")
+        if args.vacuum:
+            service.compact(db)
+    finally:
+        db.close()
+    return 0
+
+
+def reindex_search_command(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        indexed = ReviewSearchService().rebuild(db, args.batch_size)
+    finally:
+        db.close()
+    print(f"Rebuilt the search index from {indexed} reviews")
+    return 0
+
+
+def rebuild_stats_command(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        aggregated = ReviewStatsService().rebuild(db, args.batch_size)
+    finally:
+        db.close()
+    print(f"Rebuilt review stats rollups from {aggregated} reviews")
+    return 0
+
+
+def prune_hunk_memo_command(args: argparse.Namespace) -> int:
+    pruned = HunkMemoService().prune(args.days)
+    print(f"Pruned {pruned} memoized hunks unused for {args.days} days")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.maintenance")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    archive = subcommands.add_parser("archive", help="Move old reviews out of the hot reviews table")
+    archive.add_argument("--days", type=int, default=settings.REVIEW_RETENTION_DAYS)
+    archive.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    archive.add_argument("--file", type=Path, default=None, help="Append to a gzipped NDJSON file instead")
+    archive.add_argument("--dry-run", action="store_true")
+    archive.add_argument("--vacuum", action="store_true", help="Reclaim SQLite file space afterwards")
+    archive.set_defaults(handler=archive_command)
+
+    reindex = subcommands.add_parser("reindex-search", help="Rebuild the review findings search index")
+    reindex.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    reindex.set_defaults(handler=reindex_search_command)
+
+    rebuild_stats = subcommands.add_parser(
+        "rebuild-stats", help="Recompute the review stats rollups from live and archived reviews"
+    )
+    rebuild_stats.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    rebuild_stats.set_defaults(handler=rebuild_stats_command)
+
+    prune_memo = subcommands.add_parser("prune-hunk-memo", help="Drop memoized hunk findings that went unused")
+    prune_memo.add_argument("--days", type=int, default=settings.HUNK_MEMO_RETENTION_DAYS)
+    prune_memo.set_defaults(handler=prune_hunk_memo_command)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    args = build_parser().parse_args(argv)
+    init_db()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
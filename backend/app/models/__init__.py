@@ -1,4 +1,20 @@
+from app.models.hunk_finding import HunkFinding
 from app.models.review import Review
+from app.models.review_archive import ReviewArchive
+from app.models.review_issue import ReviewIssue
+from app.models.review_publication import ReviewPublication
+from app.models.review_stats import ReviewDailyStats, ReviewFileStats
+from app.models.review_usage import ReviewLLMUsage
 from app.models.user import User
 
-__all__ = ["User", "Review"]
+__all__ = [
+    "User",
+    "Review",
+    "ReviewArchive",
+    "ReviewIssue",
+    "ReviewDailyStats",
+    "ReviewFileStats",
+    "HunkFinding",
+    "ReviewLLMUsage",
+    "ReviewPublication",
+]
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class HunkFinding(Base):
+    """Issues the LLM reported for one diff hunk; lines are stored relative to the hunk start."""
+
+    __tablename__ = "hunk_findings"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    issues: Mapped[list] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    last_used_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -1,19 +1,26 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, JSON, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.compression import CompressedJSON
 from app.core.database import Base
 
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_user_repo_pr", "user_id", "repo_name", "pr_number"),
+        # Without AUTOINCREMENT SQLite hands out the ids of archived reviews again.
+        {"sqlite_autoincrement": True},
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
     repo_name: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
     pr_number: Mapped[int] = mapped_column(Integer, nullable=False)
-    result_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    head_sha: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    result_json: Mapped[dict] = mapped_column(CompressedJSON, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="reviews")
@@ -0,0 +1,27 @@
+import json
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.compression import decompress_bytes
+from app.core.database import Base
+
+
+class ReviewArchive(Base):
+    __tablename__ = "review_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # The id the review had in `reviews`; not unique, as databases from before AUTOINCREMENT reused ids.
+    review_id: Mapped[int] = mapped_column(Integer, index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, index=True, nullable=False)
+    repo_name: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
+    pr_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    codec: Mapped[str] = mapped_column(String(16), nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    @property
+    def result_json(self) -> dict:
+        return json.loads(decompress_bytes(self.payload, self.codec))
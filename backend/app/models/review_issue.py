@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ReviewIssue(Base):
+    __tablename__ = "review_issues"
+    __table_args__ = (
+        Index("ix_review_issues_user_severity_created", "user_id", "severity", "created_at"),
+        Index("ix_review_issues_repo_file", "repo_name", "file"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    review_id: Mapped[int] = mapped_column(Integer, ForeignKey("reviews.id", ondelete="CASCADE"), index=True)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    repo_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    file: Mapped[str] = mapped_column(String(1024), nullable=False)
+    line: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    severity: Mapped[str] = mapped_column(String(16), nullable=False)
+    message_hash: Mapped[str] = mapped_column(String(40), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ReviewPublication(Base):
+    """A review posted to GitHub as one pull-request review.
+
+    The row is inserted with status "publishing" before GitHub is called, so the primary key
+    doubles as the lock that keeps a review from being posted twice.
+    """
+
+    __tablename__ = "review_publications"
+
+    review_id: Mapped[int] = mapped_column(Integer, ForeignKey("reviews.id", ondelete="CASCADE"), primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    github_review_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    html_url: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    commit_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    inline_comments: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    summarized: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,33 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ReviewDailyStats(Base):
+    """Per user/repo/day rollup; severities are columns so each save is a single-row upsert."""
+
+    __tablename__ = "review_daily_stats"
+    __table_args__ = (Index("ix_review_daily_stats_user_day", "user_id", "day"),)
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    repo_name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    low_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    medium_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    high_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ReviewFileStats(Base):
+    __tablename__ = "review_file_stats"
+    __table_args__ = (Index("ix_review_file_stats_user_count", "user_id", "issue_count"),)
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    repo_name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    file: Mapped[str] = mapped_column(String(1024), primary_key=True)
+    issue_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    high_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_flagged_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ReviewLLMUsage(Base):
+    """Ollama token counts and timings per review, summed over retries.
+
+    review_id is deliberately not a foreign key (nor unique): rows outlive archived reviews so
+    capacity history is not lost to retention.
+    """
+
+    __tablename__ = "review_llm_usage"
+    __table_args__ = (Index("ix_review_llm_usage_user_created", "user_id", "created_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    review_id: Mapped[int] = mapped_column(Integer, index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    repo_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    model: Mapped[str] = mapped_column(String(255), nullable=False)
+    llm_calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    parse_failures: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cold_loads: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    prompt_chars: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    output_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    prompt_eval_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    eval_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    load_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
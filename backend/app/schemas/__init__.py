@@ -1,16 +1,41 @@
 from app.schemas.auth import TokenResponse, UserCreate, UserLogin, UserOut
 from app.schemas.github import PendingPullRequest, RepoPendingPulls, ReposPendingPullsResponse
-from app.schemas.review import Issue, ReviewRequest, ReviewResponse, ReviewResult
+from app.schemas.review import (
+    BatchReviewRequest,
+    DailyRepoStats,
+    FileStats,
+    FlaggedFile,
+    Issue,
+    PullRequestRef,
+    RepoRef,
+    ReviewIssueOut,
+    ReviewRequest,
+    ReviewResponse,
+    ReviewResult,
+    ReviewSearchHit,
+    ReviewSearchResponse,
+    ReviewStatsResponse,
+)
 
 __all__ = [
     "TokenResponse",
     "UserCreate",
     "UserLogin",
     "UserOut",
+    "BatchReviewRequest",
+    "DailyRepoStats",
+    "FileStats",
+    "FlaggedFile",
     "Issue",
+    "PullRequestRef",
+    "RepoRef",
+    "ReviewIssueOut",
     "ReviewRequest",
     "ReviewResponse",
     "ReviewResult",
+    "ReviewSearchHit",
+    "ReviewSearchResponse",
+    "ReviewStatsResponse",
     "PendingPullRequest",
     "RepoPendingPulls",
     "ReposPendingPullsResponse",
@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field, PositiveInt
+from pydantic import BaseModel, ConfigDict, Field, PositiveInt, model_validator
 
 
 class Issue(BaseModel):
@@ -18,6 +18,29 @@ class ReviewRequest(BaseModel):
     repo_name: str = Field(min_length=1, max_length=100, pattern=r"^[A-Za-z0-9_.-]+$")
     pr_number: PositiveInt
     github_token: str | None = Field(default=None, min_length=20, max_length=255)
+    force: bool = False
+
+
+class RepoRef(BaseModel):
+    repo_owner: str = Field(min_length=1, max_length=100, pattern=r"^[A-Za-z0-9_.-]+$")
+    repo_name: str = Field(min_length=1, max_length=100, pattern=r"^[A-Za-z0-9_.-]+$")
+
+
+class PullRequestRef(RepoRef):
+    pr_number: PositiveInt
+
+
+class BatchReviewRequest(BaseModel):
+    pulls: list[PullRequestRef] = Field(default_factory=list, max_length=100)
+    repos: list[RepoRef] = Field(default_factory=list, max_length=50)
+    pulls_per_repo: int = Field(default=10, ge=1, le=50)
+    github_token: str | None = Field(default=None, min_length=20, max_length=255)
+
+    @model_validator(mode="after")
+    def require_selection(self) -> "BatchReviewRequest":
+        if not self.pulls and not self.repos:
+            raise ValueError("Provide at least one pull request or repository")
+        return self
 
 
 class ReviewResult(BaseModel):
@@ -34,3 +57,117 @@ class ReviewResponse(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ReviewSearchHit(BaseModel):
+    review_id: int
+    repo_name: str
+    pr_number: int
+    file: str | None = None
+    line: int | None = None
+    severity: str | None = None
+    message: str | None = None
+    suggestion: str | None = None
+    snippet: str | None = None
+    score: float | None = None
+
+
+class ReviewSearchResponse(BaseModel):
+    query: str | None
+    limit: int
+    offset: int
+    has_more: bool
+    results: list[ReviewSearchHit]
+
+
+class ReviewIssueOut(BaseModel):
+    id: int
+    review_id: int
+    repo_name: str
+    file: str
+    line: int | None
+    severity: str
+    message_hash: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FlaggedFile(BaseModel):
+    repo_name: str
+    file: str
+    issue_count: int
+    distinct_messages: int
+    last_flagged_at: datetime | None
+
+
+class DailyRepoStats(BaseModel):
+    day: date
+    repo_name: str
+    reviews: int
+    low: int
+    medium: int
+    high: int
+
+
+class FileStats(BaseModel):
+    repo_name: str
+    file: str
+    issue_count: int
+    high_count: int
+    last_flagged_at: datetime | None
+
+
+class ReviewStatsResponse(BaseModel):
+    since: date
+    days: int
+    totals: dict[str, int]
+    daily: list[DailyRepoStats]
+    top_files: list[FileStats]
+
+
+class ModelPerformance(BaseModel):
+    model: str
+    reviews: int
+    llm_calls: int
+    prompt_tokens: int
+    output_tokens: int
+    prompt_tokens_per_second: float | None
+    output_tokens_per_second: float | None
+    cold_loads: int
+    cold_load_rate: float
+    avg_load_ms: float
+
+
+class RepoInferenceCost(BaseModel):
+    repo_name: str
+    reviews: int
+    llm_calls: int
+    prompt_tokens: int
+    output_tokens: int
+    inference_seconds: float
+    avg_inference_seconds: float
+
+
+class ReviewPerformanceResponse(BaseModel):
+    since: datetime
+    days: int
+    models: list[ModelPerformance]
+    repos: list[RepoInferenceCost]
+
+
+class PublishReviewRequest(BaseModel):
+    github_token: str | None = Field(default=None, min_length=20, max_length=255)
+    max_comments: int | None = Field(default=None, ge=1, le=100)
+
+
+class ReviewPublicationResponse(BaseModel):
+    review_id: int
+    status: str
+    github_review_id: int | None = None
+    html_url: str | None = None
+    commit_id: str | None = None
+    inline_comments: int
+    summarized: int
+    already_published: bool
+    published_at: datetime | None = None
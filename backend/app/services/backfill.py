@@ -0,0 +1,24 @@
+from typing import Iterator, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.review import Review
+
+ModelT = TypeVar("ModelT")
+
+
+def iter_review_batches(
+    session: Session, batch_size: int, model: type[ModelT] = Review
+) -> Iterator[list[ModelT]]:
+    """Walk a review table by id so memory stays bounded; batches are expunged after use."""
+    last_id = 0
+    while True:
+        batch = list(
+            session.scalars(select(model).where(model.id > last_id).order_by(model.id).limit(batch_size))
+        )
+        if not batch:
+            return
+        last_id = batch[-1].id
+        yield batch
+        session.expunge_all()
@@ -0,0 +1,147 @@
+import re
+from dataclasses import dataclass, field
+
+from app.services.hunk_memo import HUNK_HEADER, split_hunks
+from app.services.static_scan import whitespace_only
+
+# Roughly what Ollama's tokenizers average on code; only used to report savings.
+CHARS_PER_TOKEN = 4
+DROPPED_HEADERS = (
+    "index ",
+    "old mode ",
+    "new mode ",
+    "new file mode ",
+    "deleted file mode ",
+    "similarity index ",
+    "dissimilarity index ",
+)
+
+
+@dataclass
+class MinimizedDiff:
+    text: str
+    hunks: int = 0
+    stats: dict[str, int] = field(default_factory=dict)
+
+    def report(self, original_chars: int) -> dict:
+        saved = original_chars - len(self.text)
+        return {
+            "chars_before": original_chars,
+            "chars_after": len(self.text),
+            "estimated_tokens_saved": saved // CHARS_PER_TOKEN,
+            "ratio": round(len(self.text) / original_chars, 3) if original_chars else 1.0,
+            **self.stats,
+        }
+
+
+def _range(start: int, count: int) -> str:
+    # An empty side points at the line before it, as git writes it (e.g. `-0,0` for a new file).
+    return f"{start - 1 if count == 0 else start},{count}"
+
+
+def _rewrite_hunk(
+    path: str, text: str, context_lines: int, max_line_chars: int, stats: dict[str, int]
+) -> list[str]:
+    """Trim a hunk's context to `context_lines` and split it where a longer unchanged run remains.
+
+    Every piece gets an exact `@@` header, so the line numbers the model reports still refer to the
+    real file and no separate mapping is needed.
+    """
+    header, *body = text.rstrip("\n").split("\n")
+    match = HUNK_HEADER.match(header)
+    old_match = re.match(r"^@@ -(\d+)(?:,(\d+))?", header)
+    if not match or not old_match:
+        return [text]
+    section = match.group(3)
+
+    # (line, old number, new number) for every line the hunk covers.
+    lines: list[tuple[str, int, int]] = []
+    old_line, new_line = int(old_match.group(1)), int(match.group(1))
+    # Undo `_range`'s convention for an empty side so both counters hold the next line's number.
+    old_line += old_match.group(2) == "0"
+    new_line += match.group(2) == "0"
+    for line in body:
+        if line.startswith("\\"):
+            stats["header_lines"] += 1
+            continue
+        if len(line) > max_line_chars + 1:
+            line = line[: max_line_chars + 1] + " [truncated]"
+            stats["truncated_lines"] += 1
+        lines.append((line, old_line, new_line))
+        if line.startswith("-"):
+            old_line += 1
+        elif line.startswith("+"):
+            new_line += 1
+        else:
+            old_line += 1
+            new_line += 1
+
+    changed = [index for index, (line, _, _) in enumerate(lines) if line[:1] in "+-"]
+    if not changed:
+        return []
+    # Group changes whose gap of unchanged lines is small enough to keep as shared context.
+    groups: list[list[int]] = [[changed[0], changed[0]]]
+    for index in changed[1:]:
+        if index - groups[-1][1] - 1 <= 2 * context_lines:
+            groups[-1][1] = index
+        else:
+            groups.append([index, index])
+
+    pieces = []
+    covered = 0
+    for first, last in groups:
+        start, end = max(0, first - context_lines), min(len(lines), last + context_lines + 1)
+        covered += end - start
+        piece = lines[start:end]
+        texts = [line for line, _, _ in piece]
+        before = [line[1:] for line in texts if not line.startswith("+")]
+        after = [line[1:] for line in texts if not line.startswith("-")]
+        if whitespace_only(path, before, after):
+            stats["whitespace_hunks"] += 1
+            continue
+        old_count = sum(1 for line in texts if not line.startswith("+"))
+        new_count = sum(1 for line in texts if not line.startswith("-"))
+        _, old_start, new_start = piece[0]
+        head = f"@@ -{_range(old_start, old_count)} +{_range(new_start, new_count)} @@{section}"
+        pieces.append("\n".join([head, *texts]) + "\n")
+    stats["context_lines"] += len(lines) - covered
+    return pieces
+
+
+def minimize_diff(diff_text: str, context_lines: int = 2, max_line_chars: int = 300) -> MinimizedDiff:
+    """Drop what costs prompt tokens without helping the review: extra context, index and mode headers,
+    pure renames, whitespace-only hunks and the tail of very long lines."""
+    stats = dict.fromkeys(
+        ("header_lines", "context_lines", "whitespace_hunks", "renames", "truncated_lines", "dropped_files"), 0
+    )
+    output: list[str] = []
+    hunk_count = 0
+    for file in split_hunks(diff_text):
+        header_lines = file.header.rstrip("\n").split("\n")
+        kept = [line for line in header_lines if not line.startswith(DROPPED_HEADERS)]
+        stats["header_lines"] += len(header_lines) - len(kept)
+
+        if not file.hunks:
+            if any(line.startswith("rename from ") for line in header_lines):
+                # `diff --git a/old b/new` already names both paths.
+                stats["renames"] += 1
+                output.append(header_lines[0] + "\n")
+            elif any(line.startswith("Binary files ") for line in kept):
+                output.append("\n".join(kept) + "\n")
+            else:
+                stats["dropped_files"] += 1
+            continue
+
+        pieces = [
+            piece
+            for hunk in file.hunks
+            for piece in _rewrite_hunk(file.path, hunk.text, context_lines, max_line_chars, stats)
+        ]
+        if not pieces:
+            stats["dropped_files"] += 1
+            continue
+        hunk_count += len(pieces)
+        # A rename with edits keeps only the `diff --git` line and the ---/+++ pair.
+        kept = [line for line in kept if not line.startswith(("rename from ", "rename to "))]
+        output.append("\n".join(kept) + "\n" + "".join(pieces))
+    return MinimizedDiff(text="".join(output), hunks=hunk_count, stats=stats)
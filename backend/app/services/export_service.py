@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.review import Review
+
+settings = get_settings()
+
+CSV_COLUMNS = (
+    "review_id",
+    "repo_name",
+    "pr_number",
+    "head_sha",
+    "created_at",
+    "file",
+    "line",
+    "severity",
+    "message",
+    "suggestion",
+    "code_snippet",
+)
+# Encoded rows are buffered up to this size before being handed to the response.
+FLUSH_BYTES = 64 * 1024
+
+
+class ReviewExportService:
+    """Streams a user's review history without holding more than one fetch batch in memory."""
+
+    def __init__(self, batch_size: int | None = None) -> None:
+        self.batch_size = max(1, batch_size or settings.EXPORT_BATCH_SIZE)
+
+    def iter_reviews(
+        self,
+        user_id: int,
+        repo_name: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> Iterator[dict]:
+        # The session is owned by the generator: the request's session is closed before the body streams.
+        query = select(
+            Review.id, Review.repo_name, Review.pr_number, Review.head_sha, Review.result_json, Review.created_at
+        ).where(Review.user_id == user_id)
+        if repo_name:
+            query = query.where(Review.repo_name == repo_name)
+        if since:
+            query = query.where(Review.created_at >= since)
+        if until:
+            query = query.where(Review.created_at < until)
+        query = query.order_by(Review.id).execution_options(stream_results=True, yield_per=self.batch_size)
+
+        with SessionLocal() as db:
+            for row in db.execute(query).mappings():
+                yield dict(row)
+
+    def ndjson(self, user_id: int, **filters) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        for row in self.iter_reviews(user_id, **filters):
+            result_json = row["result_json"] or {}
+            record = {
+                "id": row["id"],
+                "repo_name": row["repo_name"],
+                "pr_number": row["pr_number"],
+                "head_sha": row["head_sha"],
+                "created_at": row["created_at"],
+                "issues": result_json.get("issues", []),
+                "changed_files": result_json.get("changed_files", []),
+            }
+            buffer.write(json.dumps(record, default=str, separators=(",", ":")))
+            buffer.write("\n")
+            if buffer.tell() >= FLUSH_BYTES:
+                yield self._drain(buffer)
+        if buffer.tell():
+            yield self._drain(buffer)
+
+    def csv(self, user_id: int, **filters) -> Iterator[bytes]:
+        """One row per finding; reviews without findings get a single row with empty finding columns."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS)
+        for row in self.iter_reviews(user_id, **filters):
+            review = [row["id"], row["repo_name"], row["pr_number"], row["head_sha"] or "", row["created_at"]]
+            issues = [issue for issue in (row["result_json"] or {}).get("issues", []) if isinstance(issue, dict)]
+            if not issues:
+                writer.writerow(review + [""] * 6)
+            for issue in issues:
+                writer.writerow(
+                    review
+                    + [
+                        issue.get("file", ""),
+                        issue.get("line", ""),
+                        issue.get("severity", ""),
+                        issue.get("message", ""),
+                        issue.get("suggestion", ""),
+                        issue.get("code_snippet", ""),
+                    ]
+                )
+            if buffer.tell() >= FLUSH_BYTES:
+                yield self._drain(buffer)
+        if buffer.tell():
+            yield self._drain(buffer)
+
+    @staticmethod
+    def _drain(buffer: io.StringIO) -> bytes:
+        chunk = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
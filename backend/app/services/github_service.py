@@ -1,12 +1,17 @@
 import re
 import asyncio
+import logging
+from typing import AsyncIterator
 
 import httpx
 from fastapi import HTTPException
 
+from app.core import metrics
 from app.core.config import get_settings
+from app.core.timing import span
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 class GitHubService:
@@ -18,6 +23,18 @@ class GitHubService:
             "X-GitHub-Api-Version": "2022-11-28",
         }
 
+    @staticmethod
+    def _record_rate_limit(response: httpx.Response) -> None:
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            value = float(remaining)
+        except ValueError:
+            return
+        resource = response.headers.get("X-RateLimit-Resource", "core")
+        metrics.GITHUB_RATE_LIMIT_REMAINING.set(value, resource=resource)
+
     @staticmethod
     def _handle_error(response: httpx.Response, fallback_detail: str) -> None:
         if response.status_code == 401:
@@ -34,11 +51,13 @@ class GitHubService:
     async def validate_token(self, token: str) -> bool:
         headers = self._json_headers(token)
         try:
-            async with httpx.AsyncClient(timeout=15) as client:
-                response = await client.get(f"{settings.GITHUB_API_BASE_URL}/user", headers=headers)
+            with span("github.validate"), metrics.GITHUB_TOKEN_VALIDATION_SECONDS.time():
+                async with httpx.AsyncClient(timeout=15) as client:
+                    response = await client.get(f"{settings.GITHUB_API_BASE_URL}/user", headers=headers)
         except httpx.RequestError as exc:
             raise HTTPException(status_code=502, detail="Unable to validate GitHub token right now") from exc
 
+        self._record_rate_limit(response)
         return response.status_code == 200
 
     async def fetch_pr_diff(
@@ -56,12 +75,15 @@ class GitHubService:
         pr_url = f"{settings.GITHUB_API_BASE_URL}/repos/{repo_owner}/{repo_name}/pulls/{pr_number}"
 
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(pr_url, headers=headers)
+            with span("github.diff"), metrics.GITHUB_DIFF_FETCH_SECONDS.time():
+                async with httpx.AsyncClient(timeout=30) as client:
+                    response = await client.get(pr_url, headers=headers)
         except httpx.RequestError as exc:
             raise HTTPException(status_code=502, detail="Unable to reach GitHub API") from exc
 
+        self._record_rate_limit(response)
         self._handle_error(response, "Unable to fetch pull request diff")
+        metrics.GITHUB_DIFF_BYTES.observe(len(response.content))
 
         diff = response.text
         if not diff.strip():
@@ -69,6 +91,65 @@ class GitHubService:
 
         return diff, self.extract_changed_files(diff)
 
+    async def fetch_pull(
+        self,
+        token: str,
+        repo_owner: str,
+        repo_name: str,
+        pr_number: int,
+    ) -> dict:
+        headers = self._json_headers(token)
+        try:
+            async with httpx.AsyncClient(timeout=15) as client:
+                response = await client.get(
+                    f"{settings.GITHUB_API_BASE_URL}/repos/{repo_owner}/{repo_name}/pulls/{pr_number}",
+                    headers=headers,
+                )
+        except httpx.RequestError as exc:
+            raise HTTPException(status_code=502, detail="Unable to reach GitHub API") from exc
+
+        self._record_rate_limit(response)
+        self._handle_error(response, "Unable to fetch pull request")
+        try:
+            data = response.json()
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    async def create_pull_review(
+        self,
+        token: str,
+        repo_owner: str,
+        repo_name: str,
+        pr_number: int,
+        commit_id: str,
+        body: str,
+        comments: list[dict],
+    ) -> dict:
+        """Submit a COMMENT review; every inline comment goes out in this one request."""
+        headers = self._json_headers(token)
+        payload = {"commit_id": commit_id, "body": body, "event": "COMMENT", "comments": comments}
+        url = f"{settings.GITHUB_API_BASE_URL}/repos/{repo_owner}/{repo_name}/pulls/{pr_number}/reviews"
+        try:
+            with span("github.review"):
+                async with httpx.AsyncClient(timeout=30) as client:
+                    response = await client.post(url, headers=headers, json=payload)
+        except httpx.RequestError as exc:
+            raise HTTPException(status_code=502, detail="Unable to reach GitHub API") from exc
+
+        self._record_rate_limit(response)
+        if response.status_code == 422:
+            # GitHub rejects the whole review when one comment points outside the diff.
+            raise HTTPException(
+                status_code=409, detail="GitHub rejected the review comments; the pull request diff changed"
+            )
+        self._handle_error(response, "Unable to publish pull request review")
+        try:
+            data = response.json()
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
     async def fetch_user_repos(
         self,
         token: str,
@@ -91,6 +172,7 @@ class GitHubService:
                             "affiliation": "owner,collaborator,organization_member",
                         },
                     )
+                    self._record_rate_limit(response)
                     self._handle_error(response, "Unable to fetch repositories")
                     batch = response.json()
                     if not isinstance(batch, list) or not batch:
@@ -121,6 +203,7 @@ class GitHubService:
         except httpx.RequestError as exc:
             raise HTTPException(status_code=502, detail="Unable to reach GitHub API") from exc
 
+        self._record_rate_limit(response)
         self._handle_error(response, "Unable to fetch pull requests")
         data = response.json()
         if not isinstance(data, list):
@@ -138,53 +221,112 @@ class GitHubService:
         repos = repos[:max_repos]
 
         semaphore = asyncio.Semaphore(5)
-
-        async def fetch_repo_entry(repo: dict) -> dict | None:
-            owner = ((repo.get("owner") or {}).get("login")) or ""
-            name = repo.get("name") or ""
-            full_name = repo.get("full_name") or f"{owner}/{name}"
-            if not owner or not name:
-                return None
-
-            async with semaphore:
-                pulls = await self.fetch_open_pulls(
-                    token=token,
-                    repo_owner=owner,
-                    repo_name=name,
-                    per_page=pulls_per_repo,
-                )
-
-            entry = {
-                "owner": owner,
-                "repo": name,
-                "full_name": full_name,
-                "private": bool(repo.get("private", False)),
-                "html_url": repo.get("html_url") or "",
-                "pending_pr_count": len(pulls),
-                "pending_pull_requests": [
-                    {
-                        "number": pr.get("number"),
-                        "title": pr.get("title") or "",
-                        "html_url": pr.get("html_url") or "",
-                        "state": pr.get("state") or "open",
-                        "draft": bool(pr.get("draft", False)),
-                        "created_at": pr.get("created_at") or "",
-                        "updated_at": pr.get("updated_at") or "",
-                        "author": ((pr.get("user") or {}).get("login")),
-                    }
-                    for pr in pulls
-                ],
-            }
-
-            if only_with_open and entry["pending_pr_count"] == 0:
-                return None
-            return entry
-
-        tasks = [fetch_repo_entry(repo) for repo in repos]
+        tasks = [self._pending_pr_entry(token, repo, pulls_per_repo, only_with_open, semaphore) for repo in repos]
         raw_entries = await asyncio.gather(*tasks)
         entries = [entry for entry in raw_entries if entry]
         return len(repos), entries
 
+    async def stream_repos_with_pending_prs(
+        self,
+        token: str,
+        max_repos: int = 25,
+        pulls_per_repo: int = 5,
+        only_with_open: bool = False,
+    ) -> AsyncIterator[dict]:
+        """Like list_repos_with_pending_prs, but yields each repo as soon as its pulls arrive.
+
+        Events: `started` once the repos are listed, one `repo` per entry in completion order
+        (`position` is its index in the listing), `error` for a repo whose pulls could not be
+        fetched, and a final `summary`.
+        """
+        repos = await self.fetch_user_repos(token=token)
+        repos = repos[:max_repos]
+        yield {"type": "started", "total_repos_scanned": len(repos)}
+
+        semaphore = asyncio.Semaphore(5)
+        tasks = [
+            asyncio.create_task(self._pending_pr_entry(token, repo, pulls_per_repo, only_with_open, semaphore))
+            for repo in repos
+        ]
+        positions = {task: position for position, task in enumerate(tasks)}
+        returned = failed = 0
+
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=positions.__getitem__):
+                    position = positions[task]
+                    full_name = repos[position].get("full_name") or ""
+                    try:
+                        entry = task.result()
+                    except Exception as exc:  # noqa: BLE001
+                        # The 200 is already sent; every failure must become an event so the summary follows.
+                        if isinstance(exc, HTTPException):
+                            detail = exc.detail
+                        else:
+                            logger.exception("Fetching pending pull requests failed for %s", full_name)
+                            detail = "Unable to fetch pull requests"
+                        failed += 1
+                        yield {"type": "error", "position": position, "full_name": full_name, "detail": detail}
+                        continue
+                    if entry:
+                        returned += 1
+                        yield {"type": "repo", "position": position, **entry}
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        yield {"type": "summary", "total_repos_scanned": len(repos), "repos": returned, "errors": failed}
+
+    async def _pending_pr_entry(
+        self,
+        token: str,
+        repo: dict,
+        pulls_per_repo: int,
+        only_with_open: bool,
+        semaphore: asyncio.Semaphore,
+    ) -> dict | None:
+        owner = ((repo.get("owner") or {}).get("login")) or ""
+        name = repo.get("name") or ""
+        full_name = repo.get("full_name") or f"{owner}/{name}"
+        if not owner or not name:
+            return None
+
+        async with semaphore:
+            pulls = await self.fetch_open_pulls(
+                token=token,
+                repo_owner=owner,
+                repo_name=name,
+                per_page=pulls_per_repo,
+            )
+
+        entry = {
+            "owner": owner,
+            "repo": name,
+            "full_name": full_name,
+            "private": bool(repo.get("private", False)),
+            "html_url": repo.get("html_url") or "",
+            "pending_pr_count": len(pulls),
+            "pending_pull_requests": [
+                {
+                    "number": pr.get("number"),
+                    "title": pr.get("title") or "",
+                    "html_url": pr.get("html_url") or "",
+                    "state": pr.get("state") or "open",
+                    "draft": bool(pr.get("draft", False)),
+                    "created_at": pr.get("created_at") or "",
+                    "updated_at": pr.get("updated_at") or "",
+                    "author": ((pr.get("user") or {}).get("login")),
+                }
+                for pr in pulls
+            ],
+        }
+
+        if only_with_open and entry["pending_pr_count"] == 0:
+            return None
+        return entry
+
     @staticmethod
     def extract_changed_files(diff_text: str) -> list[str]:
         files: list[str] = []
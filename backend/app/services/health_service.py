@@ -0,0 +1,91 @@
+import asyncio
+from time import monotonic
+
+import httpx
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.core.database import engine, is_sqlite
+from app.core.load_shedding import overload_reason
+from app.core.loop_monitor import EventLoopMonitor
+from app.services.llm_backends import LLMBackend
+
+settings = get_settings()
+
+
+class ReadinessService:
+    """Backs /health/ready: can this worker take an expensive request right now?
+
+    The database, the LLM servers and the event loop decide readiness. GitHub is
+    reported but does not fail the probe, since every worker shares that dependency.
+    """
+
+    def __init__(self, monitor: EventLoopMonitor, backend: LLMBackend, queue_depth) -> None:
+        self.monitor = monitor
+        self.backend = backend
+        self.queue_depth = queue_depth
+        self.timeout = settings.HEALTH_CHECK_TIMEOUT_SECONDS
+        self._github: tuple[float, dict] | None = None
+
+    async def check(self) -> tuple[bool, dict]:
+        database, github = await asyncio.gather(self._check_database(), self._check_github())
+        llm = self._check_llm()
+        queue_depth = self.queue_depth()
+        shedding = overload_reason(self.monitor, queue_depth)
+        ready = database["ok"] and llm["ok"] and shedding is None
+        return ready, {
+            "status": "ready" if ready else "not_ready",
+            "shedding": shedding,
+            "event_loop_lag_ms": round(self.monitor.lag() * 1000, 1),
+            "llm_queue_depth": queue_depth,
+            "database": database,
+            "llm": llm,
+            "github": github,
+        }
+
+    async def _check_database(self) -> dict:
+        def ping() -> None:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+        checked_out = engine.pool.checkedout()
+        capacity = None if is_sqlite else settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        pool = {
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "saturation": round(checked_out / capacity, 2) if capacity else None,
+        }
+        try:
+            await asyncio.wait_for(run_in_threadpool(ping), self.timeout)
+        except Exception as exc:  # noqa: BLE001
+            return {"ok": False, "error": type(exc).__name__, "pool": pool}
+        return {"ok": True, "pool": pool}
+
+    def _check_llm(self) -> dict:
+        # The pool's own health checker keeps endpoint state current; probing here would
+        # multiply LLM server traffic by the load balancer's polling rate.
+        endpoints = [
+            {"url": endpoint.url, "up": endpoint.available, "in_flight": endpoint.in_flight}
+            for endpoint in self.backend.pool.endpoints
+        ]
+        return {
+            "ok": any(endpoint["up"] for endpoint in endpoints),
+            "backend": self.backend.name,
+            "slots": self.backend.slots,
+            "endpoints": endpoints,
+        }
+
+    async def _check_github(self) -> dict:
+        now = monotonic()
+        if self._github and now - self._github[0] < settings.HEALTH_GITHUB_TTL_SECONDS:
+            return self._github[1]
+        try:
+            # /rate_limit does not count against the rate limit.
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(f"{settings.GITHUB_API_BASE_URL}/rate_limit")
+            result = {"ok": response.status_code < 500, "status_code": response.status_code}
+        except httpx.HTTPError as exc:
+            result = {"ok": False, "error": type(exc).__name__}
+        self._github = (now, result)
+        return result
@@ -0,0 +1,154 @@
+import hashlib
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core import metrics
+from app.core.database import SessionLocal
+from app.models.hunk_finding import HunkFinding
+
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@(.*)$")
+
+
+@dataclass
+class Hunk:
+    path: str
+    text: str
+    new_start: int
+    new_length: int
+    key: str = ""
+
+    def contains(self, line: int) -> bool:
+        return self.new_start <= line < self.new_start + max(self.new_length, 1)
+
+
+@dataclass
+class FileHunks:
+    path: str
+    header: str = ""
+    hunks: list[Hunk] = field(default_factory=list)
+
+
+def split_hunks(diff_text: str) -> list[FileHunks]:
+    """Split a unified diff into per-file headers and hunks, keeping each piece's original text."""
+    files: list[FileHunks] = []
+    lines: list[str] = []
+    header: re.Match | None = None
+
+    def flush() -> None:
+        if not files or not lines:
+            return
+        current = files[-1]
+        if header is None:
+            current.header = "\n".join(lines) + "\n"
+        else:
+            length = header.group(2)
+            current.hunks.append(
+                Hunk(
+                    path=current.path,
+                    text="\n".join(lines) + "\n",
+                    new_start=int(header.group(1)),
+                    new_length=int(length) if length is not None else 1,
+                )
+            )
+
+    for line in diff_text.splitlines():
+        if line.startswith("diff --git "):
+            flush()
+            match = re.search(r" b/(.+)$", line)
+            files.append(FileHunks(path=match.group(1).strip() if match else "unknown"))
+            lines, header = [line], None
+        elif not files:
+            continue
+        elif line.startswith("@@") and HUNK_HEADER.match(line):
+            flush()
+            lines, header = [line], HUNK_HEADER.match(line)
+        else:
+            lines.append(line)
+    flush()
+    return files
+
+
+def hunk_key(repo_name: str, hunk: Hunk, model: str, prompt_version: str) -> str:
+    # The @@ line numbers are left out so a hunk that merely moved still matches.
+    first_line, _, body = hunk.text.partition("\n")
+    match = HUNK_HEADER.match(first_line)
+    context = match.group(3).strip() if match else ""
+    normalized = "\n".join(line.rstrip() for line in body.splitlines())
+    parts = (repo_name, hunk.path, model, prompt_version, context, normalized)
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def relative_issues(hunk: Hunk, issues: list[dict]) -> list[dict]:
+    stored = []
+    for issue in issues:
+        issue = dict(issue)
+        line = issue.get("line")
+        issue["line"] = line - hunk.new_start if isinstance(line, int) else None
+        issue.pop("file", None)
+        stored.append(issue)
+    return stored
+
+
+def rebased_issues(hunk: Hunk, stored: list[dict]) -> list[dict]:
+    issues = []
+    for issue in stored:
+        issue = dict(issue)
+        offset = issue.get("line")
+        issue["line"] = hunk.new_start + offset if isinstance(offset, int) else None
+        issue["file"] = hunk.path
+        issues.append(issue)
+    return issues
+
+
+def owning_hunk(hunks: list[Hunk], issue: dict) -> Hunk | None:
+    file, line = issue.get("file"), issue.get("line")
+    if not file or not isinstance(line, int):
+        return None
+    for hunk in hunks:
+        if (hunk.path == file or hunk.path.endswith(f"/{file}")) and hunk.contains(line):
+            return hunk
+    return None
+
+
+class HunkMemoService:
+    """Persistent per-hunk findings; the store methods are sync and run in the threadpool."""
+
+    def lookup(self, keys: list[str]) -> dict[str, list[dict]]:
+        if not keys:
+            return {}
+        with SessionLocal() as db:
+            rows = db.execute(select(HunkFinding.key, HunkFinding.issues).where(HunkFinding.key.in_(keys)))
+            found = {key: issues for key, issues in rows}
+            if found:
+                db.execute(
+                    update(HunkFinding)
+                    .where(HunkFinding.key.in_(list(found)))
+                    .values(last_used_at=datetime.now(timezone.utc))
+                )
+                db.commit()
+        metrics.HUNK_MEMO_LOOKUPS_TOTAL.inc(len(found), outcome="hit")
+        metrics.HUNK_MEMO_LOOKUPS_TOTAL.inc(len(keys) - len(found), outcome="miss")
+        return found
+
+    def store(self, entries: dict[str, list[dict]]) -> None:
+        if not entries:
+            return
+        with SessionLocal() as db:
+            dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+            statement = dialect.insert(HunkFinding).values(
+                [{"key": key, "issues": issues} for key, issues in entries.items()]
+            )
+            # Two reviews of the same hunk may race; the first result wins.
+            db.execute(statement.on_conflict_do_nothing(index_elements=["key"]))
+            db.commit()
+
+    def prune(self, days: int) -> int:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        with SessionLocal() as db:
+            result = db.execute(delete(HunkFinding).where(HunkFinding.last_used_at < cutoff))
+            db.commit()
+        return result.rowcount or 0
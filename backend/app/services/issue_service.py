@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import re
+from datetime import datetime
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.review import Review
+from app.models.review_issue import ReviewIssue
+from app.services.backfill import iter_review_batches
+
+logger = logging.getLogger(__name__)
+
+
+def message_hash(message: str | None) -> str:
+    normalized = re.sub(r"\s+", " ", (message or "").strip().lower())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def issue_rows(review: Review, created_at: datetime | None = None) -> list[dict]:
+    rows = []
+    for issue in (review.result_json or {}).get("issues", []):
+        if not isinstance(issue, dict) or issue.get("file") == "system":
+            # "system" marks the placeholder written when the LLM failed; it is not a finding.
+            continue
+        line = issue.get("line")
+        row = {
+            "review_id": review.id,
+            "user_id": review.user_id,
+            "repo_name": review.repo_name,
+            "file": str(issue.get("file") or "unknown")[:1024],
+            "line": line if isinstance(line, int) else None,
+            "severity": str(issue.get("severity") or "low").lower(),
+            "message_hash": message_hash(issue.get("message")),
+        }
+        if created_at is not None:
+            row["created_at"] = created_at
+        rows.append(row)
+    return rows
+
+
+def backfill_review_issues(session: Session, batch_size: int, commit: bool = True) -> int:
+    total = 0
+    for batch in iter_review_batches(session, batch_size):
+        rows = [row for review in batch for row in issue_rows(review, created_at=review.created_at)]
+        if rows:
+            session.execute(insert(ReviewIssue), rows)
+        if commit:
+            session.commit()
+        total += len(batch)
+        logger.info("Backfilled issues for %s reviews (total %s)", len(batch), total)
+    return total
+
+
+class ReviewIssueService:
+    def record(self, db: Session, reviews: list[Review]) -> None:
+        """Bulk-insert one row per finding; call after flush so review ids exist, before commit."""
+        rows = [row for review in reviews for row in issue_rows(review)]
+        if rows:
+            db.execute(insert(ReviewIssue), rows)
+
+    def remove_reviews(self, db: Session, review_ids: list[int]) -> None:
+        if review_ids:
+            db.execute(delete(ReviewIssue).where(ReviewIssue.review_id.in_(review_ids)))
+
+    def list_issues(
+        self,
+        db: Session,
+        user_id: int,
+        severity: str | None = None,
+        repo_name: str | None = None,
+        file: str | None = None,
+        file_prefix: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[ReviewIssue]:
+        query = select(ReviewIssue).where(ReviewIssue.user_id == user_id)
+        if severity:
+            query = query.where(ReviewIssue.severity == severity)
+        if since:
+            query = query.where(ReviewIssue.created_at >= since)
+        if until:
+            query = query.where(ReviewIssue.created_at < until)
+        query = self._file_filters(query, repo_name, file, file_prefix)
+        query = query.order_by(ReviewIssue.created_at.desc(), ReviewIssue.id.desc())
+        return list(db.scalars(query.limit(limit).offset(offset)))
+
+    def top_files(
+        self,
+        db: Session,
+        user_id: int,
+        repo_name: str | None = None,
+        severity: str | None = None,
+        since: datetime | None = None,
+        limit: int = 20,
+    ) -> list[dict]:
+        issue_count = func.count(ReviewIssue.id).label("issue_count")
+        query = select(
+            ReviewIssue.repo_name,
+            ReviewIssue.file,
+            issue_count,
+            func.count(func.distinct(ReviewIssue.message_hash)).label("distinct_messages"),
+            func.max(ReviewIssue.created_at).label("last_flagged_at"),
+        ).where(ReviewIssue.user_id == user_id)
+        if severity:
+            query = query.where(ReviewIssue.severity == severity)
+        if since:
+            query = query.where(ReviewIssue.created_at >= since)
+        query = self._file_filters(query, repo_name, None, None)
+        query = (
+            query.group_by(ReviewIssue.repo_name, ReviewIssue.file)
+            .order_by(issue_count.desc(), ReviewIssue.repo_name, ReviewIssue.file)
+            .limit(limit)
+        )
+        return [dict(row) for row in db.execute(query).mappings()]
+
+    @staticmethod
+    def _file_filters(query, repo_name: str | None, file: str | None, file_prefix: str | None):
+        if repo_name:
+            query = query.where(ReviewIssue.repo_name == repo_name)
+        if file:
+            query = query.where(ReviewIssue.file == file)
+        elif file_prefix:
+            query = query.where(ReviewIssue.file.startswith(file_prefix, autoescape=True))
+        return query
@@ -0,0 +1,194 @@
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from time import perf_counter
+from typing import Any, AsyncIterator
+
+import httpx
+
+from app.core import metrics
+from app.core.config import Settings
+from app.core.timing import span
+from app.services.ollama_pool import OllamaPool
+
+# Counters from Ollama's final response; durations are in nanoseconds. Every backend reports these keys.
+OLLAMA_USAGE_FIELDS = (
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "eval_count",
+    "eval_duration",
+    "load_duration",
+    "total_duration",
+)
+
+
+class LLMBackend(ABC):
+    """One inference API behind a pool of servers.
+
+    `slots` is how many requests the servers process at once; callers beyond that wait in
+    `slot()`, so the queue builds here (where load shedding can see it) instead of on the servers.
+    """
+
+    name = ""
+    chat_path = ""
+    health_path = ""
+    # Ollama loads models on first use, so they are worth warming up; other servers load theirs at start.
+    loads_models_on_demand = False
+
+    def __init__(self, pool: OllamaPool, slots_per_endpoint: int, timeout: float) -> None:
+        self.pool = pool
+        self.timeout = timeout
+        self.slots = max(1, slots_per_endpoint) * len(pool.endpoints)
+        self.waiting = 0
+        self._slots = asyncio.Semaphore(self.slots)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        self.waiting += 1
+        metrics.LLM_QUEUE_DEPTH.set(self.waiting)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+            metrics.LLM_QUEUE_DEPTH.set(self.waiting)
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    async def chat(
+        self, messages: list[dict[str, str]], model: str, options: dict[str, Any]
+    ) -> tuple[str, dict[str, Any]]:
+        """Send one chat request; returns the reply text and its OLLAMA_USAGE_FIELDS counters."""
+        async with self.pool.endpoint() as endpoint:
+            started = perf_counter()
+            try:
+                with span("llm.generate"):
+                    async with httpx.AsyncClient(timeout=self.timeout) as client:
+                        response = await client.post(
+                            f"{endpoint.url}{self.chat_path}",
+                            json=self.payload(messages, model, options),
+                            headers=self.headers(),
+                        )
+            except httpx.RequestError as exc:
+                metrics.LLM_REQUEST_SECONDS.observe(perf_counter() - started, outcome="connect_error")
+                self.pool.record_failure(endpoint)
+                raise RuntimeError(f"Failed to connect to {self.name} at {endpoint.url}") from exc
+
+            elapsed = perf_counter() - started
+            outcome = "ok" if response.status_code < 400 else "http_error"
+            metrics.LLM_REQUEST_SECONDS.observe(elapsed, outcome=outcome)
+
+            if response.status_code >= 500:
+                self.pool.record_failure(endpoint)
+            else:
+                # 4xx (e.g. unknown model) is a configuration problem, not a sick node.
+                self.pool.record_success(endpoint)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{self.name} request failed with status {response.status_code}")
+
+        try:
+            body = response.json()
+        except ValueError as exc:
+            raise RuntimeError(f"{self.name} returned invalid JSON payload") from exc
+        output, stats = self.parse(body, elapsed)
+        if not output:
+            raise RuntimeError(f"Empty response from {self.name}")
+        return output, stats
+
+    def headers(self) -> dict[str, str]:
+        return {}
+
+    @abstractmethod
+    def payload(self, messages: list[dict[str, str]], model: str, options: dict[str, Any]) -> dict[str, Any]:
+        """The JSON request body for `chat_path`."""
+
+    @abstractmethod
+    def parse(self, body: dict[str, Any], elapsed: float) -> tuple[str, dict[str, Any]]:
+        """The reply text and OLLAMA_USAGE_FIELDS counters from a response body."""
+
+
+class OllamaBackend(LLMBackend):
+    name = "Ollama"
+    chat_path = "/api/chat"
+    health_path = "/api/tags"
+    loads_models_on_demand = True
+
+    def __init__(self, pool: OllamaPool, slots_per_endpoint: int, timeout: float, keep_alive: str) -> None:
+        super().__init__(pool, slots_per_endpoint, timeout)
+        self.keep_alive = keep_alive
+
+    def payload(self, messages: list[dict[str, str]], model: str, options: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "model": model,
+            "messages": messages,
+            "stream": False,
+            "format": "json",
+            "keep_alive": self.keep_alive,
+            "options": options,
+        }
+
+    def parse(self, body: dict[str, Any], elapsed: float) -> tuple[str, dict[str, Any]]:
+        output = ((body.get("message") or {}).get("content") or "").strip()
+        return output, {key: body.get(key) for key in OLLAMA_USAGE_FIELDS}
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """`/v1/chat/completions` as served by llama.cpp's llama-server, vLLM and similar servers."""
+
+    name = "OpenAI-compatible server"
+    chat_path = "/v1/chat/completions"
+    health_path = "/v1/models"
+
+    def __init__(self, pool: OllamaPool, slots_per_endpoint: int, timeout: float, api_key: str = "") -> None:
+        super().__init__(pool, slots_per_endpoint, timeout)
+        self.api_key = api_key
+
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    def payload(self, messages: list[dict[str, str]], model: str, options: dict[str, Any]) -> dict[str, Any]:
+        # Context size is fixed when the server starts, so num_ctx has no equivalent here.
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": False,
+            "response_format": {"type": "json_object"},
+        }
+        if "temperature" in options:
+            payload["temperature"] = options["temperature"]
+        return payload
+
+    def parse(self, body: dict[str, Any], elapsed: float) -> tuple[str, dict[str, Any]]:
+        choices = body.get("choices") or [{}]
+        output = ((choices[0].get("message") or {}).get("content") or "").strip()
+        usage = body.get("usage") or {}
+        # llama-server adds per-phase timings in ms; other servers only report token counts.
+        timings = body.get("timings") or {}
+        stats = {
+            "prompt_eval_count": usage.get("prompt_tokens"),
+            "eval_count": usage.get("completion_tokens"),
+            "prompt_eval_duration": int(timings["prompt_ms"] * 1e6) if "prompt_ms" in timings else None,
+            "eval_duration": int(timings["predicted_ms"] * 1e6) if "predicted_ms" in timings else None,
+            "load_duration": None,
+            "total_duration": int(elapsed * 1e9),
+        }
+        return output, stats
+
+
+def build_backend(settings: Settings) -> LLMBackend:
+    if settings.LLM_BACKEND not in ("ollama", "openai"):
+        raise ValueError(f"Unknown LLM_BACKEND {settings.LLM_BACKEND!r}; expected 'ollama' or 'openai'")
+    openai = settings.LLM_BACKEND == "openai"
+    api_key = settings.OPENAI_API_KEY if openai else ""
+    pool = OllamaPool(
+        settings.openai_base_urls if openai else settings.ollama_base_urls,
+        eject_after=settings.OLLAMA_EJECT_AFTER_FAILURES,
+        eject_seconds=settings.OLLAMA_EJECT_SECONDS,
+        health_check_interval=settings.OLLAMA_HEALTH_CHECK_INTERVAL_SECONDS,
+        health_path=(OpenAICompatibleBackend if openai else OllamaBackend).health_path,
+        health_headers={"Authorization": f"Bearer {api_key}"} if api_key else None,
+    )
+    if openai:
+        return OpenAICompatibleBackend(pool, settings.OPENAI_PARALLEL_SLOTS, settings.LLM_TIMEOUT_SECONDS, api_key)
+    return OllamaBackend(pool, settings.LLM_MAX_CONCURRENCY, settings.LLM_TIMEOUT_SECONDS, settings.OLLAMA_KEEP_ALIVE)
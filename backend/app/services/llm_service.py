@@ -1,123 +1,328 @@
+import hashlib
 import json
 import logging
 import re
-from typing import Any
+from time import perf_counter
+from typing import Any, Literal
 
-import httpx
 from pydantic import BaseModel
 
+from app.core import metrics
 from app.core.config import get_settings
 from app.schemas.review import Issue
+from app.services.hunk_memo import split_hunks
+from app.services.llm_backends import OLLAMA_USAGE_FIELDS, build_backend
+from app.services.static_scan import merge_issues
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
-class LLMOutput(BaseModel):
-    issues: list[Issue]
-
-
-class LLMService:
-    def __init__(self) -> None:
-        self.base_url = settings.OLLAMA_BASE_URL.rstrip("/")
-        self.model = settings.OLLAMA_MODEL
-        self.max_retries = settings.LLM_MAX_RETRIES
-
-    async def analyze_diff(self, diff_text: str, changed_files: list[str]) -> dict[str, Any]:
-        truncated_diff = diff_text[: settings.MAX_DIFF_CHARS]
-        prompt = self._build_prompt(truncated_diff, changed_files)
-
-        last_error: Exception | None = None
-
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                model_output = await self._call_ollama(prompt)
-                parsed = self._parse_output(model_output)
-                result = parsed.model_dump()
-                result["changed_files"] = changed_files
-                return result
-            except Exception as exc:  # noqa: BLE001
-                last_error = exc
-                logger.warning("LLM parsing failed on attempt %s: %s", attempt, exc)
-
-        logger.error("LLM analysis failed after retries: %s", last_error)
-        return {
-            "issues": [
-                {
-                    "file": "system",
-                    "line": None,
-                    "severity": "low",
-                    "message": "Review completed with limited AI analysis due to LLM response error.",
-                    "code_snippet": None,
-                    "suggestion": "Retry in a minute or verify your Ollama model is running.",
-                }
-            ],
-            "changed_files": changed_files,
-        }
-
-    def _build_prompt(self, diff_text: str, changed_files: list[str]) -> str:
-        files_block = "\n".join(f"- {name}" for name in changed_files) if changed_files else "- none"
-
-        return f"""
+# Kept byte-identical across calls so Ollama can reuse its KV cache for this prefix;
+# everything request-specific goes in the user message.
+SYSTEM_PROMPT = """
 You are a principal code reviewer focusing on security and quality.
 Analyze the provided git diff and return ONLY valid minified JSON with this exact schema:
-{{
+{
   "issues": [
-    {{
+    {
       "file": "string",
       "line": 1,
       "severity": "low|medium|high",
       "message": "string",
       "code_snippet": "string",
       "suggestion": "string"
-    }}
+    }
   ]
-}}
+}
 
 Rules:
 - Must detect: SQL injection risks, hardcoded secrets, performance problems, security flaws, and code quality issues.
-- If no issues are found, return {{"issues":[]}}.
+- If no issues are found, return {"issues":[]}.
 - `severity` must be one of: low, medium, high.
 - Use line as integer when possible, otherwise null.
 - Never include markdown, explanation, or extra keys.
+""".strip()
 
-Changed files:
-{files_block}
+# First pass of the model cascade (LLM_TRIAGE_MODEL): a small model sorts files into benign and risky.
+TRIAGE_PROMPT = """
+You are a fast first-pass code reviewer. For every file in the provided git diff, decide whether it needs a
+careful security and quality review, and report only issues you are confident about.
+Return ONLY valid minified JSON with this exact schema:
+{
+  "files": [{"file": "string", "risk": "benign|risky"}],
+  "issues": [
+    {
+      "file": "string",
+      "line": 1,
+      "severity": "low|medium|high",
+      "message": "string",
+      "code_snippet": "string",
+      "suggestion": "string"
+    }
+  ]
+}
 
-Diff:
-{diff_text}
+Rules:
+- risky: authentication, authorization, cryptography, secrets, SQL or shell commands, deserialization,
+  parsing untrusted input, concurrency, money, or anything you are unsure about.
+- benign: documentation, tests, formatting, renames, simple configuration and straightforward logic.
+- `severity` must be one of: low, medium, high.
+- Never include markdown, explanation, or extra keys.
 """.strip()
 
-    async def _call_ollama(self, prompt: str) -> str:
-        url = f"{self.base_url}/api/generate"
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "format": "json",
-            "options": {"temperature": 0.1},
+SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2}
+
+# A load_duration above this means the model was not resident and had to be loaded.
+COLD_LOAD_SECONDS = 0.5
+
+# Part of every memoized hunk key, so editing the prompt invalidates findings produced by the old one.
+PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+TRIAGE_VERSION = hashlib.sha256(TRIAGE_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+
+def ollama_options() -> dict[str, Any]:
+    # num_ctx must match on every call (warm-up included): a different value reloads the model.
+    return {"temperature": 0.1, "num_ctx": settings.OLLAMA_NUM_CTX}
+
+
+# Module-level so every LLMService instance (single, batch and webhook reviews)
+# queues for the same inference slots.
+llm_backend = build_backend(settings)
+
+
+def inference_queue_depth() -> int:
+    """Calls currently waiting for an inference slot; load shedding and readiness read this."""
+    return llm_backend.waiting
+
+
+class LLMOutput(BaseModel):
+    issues: list[Issue]
+
+
+class FileRisk(BaseModel):
+    file: str
+    risk: Literal["benign", "risky"] = "risky"
+
+
+class TriageOutput(BaseModel):
+    files: list[FileRisk] = []
+    issues: list[Issue] = []
+
+
+class LLMService:
+    def __init__(self) -> None:
+        self.backend = llm_backend
+        self.model = settings.llm_model
+        self.options = ollama_options()
+        self.max_retries = settings.LLM_MAX_RETRIES
+        self.system_prompt = SYSTEM_PROMPT
+        self.max_diff_chars = settings.MAX_DIFF_CHARS
+        self.triage_model = settings.LLM_TRIAGE_MODEL
+        self.escalate_severity = settings.LLM_ESCALATE_SEVERITY
+        # Large-model seconds per prompt character, used to estimate what the cascade saved.
+        self._large_seconds_per_char: float | None = None
+
+    async def analyze_diff(
+        self, diff_text: str, changed_files: list[str], usage: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Review a diff and return the validated issues.
+
+        Pass `usage` to collect the prompt size, attempts, parse failures and the token counts
+        and durations the server reported, summed over every attempt.
+        """
+        usage = usage if usage is not None else {}
+        if self.triage_model:
+            return await self._cascade(diff_text, changed_files, usage)
+        return await self._review(diff_text, changed_files, usage)
+
+    @property
+    def model_tag(self) -> str:
+        """Identifies everything that shapes the findings; memoized hunks are keyed on it."""
+        if not self.triage_model:
+            return self.model
+        return f"{self.model}+{self.triage_model}:{TRIAGE_VERSION}:{self.escalate_severity}"
+
+    async def _review(self, diff_text: str, changed_files: list[str], usage: dict[str, Any]) -> dict[str, Any]:
+        messages = self._build_messages(diff_text[: self.max_diff_chars], changed_files, self.system_prompt)
+        self._start_usage(usage, messages, diff_text, self.model)
+        parsed = await self._generate(messages, self.model, LLMOutput, usage)
+        if parsed is None:
+            metrics.LLM_ANALYSIS_FAILURES_TOTAL.inc()
+            return {
+                "issues": [
+                    {
+                        "file": "system",
+                        "line": None,
+                        "severity": "low",
+                        "message": "Review completed with limited AI analysis due to LLM response error.",
+                        "code_snippet": None,
+                        "suggestion": "Retry in a minute or verify your LLM server is running.",
+                    }
+                ],
+                "changed_files": changed_files,
+            }
+
+        result = parsed.model_dump()
+        result["changed_files"] = changed_files
+        return result
+
+    async def _cascade(self, diff_text: str, changed_files: list[str], usage: dict[str, Any]) -> dict[str, Any]:
+        """Triage every file with the small model and send only risky ones to the large model."""
+        started = perf_counter()
+        triage_usage: dict[str, Any] = {}
+        messages = self._build_messages(diff_text[: self.max_diff_chars], changed_files, TRIAGE_PROMPT)
+        self._start_usage(triage_usage, messages, diff_text, self.triage_model)
+        # One attempt only: when triage fails, escalating everything is cheaper than retrying it.
+        triage = await self._generate(messages, self.triage_model, TriageOutput, triage_usage, attempts=1)
+        triage_seconds = perf_counter() - started
+
+        files = [
+            (file.path, file.header + "".join(hunk.text for hunk in file.hunks)) for file in split_hunks(diff_text)
+        ]
+        triage_issues = [issue.model_dump() for issue in triage.issues] if triage else []
+        escalate_all = triage is None or not files
+        escalated = [path for path, _ in files if escalate_all or self._needs_escalation(path, triage)]
+
+        large_seconds = 0.0
+        if escalated or escalate_all:
+            large_started = perf_counter()
+            escalated_diff = "".join(text for path, text in files if path in escalated) if files else diff_text
+            result = await self._review(escalated_diff, changed_files, usage)
+            large_seconds = perf_counter() - large_started
+            if not any(issue.get("file") == "system" for issue in result["issues"]):
+                self._learn_large_rate(large_seconds, usage["prompt_chars"])
+            usage["triage"] = triage_usage
+            # The large model's findings win where both flagged the same line.
+            result["issues"] = merge_issues(triage_issues, result["issues"])
+        else:
+            usage.update(triage_usage)
+            result = {"issues": triage_issues, "changed_files": changed_files}
+
+        metrics.LLM_CASCADE_FILES_TOTAL.inc(len(escalated), decision="escalated")
+        metrics.LLM_CASCADE_FILES_TOTAL.inc(len(files) - len(escalated), decision="triaged")
+        cascade_seconds = triage_seconds + large_seconds
+        estimated_single = self._estimate_large_seconds(diff_text, changed_files)
+        if estimated_single is not None:
+            metrics.LLM_CASCADE_SECONDS_TOTAL.inc(cascade_seconds, path="cascade")
+            metrics.LLM_CASCADE_SECONDS_TOTAL.inc(estimated_single, path="single_model_estimate")
+        result["cascade"] = {
+            "triage_model": self.triage_model,
+            "triage_failed": triage is None,
+            "files": len(files),
+            "escalated_files": escalated,
+            "escalation_rate": round(len(escalated) / len(files), 3) if files else 1.0,
+            "triage_ms": round(triage_seconds * 1000, 1),
+            "escalation_ms": round(large_seconds * 1000, 1),
+            "estimated_saved_ms": (
+                round((estimated_single - cascade_seconds) * 1000, 1) if estimated_single is not None else None
+            ),
         }
+        return result
 
-        try:
-            async with httpx.AsyncClient(timeout=settings.LLM_TIMEOUT_SECONDS) as client:
-                response = await client.post(url, json=payload)
-        except httpx.RequestError as exc:
-            raise RuntimeError("Failed to connect to Ollama") from exc
+    def _needs_escalation(self, path: str, triage: TriageOutput) -> bool:
+        def same_file(name: str) -> bool:
+            return path == name or path.endswith(f"/{name}")
 
-        if response.status_code >= 400:
-            raise RuntimeError(f"Ollama request failed with status {response.status_code}")
+        verdicts = [file.risk for file in triage.files if same_file(file.file)]
+        # A file the small model did not mention was not reviewed at all.
+        if not verdicts or "risky" in verdicts:
+            return True
+        threshold = SEVERITY_RANK.get(self.escalate_severity, SEVERITY_RANK["high"])
+        return any(same_file(issue.file) and SEVERITY_RANK[issue.severity] >= threshold for issue in triage.issues)
 
-        try:
-            body = response.json()
-        except ValueError as exc:
-            raise RuntimeError("Ollama returned invalid JSON payload") from exc
-        output = body.get("response", "").strip()
-        if not output:
-            raise RuntimeError("Empty response from Ollama")
+    def _learn_large_rate(self, seconds: float, prompt_chars: int) -> None:
+        if prompt_chars <= 0:
+            return
+        rate = seconds / prompt_chars
+        previous = self._large_seconds_per_char
+        self._large_seconds_per_char = rate if previous is None else 0.8 * previous + 0.2 * rate
+
+    def _estimate_large_seconds(self, diff_text: str, changed_files: list[str]) -> float | None:
+        """What sending the whole diff to the large model would have cost, from its observed speed."""
+        if self._large_seconds_per_char is None:
+            return None
+        messages = self._build_messages(diff_text[: self.max_diff_chars], changed_files, self.system_prompt)
+        return self._large_seconds_per_char * sum(len(message["content"]) for message in messages)
+
+    def _start_usage(
+        self, usage: dict[str, Any], messages: list[dict[str, str]], diff_text: str, model: str
+    ) -> None:
+        prompt_chars = sum(len(message["content"]) for message in messages)
+        metrics.LLM_PROMPT_CHARS.observe(prompt_chars)
+        usage.update(
+            {
+                "prompt_chars": prompt_chars,
+                "diff_truncated": len(diff_text) > self.max_diff_chars,
+                "model": model,
+                "attempts": 0,
+                "parse_failures": 0,
+                "cold_loads": 0,
+            }
+        )
+
+    async def _generate(
+        self,
+        messages: list[dict[str, str]],
+        model: str,
+        output_type: type[BaseModel],
+        usage: dict[str, Any],
+        attempts: int | None = None,
+    ) -> BaseModel | None:
+        """Call `model` until its output validates as `output_type`; None once the attempts run out."""
+        last_error: Exception | None = None
+
+        for attempt in range(1, (attempts or self.max_retries) + 1):
+            usage["attempts"] = attempt
+            if attempt > 1:
+                metrics.LLM_RETRIES_TOTAL.inc()
+            try:
+                async with self.backend.slot():
+                    model_output, stats = await self.backend.chat(messages, model, self.options)
+            except Exception as exc:  # noqa: BLE001
+                last_error = exc
+                logger.warning("LLM call to %s failed on attempt %s: %s", model, attempt, exc)
+                continue
 
-        return output
+            for key in OLLAMA_USAGE_FIELDS:
+                usage[key] = usage.get(key, 0) + (stats.get(key) or 0)
+            usage["cold_loads"] += self._observe_usage(stats, model)
+            try:
+                return self._parse_output(model_output, output_type)
+            except Exception as exc:  # noqa: BLE001
+                last_error = exc
+                usage["parse_failures"] += 1
+                metrics.LLM_PARSE_FAILURES_TOTAL.inc()
+                logger.warning("LLM parsing failed on attempt %s: %s", attempt, exc)
+
+        logger.error("LLM analysis with %s failed after retries: %s", model, last_error)
+        return None
+
+    @staticmethod
+    def _observe_usage(stats: dict[str, Any], model: str) -> int:
+        """Feed one call's Ollama counters into metrics; returns 1 if the call paid for a model load."""
+        metrics.LLM_TOKENS_TOTAL.inc(stats.get("prompt_eval_count") or 0, model=model, kind="prompt")
+        metrics.LLM_TOKENS_TOTAL.inc(stats.get("eval_count") or 0, model=model, kind="output")
+        if stats.get("eval_count") and stats.get("eval_duration"):
+            metrics.LLM_OUTPUT_TOKENS_PER_SECOND.observe(
+                stats["eval_count"] / (stats["eval_duration"] / 1e9), model=model
+            )
+        load_seconds = (stats.get("load_duration") or 0) / 1e9
+        if load_seconds < COLD_LOAD_SECONDS:
+            return 0
+        metrics.LLM_COLD_LOADS_TOTAL.inc(model=model)
+        return 1
+
+    @staticmethod
+    def _build_messages(diff_text: str, changed_files: list[str], system_prompt: str) -> list[dict[str, str]]:
+        files_block = "\n".join(f"- {name}" for name in changed_files) if changed_files else "- none"
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Changed files:\n{files_block}\n\nDiff:\n{diff_text}"},
+        ]
 
-    def _parse_output(self, raw_output: str) -> LLMOutput:
+    def _parse_output(self, raw_output: str, output_type: type[BaseModel] = LLMOutput) -> BaseModel:
         data = self._safe_json_load(raw_output)
 
         if isinstance(data, list):
@@ -141,7 +346,7 @@ Diff:
                     except (TypeError, ValueError):
                         issue["line"] = None
 
-        return LLMOutput.model_validate(data)
+        return output_type.model_validate(data)
 
     @staticmethod
     def _safe_json_load(raw_text: str) -> Any:
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from time import monotonic, perf_counter
+from typing import AsyncIterator
+
+import httpx
+
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass
+class OllamaEndpoint:
+    url: str
+    in_flight: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+
+    @property
+    def available(self) -> bool:
+        return monotonic() >= self.ejected_until
+
+
+class OllamaPool:
+    """Least-outstanding-requests balancer over one or more inference servers (Ollama or OpenAI-compatible).
+
+    Endpoints are ejected for `eject_seconds` after `eject_after` consecutive
+    failures or a failed health probe. When every endpoint is ejected the one
+    that comes back soonest is used anyway, so a lone server is never skipped.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        eject_after: int = 3,
+        eject_seconds: float = 30,
+        health_check_interval: float = 15,
+        health_path: str = "/api/tags",
+        health_headers: dict[str, str] | None = None,
+    ) -> None:
+        if not urls:
+            raise ValueError("OllamaPool needs at least one endpoint")
+        self.endpoints = [OllamaEndpoint(url=url.rstrip("/")) for url in urls]
+        self.eject_after = max(1, eject_after)
+        self.eject_seconds = eject_seconds
+        self.health_check_interval = health_check_interval
+        self.health_path = health_path
+        self.health_headers = health_headers or {}
+        self._next = 0
+        self._task: asyncio.Task | None = None
+        for endpoint in self.endpoints:
+            metrics.LLM_ENDPOINT_UP.set(1, endpoint=endpoint.url)
+            metrics.LLM_ENDPOINT_IN_FLIGHT.set(0, endpoint=endpoint.url)
+
+    def choose(self) -> OllamaEndpoint:
+        # Rotate the starting point so ties are spread round-robin.
+        count = len(self.endpoints)
+        ordered = [self.endpoints[(self._next + offset) % count] for offset in range(count)]
+        self._next = (self._next + 1) % count
+
+        available = [endpoint for endpoint in ordered if endpoint.available]
+        if not available:
+            return min(ordered, key=lambda endpoint: endpoint.ejected_until)
+        return min(available, key=lambda endpoint: endpoint.in_flight)
+
+    @asynccontextmanager
+    async def endpoint(self) -> AsyncIterator[OllamaEndpoint]:
+        endpoint = self.choose()
+        endpoint.in_flight += 1
+        metrics.LLM_ENDPOINT_IN_FLIGHT.set(endpoint.in_flight, endpoint=endpoint.url)
+        try:
+            yield endpoint
+        finally:
+            endpoint.in_flight -= 1
+            metrics.LLM_ENDPOINT_IN_FLIGHT.set(endpoint.in_flight, endpoint=endpoint.url)
+
+    def record_success(self, endpoint: OllamaEndpoint) -> None:
+        endpoint.consecutive_failures = 0
+        if endpoint.ejected_until:
+            endpoint.ejected_until = 0.0
+            metrics.LLM_ENDPOINT_UP.set(1, endpoint=endpoint.url)
+            logger.info("Ollama endpoint %s is back in rotation", endpoint.url)
+
+    def record_failure(self, endpoint: OllamaEndpoint, eject: bool = False) -> None:
+        endpoint.consecutive_failures += 1
+        if eject or endpoint.consecutive_failures >= self.eject_after:
+            if endpoint.available:
+                logger.warning(
+                    "Ejecting Ollama endpoint %s for %ss after %s failure(s)",
+                    endpoint.url,
+                    self.eject_seconds,
+                    endpoint.consecutive_failures,
+                )
+            endpoint.ejected_until = monotonic() + self.eject_seconds
+            metrics.LLM_ENDPOINT_UP.set(0, endpoint=endpoint.url)
+
+    async def check_health(self) -> None:
+        async with httpx.AsyncClient(timeout=HEALTH_CHECK_TIMEOUT_SECONDS, headers=self.health_headers) as client:
+
+            async def probe(endpoint: OllamaEndpoint) -> None:
+                try:
+                    response = await client.get(f"{endpoint.url}{self.health_path}")
+                    healthy = response.status_code < 400
+                except httpx.HTTPError:
+                    healthy = False
+                if healthy:
+                    self.record_success(endpoint)
+                else:
+                    self.record_failure(endpoint, eject=True)
+
+            await asyncio.gather(*(probe(endpoint) for endpoint in self.endpoints))
+
+    async def warm_up(self, model: str, keep_alive: str, options: dict, timeout: float) -> None:
+        """Load `model` into memory on every endpoint; a generate call without a prompt only loads it."""
+        async with httpx.AsyncClient(timeout=timeout) as client:
+
+            async def load(endpoint: OllamaEndpoint) -> None:
+                started = perf_counter()
+                try:
+                    response = await client.post(
+                        f"{endpoint.url}/api/generate",
+                        json={"model": model, "keep_alive": keep_alive, "options": options},
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPError as exc:
+                    logger.warning("Warm-up of %s on %s failed: %s", model, endpoint.url, exc)
+                    self.record_failure(endpoint, eject=True)
+                    return
+                elapsed = perf_counter() - started
+                metrics.LLM_WARMUP_SECONDS.set(elapsed, endpoint=endpoint.url)
+                logger.info("Loaded %s on %s in %.1f s", model, endpoint.url, elapsed)
+
+            await asyncio.gather(*(load(endpoint) for endpoint in self.endpoints))
+
+    async def _run(self, warm_up_models: list[str], keep_alive: str, options: dict, timeout: float) -> None:
+        for model in warm_up_models:
+            await self.warm_up(model, keep_alive, options, timeout)
+        if self.health_check_interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.check_health()
+            except Exception:  # noqa: BLE001
+                logger.exception("Ollama health check failed")
+
+    def start(self, warm_up_models: list[str], keep_alive: str, options: dict, timeout: float) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(warm_up_models, keep_alive, options, timeout))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
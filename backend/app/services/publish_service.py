@@ -0,0 +1,222 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.models.review import Review
+from app.models.review_publication import ReviewPublication
+from app.services.github_service import GitHubService
+from app.services.hunk_memo import split_hunks
+from app.services.review_service import summarize_severity
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+SEVERITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+# Findings beyond the inline cap are listed in the review body, up to this many.
+MAX_SUMMARY_ITEMS = 50
+# A "publishing" row older than this was left by a worker that died mid-publish; it may be taken over.
+# Well past the GitHub timeouts of one publish (three calls of at most 30 seconds).
+STALE_CLAIM_SECONDS = 600
+
+
+def diff_positions(diff_text: str) -> dict[str, dict[int, int]]:
+    """Map each file's new-side line numbers to GitHub's review-comment `position`.
+
+    The position counts lines from the file's first `@@` header (which is position 0); later `@@`
+    headers and "\\ No newline" markers count too. Only added and context lines can take a comment.
+    """
+    positions: dict[str, dict[int, int]] = {}
+    for file in split_hunks(diff_text):
+        lines = positions.setdefault(file.path, {})
+        position = -1
+        for hunk in file.hunks:
+            new_line = hunk.new_start
+            for line in hunk.text.rstrip("\n").split("\n"):
+                position += 1
+                if line.startswith("@@"):
+                    continue
+                if line.startswith("+") or line.startswith(" ") or line == "":
+                    lines[new_line] = position
+                    new_line += 1
+    return positions
+
+
+def _resolve_path(positions: dict[str, dict[int, int]], file: str) -> str | None:
+    if file in positions:
+        return file
+    matches = [path for path in positions if path.endswith(f"/{file}")]
+    return matches[0] if len(matches) == 1 else None
+
+
+def _headline(issue: dict) -> str:
+    return f"**{str(issue.get('severity', 'low')).upper()}**: {str(issue.get('message', '')).strip()}"
+
+
+def _comment_body(issue: dict) -> str:
+    body = _headline(issue)
+    if issue.get("suggestion"):
+        body += f"\n\nSuggestion: {issue['suggestion'].strip()}"
+    return body
+
+
+def plan_review(issues: list[dict], diff_text: str, max_comments: int) -> tuple[list[dict], list[dict]]:
+    """Split findings into inline comments (worst first, at most `max_comments`) and the rest."""
+    positions = diff_positions(diff_text)
+    ranked = sorted(
+        (issue for issue in issues if issue.get("file") != "system"),
+        key=lambda issue: (
+            SEVERITY_ORDER.get(str(issue.get("severity", "low")).lower(), 3),
+            str(issue.get("file")),
+            issue.get("line") if isinstance(issue.get("line"), int) else 0,
+        ),
+    )
+    comments: list[dict] = []
+    summarized: list[dict] = []
+    for issue in ranked:
+        path = _resolve_path(positions, str(issue.get("file", "")))
+        line = issue.get("line")
+        position = positions[path].get(line) if path and isinstance(line, int) else None
+        if position is None or len(comments) >= max_comments:
+            summarized.append(issue)
+            continue
+        comments.append({"path": path, "position": position, "body": _comment_body(issue)})
+    return comments, summarized
+
+
+def review_body(issues: list[dict], summarized: list[dict]) -> str:
+    counts = summarize_severity(issues)
+    lines = [
+        f"Automated review: {counts['high']} high, {counts['medium']} medium "
+        f"and {counts['low']} low severity findings."
+    ]
+    if summarized:
+        lines += ["", "Findings without an inline comment:"]
+        for issue in summarized[:MAX_SUMMARY_ITEMS]:
+            location = issue.get("file", "unknown")
+            if isinstance(issue.get("line"), int):
+                location += f":{issue['line']}"
+            lines.append(f"- `{location}` {_headline(issue)}")
+        if len(summarized) > MAX_SUMMARY_ITEMS:
+            lines.append(f"- ...and {len(summarized) - MAX_SUMMARY_ITEMS} more")
+    return "\n".join(lines)
+
+
+def publication_result(publication: ReviewPublication, already_published: bool) -> dict:
+    return {
+        "review_id": publication.review_id,
+        "status": publication.status,
+        "github_review_id": publication.github_review_id,
+        "html_url": publication.html_url,
+        "commit_id": publication.commit_id,
+        "inline_comments": publication.inline_comments,
+        "summarized": publication.summarized,
+        "already_published": already_published,
+        "published_at": publication.published_at,
+    }
+
+
+class ReviewPublishService:
+    def __init__(self) -> None:
+        self.github_service = GitHubService()
+
+    def _claim(self, db: Session, review: Review) -> ReviewPublication | None:
+        """Insert the "publishing" row, or return the existing row if another request got there first."""
+        existing = db.get(ReviewPublication, review.id)
+        if existing is not None:
+            return existing if existing.status == "published" else self._reclaim(db, existing)
+        db.add(ReviewPublication(review_id=review.id, user_id=review.user_id, status="publishing"))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return db.get(ReviewPublication, review.id)
+        return None
+
+    @staticmethod
+    def _reclaim(db: Session, claim: ReviewPublication) -> ReviewPublication | None:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=STALE_CLAIM_SECONDS)
+        # Conditional update, so of two requests reclaiming the same row only one wins.
+        result = db.execute(
+            update(ReviewPublication)
+            .where(
+                ReviewPublication.review_id == claim.review_id,
+                ReviewPublication.status == "publishing",
+                ReviewPublication.created_at < cutoff,
+            )
+            .values(created_at=func.now()),
+            execution_options={"synchronize_session": False},
+        )
+        db.commit()
+        db.expire_all()
+        if result.rowcount == 1:
+            logger.warning("Reclaimed a stale publish of review %s", claim.review_id)
+            return None
+        # Still fresh, or finished or released meanwhile: report whatever the row says now.
+        return db.get(ReviewPublication, claim.review_id) or claim
+
+    async def publish(self, db: Session, review: Review, token: str, max_comments: int | None = None) -> dict:
+        existing = self._claim(db, review)
+        if existing is not None:
+            if existing.status != "published":
+                raise HTTPException(status_code=409, detail="This review is already being published")
+            return publication_result(existing, already_published=True)
+
+        try:
+            result = await self._submit(db, review, token, max_comments or settings.PUBLISH_MAX_COMMENTS)
+        except BaseException:
+            # Release the claim so the user can retry once the problem is fixed.
+            db.rollback()
+            db.query(ReviewPublication).filter(ReviewPublication.review_id == review.id).delete()
+            db.commit()
+            raise
+        return result
+
+    async def _submit(self, db: Session, review: Review, token: str, max_comments: int) -> dict:
+        owner, _, name = review.repo_name.partition("/")
+        pull = await self.github_service.fetch_pull(token, owner, name, review.pr_number)
+        head_sha = (pull.get("head") or {}).get("sha")
+        if not review.head_sha:
+            raise HTTPException(
+                status_code=409,
+                detail="This review has no recorded head commit; review the pull request again to publish it",
+            )
+        if head_sha != review.head_sha:
+            # Line numbers only hold for the commit that was reviewed.
+            raise HTTPException(
+                status_code=409,
+                detail="The pull request has new commits since this review; review it again first",
+            )
+
+        diff, _ = await self.github_service.fetch_pr_diff(owner, name, review.pr_number, token)
+        issues = (review.result_json or {}).get("issues", [])
+        comments, summarized = plan_review(issues, diff, max_comments)
+        response = await self.github_service.create_pull_review(
+            token, owner, name, review.pr_number, head_sha, review_body(issues, summarized), comments
+        )
+        metrics.REVIEW_PUBLISH_FINDINGS_TOTAL.inc(len(comments), placement="inline")
+        metrics.REVIEW_PUBLISH_FINDINGS_TOTAL.inc(len(summarized), placement="summary")
+
+        publication = db.get(ReviewPublication, review.id)
+        publication.status = "published"
+        publication.github_review_id = response.get("id")
+        publication.html_url = response.get("html_url")
+        publication.commit_id = head_sha
+        publication.inline_comments = len(comments)
+        publication.summarized = len(summarized)
+        publication.published_at = datetime.now(timezone.utc)
+        db.commit()
+        logger.info(
+            "Published review %s to %s#%s (%s inline, %s summarized)",
+            review.id,
+            review.repo_name,
+            review.pr_number,
+            len(comments),
+            len(summarized),
+        )
+        return publication_result(publication, already_published=False)
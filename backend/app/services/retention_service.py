@@ -0,0 +1,105 @@
+import gzip
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.compression import compress_bytes, dumps_compact, resolve_codec
+from app.core.config import get_settings
+from app.models.review import Review
+from app.models.review_archive import ReviewArchive
+from app.models.review_publication import ReviewPublication
+from app.services.issue_service import ReviewIssueService
+from app.services.search_service import ReviewSearchService
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class RetentionService:
+    def __init__(self, batch_size: int | None = None) -> None:
+        self.batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+        # Archived rows are always compressed, even when hot storage is not.
+        self.codec = resolve_codec() or "gzip"
+        self.search_service = ReviewSearchService()
+        self.issue_service = ReviewIssueService()
+
+    @staticmethod
+    def cutoff_for(days: int) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(days=days)
+
+    def count_archivable(self, db: Session, days: int) -> int:
+        return db.query(Review).filter(Review.created_at < self.cutoff_for(days)).count()
+
+    def archive(self, db: Session, days: int, archive_file: Path | None = None) -> int:
+        cutoff = self.cutoff_for(days)
+        total = 0
+
+        while True:
+            batch = (
+                db.query(Review)
+                .filter(Review.created_at < cutoff)
+                .order_by(Review.id)
+                .limit(self.batch_size)
+                .all()
+            )
+            if not batch:
+                break
+
+            if archive_file is not None:
+                self._append_to_file(archive_file, batch)
+            else:
+                db.add_all(self._to_archive_row(review) for review in batch)
+
+            ids = [review.id for review in batch]
+            self.search_service.remove_reviews(db, ids)
+            self.issue_service.remove_reviews(db, ids)
+            publications = db.query(ReviewPublication).filter(ReviewPublication.review_id.in_(ids))
+            publications.delete(synchronize_session=False)
+            db.query(Review).filter(Review.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+            db.expunge_all()
+
+            total += len(batch)
+            logger.info("Archived %s reviews (total %s)", len(batch), total)
+
+        return total
+
+    def _to_archive_row(self, review: Review) -> ReviewArchive:
+        return ReviewArchive(
+            review_id=review.id,
+            user_id=review.user_id,
+            repo_name=review.repo_name,
+            pr_number=review.pr_number,
+            codec=self.codec,
+            payload=compress_bytes(dumps_compact(review.result_json or {}), self.codec),
+            created_at=review.created_at,
+        )
+
+    @staticmethod
+    def _append_to_file(archive_file: Path, batch: list[Review]) -> None:
+        archive_file.parent.mkdir(parents=True, exist_ok=True)
+        # Appending creates a multi-member gzip stream, which gzip readers handle transparently.
+        with gzip.open(archive_file, "at", encoding="utf-8") as handle:
+            for review in batch:
+                record = {
+                    "id": review.id,
+                    "user_id": review.user_id,
+                    "repo_name": review.repo_name,
+                    "pr_number": review.pr_number,
+                    "created_at": review.created_at.isoformat() if review.created_at else None,
+                    "result_json": review.result_json,
+                }
+                handle.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+                handle.write("\n")
+
+    @staticmethod
+    def compact(db: Session) -> None:
+        if db.get_bind().dialect.name != "sqlite":
+            return
+        db.commit()
+        with db.get_bind().connect() as connection:
+            connection.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM"))
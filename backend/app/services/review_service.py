@@ -1,12 +1,42 @@
+import asyncio
+import logging
+from time import perf_counter
+from typing import AsyncIterator
+
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.timing import span
 from app.models.review import Review
 from app.models.user import User
-from app.schemas.review import ReviewRequest
+from app.schemas.review import BatchReviewRequest, PullRequestRef, ReviewRequest
+from app.services.diff_minimizer import minimize_diff
 from app.services.github_service import GitHubService
-from app.services.llm_service import LLMService
+from app.services.hunk_memo import (
+    Hunk,
+    HunkMemoService,
+    hunk_key,
+    owning_hunk,
+    rebased_issues,
+    relative_issues,
+    split_hunks,
+)
+from app.services.issue_service import ReviewIssueService
+from app.services.llm_service import PROMPT_VERSION, LLMService
+from app.services.search_service import ReviewSearchService
+from app.services.static_scan import merge_issues, static_scanner
+from app.services.stats_service import ReviewStatsService
 from app.services.token_crypto import decrypt_secret
+from app.services.usage_service import ReviewUsageService
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+# Batch saves still running after their stream closed; referenced here so they are not garbage collected.
+_background_saves: set[asyncio.Task] = set()
 
 
 def summarize_severity(issues: list[dict]) -> dict[str, int]:
@@ -18,10 +48,21 @@ def summarize_severity(issues: list[dict]) -> dict[str, int]:
     return summary
 
 
+def llm_failed(result_json: dict | None) -> bool:
+    # "system" marks the placeholder written when the LLM failed; it is not a finding.
+    issues = (result_json or {}).get("issues", [])
+    return any(isinstance(issue, dict) and issue.get("file") == "system" for issue in issues)
+
+
 class ReviewService:
     def __init__(self) -> None:
         self.github_service = GitHubService()
         self.llm_service = LLMService()
+        self.search_service = ReviewSearchService()
+        self.issue_service = ReviewIssueService()
+        self.stats_service = ReviewStatsService()
+        self.hunk_memo = HunkMemoService()
+        self.usage_service = ReviewUsageService()
 
     async def run_review(
         self,
@@ -29,7 +70,18 @@ class ReviewService:
         user: User,
         db: Session,
     ) -> tuple[Review, dict]:
-        token = payload.github_token
+        started = perf_counter()
+        outcome = "error"
+        try:
+            result = await self._run_review(payload, user, db)
+            outcome = "ok"
+            return result
+        finally:
+            metrics.REVIEW_DURATION_SECONDS.observe(perf_counter() - started, outcome=outcome)
+
+    @staticmethod
+    def resolve_token(explicit_token: str | None, user: User) -> str:
+        token = explicit_token
         if not token and user.github_token_encrypted:
             try:
                 token = decrypt_secret(user.github_token_encrypted)
@@ -44,29 +96,374 @@ class ReviewService:
                 status_code=400,
                 detail="GitHub access is required. Connect your GitHub account or provide a token.",
             )
+        return token
 
+    async def ensure_token_valid(self, token: str) -> None:
         token_ok = await self.github_service.validate_token(token)
         if not token_ok:
             raise HTTPException(status_code=401, detail="Invalid GitHub token")
 
-        diff, changed_files = await self.github_service.fetch_pr_diff(
+    async def _run_review(
+        self,
+        payload: ReviewRequest,
+        user: User,
+        db: Session,
+    ) -> tuple[Review, dict]:
+        token = self.resolve_token(payload.github_token, user)
+        await self.ensure_token_valid(token)
+
+        pull = await self.github_service.fetch_pull(
+            token=token,
             repo_owner=payload.repo_owner,
             repo_name=payload.repo_name,
             pr_number=payload.pr_number,
-            token=token,
         )
+        head_sha = (pull.get("head") or {}).get("sha")
 
-        result_json = await self.llm_service.analyze_diff(diff, changed_files)
+        if head_sha and not payload.force:
+            cached = self.find_cached_review(
+                db, user.id, f"{payload.repo_owner}/{payload.repo_name}", payload.pr_number, head_sha
+            )
+            if cached is not None:
+                metrics.REVIEW_CACHE_HITS_TOTAL.inc()
+                return cached, cached.result_json
 
-        review = Review(
+        review = await self.analyze_and_save(
+            db,
             user_id=user.id,
-            repo_name=f"{payload.repo_owner}/{payload.repo_name}",
+            repo_owner=payload.repo_owner,
+            repo_name=payload.repo_name,
             pr_number=payload.pr_number,
+            token=token,
+            head_sha=head_sha,
+        )
+        return review, review.result_json
+
+    @staticmethod
+    def find_cached_review(
+        db: Session,
+        user_id: int,
+        repo_name: str,
+        pr_number: int,
+        head_sha: str,
+    ) -> Review | None:
+        """Latest successful review of this commit; a review saved while the LLM was down is not reused."""
+        reviews = (
+            db.query(Review)
+            .filter(
+                Review.user_id == user_id,
+                Review.repo_name == repo_name,
+                Review.pr_number == pr_number,
+                Review.head_sha == head_sha,
+            )
+            .order_by(Review.created_at.desc(), Review.id.desc())
+        )
+        return next((review for review in reviews if not llm_failed(review.result_json)), None)
+
+    async def analyze_and_save(
+        self,
+        db: Session,
+        user_id: int,
+        repo_owner: str,
+        repo_name: str,
+        pr_number: int,
+        token: str,
+        head_sha: str | None = None,
+    ) -> Review:
+        diff, changed_files = await self.github_service.fetch_pr_diff(
+            repo_owner=repo_owner,
+            repo_name=repo_name,
+            pr_number=pr_number,
+            token=token,
+        )
+
+        result_json = await self.analyze(diff, changed_files, f"{repo_owner}/{repo_name}")
+
+        review = Review(
+            user_id=user_id,
+            repo_name=f"{repo_owner}/{repo_name}",
+            pr_number=pr_number,
+            head_sha=head_sha,
             result_json=result_json,
         )
 
         db.add(review)
-        db.commit()
+        with span("db.commit"), metrics.REVIEW_DB_COMMIT_SECONDS.time():
+            db.flush()
+            self._record_findings(db, [review])
+            db.commit()
         db.refresh(review)
 
-        return review, result_json
+        return review
+
+    async def analyze(self, diff: str, changed_files: list[str], repo_name: str) -> dict:
+        scan = await static_scanner.scan(diff)
+        if scan.skip_reason and settings.STATIC_SCAN_SKIP_TRIVIAL:
+            metrics.LLM_SKIPPED_TOTAL.inc(reason=scan.skip_reason)
+            return {"issues": scan.issues, "changed_files": changed_files, "llm_skipped": scan.skip_reason}
+
+        minimization = None
+        if settings.DIFF_MINIMIZE_ENABLED:
+            minimized = minimize_diff(diff, settings.DIFF_CONTEXT_LINES, settings.DIFF_MAX_LINE_CHARS)
+            minimization = minimized.report(len(diff))
+            metrics.DIFF_MINIMIZE_CHARS_TOTAL.inc(len(diff), stage="before")
+            metrics.DIFF_MINIMIZE_CHARS_TOTAL.inc(len(minimized.text), stage="after")
+            if not minimized.hunks:
+                # Only renames, mode changes and whitespace edits: nothing left for the model to read.
+                metrics.LLM_SKIPPED_TOTAL.inc(reason="nothing_to_review")
+                return {
+                    "issues": scan.issues,
+                    "changed_files": changed_files,
+                    "llm_skipped": "nothing_to_review",
+                    "diff_minimization": minimization,
+                }
+            diff = minimized.text
+
+        usage: dict = {}
+        if settings.HUNK_MEMO_ENABLED:
+            result_json = await self._analyze_hunks(diff, changed_files, repo_name, usage)
+        else:
+            result_json = await self.llm_service.analyze_diff(diff, changed_files, usage=usage)
+        result_json["issues"] = merge_issues(result_json.get("issues", []), scan.issues)
+        if usage:
+            result_json["llm_usage"] = usage
+        if minimization:
+            result_json["diff_minimization"] = minimization
+        return result_json
+
+    async def _analyze_hunks(self, diff: str, changed_files: list[str], repo_name: str, usage: dict) -> dict:
+        """Reuse memoized findings for unchanged hunks and send only the rest to the LLM."""
+        files = [file for file in split_hunks(diff) if file.hunks]
+        hunks = [hunk for file in files for hunk in file.hunks]
+        if not hunks:
+            return await self.llm_service.analyze_diff(diff, changed_files, usage=usage)
+
+        for hunk in hunks:
+            hunk.key = hunk_key(repo_name, hunk, self.llm_service.model_tag, PROMPT_VERSION)
+        try:
+            memo = await run_in_threadpool(self.hunk_memo.lookup, [hunk.key for hunk in hunks])
+        except Exception:  # noqa: BLE001
+            logger.exception("Hunk memo lookup failed; reviewing the whole diff")
+            memo = {}
+
+        reused = [hunk for hunk in hunks if hunk.key in memo]
+        issues = [issue for hunk in reused for issue in rebased_issues(hunk, memo[hunk.key])]
+        result_json: dict = {"changed_files": changed_files}
+        fresh_diff = ""
+        seen: list[Hunk] = []
+        for file in files:
+            missed = [hunk for hunk in file.hunks if hunk.key not in memo]
+            if missed:
+                fresh_diff += file.header
+                for hunk in missed:
+                    fresh_diff += hunk.text
+                    # Hunks past MAX_DIFF_CHARS are cut off before the LLM sees them; don't memoize those.
+                    if len(fresh_diff) <= self.llm_service.max_diff_chars:
+                        seen.append(hunk)
+
+        if fresh_diff:
+            result_json = await self.llm_service.analyze_diff(fresh_diff, changed_files, usage=usage)
+            llm_issues = result_json.get("issues", [])
+            issues.extend(llm_issues)
+            if not any(issue.get("file") == "system" for issue in llm_issues):
+                await self._memoize(seen, llm_issues)
+        else:
+            # Every hunk was reused; say so, so the missing llm_usage isn't read as a failed call.
+            metrics.LLM_SKIPPED_TOTAL.inc(reason="memoized")
+            result_json["llm_skipped"] = "memoized"
+
+        result_json["issues"] = issues
+        result_json["hunk_reuse"] = {
+            "hunks": len(hunks),
+            "reused": len(reused),
+            "ratio": round(len(reused) / len(hunks), 3),
+        }
+        return result_json
+
+    async def _memoize(self, hunks: list[Hunk], issues: list[dict]) -> None:
+        found: dict[str, list[dict]] = {hunk.key: [] for hunk in hunks}
+        owners = {hunk.key: hunk for hunk in hunks}
+        unplaced: set[str] = set()
+        for issue in issues:
+            owner = owning_hunk(hunks, issue)
+            if owner is not None:
+                found[owner.key].append(issue)
+                continue
+            # A finding no hunk can hold (no line, a line outside every hunk, an unknown path) would be lost
+            # on the next review, so its file's hunks are not memoized; an unknown path rules out all of them.
+            file = str(issue.get("file") or "")
+            in_file = [
+                hunk for hunk in hunks if file and (hunk.path == file or hunk.path.endswith(f"/{file}"))
+            ]
+            unplaced.update(hunk.key for hunk in in_file or hunks)
+        entries = {
+            key: relative_issues(owners[key], found_issues)
+            for key, found_issues in found.items()
+            if key not in unplaced
+        }
+        if not entries:
+            return
+        try:
+            await run_in_threadpool(self.hunk_memo.store, entries)
+        except Exception:  # noqa: BLE001
+            logger.exception("Could not store hunk findings")
+
+    def _record_findings(self, db: Session, reviews: list[Review]) -> None:
+        # Derived rows are written in the review's own transaction so they never drift from it.
+        self.issue_service.record(db, reviews)
+        self.search_service.index_reviews(db, reviews)
+        self.stats_service.record(db, reviews)
+        self.usage_service.record(db, reviews)
+
+    async def resolve_batch_targets(self, payload: BatchReviewRequest, token: str) -> list[PullRequestRef]:
+        targets: dict[tuple[str, str, int], PullRequestRef] = {}
+        for pull in payload.pulls:
+            targets.setdefault((pull.repo_owner, pull.repo_name, pull.pr_number), pull)
+
+        async def expand(repo) -> list[PullRequestRef]:
+            pulls = await self.github_service.fetch_open_pulls(
+                token=token,
+                repo_owner=repo.repo_owner,
+                repo_name=repo.repo_name,
+                per_page=payload.pulls_per_repo,
+            )
+            return [
+                PullRequestRef(repo_owner=repo.repo_owner, repo_name=repo.repo_name, pr_number=pull["number"])
+                for pull in pulls
+                if pull.get("number")
+            ]
+
+        for expanded in await asyncio.gather(*(expand(repo) for repo in payload.repos)):
+            for pull in expanded:
+                targets.setdefault((pull.repo_owner, pull.repo_name, pull.pr_number), pull)
+
+        return list(targets.values())[: settings.BATCH_MAX_PULLS]
+
+    async def stream_batch_review(
+        self,
+        targets: list[PullRequestRef],
+        token: str,
+        user_id: int,
+    ) -> AsyncIterator[dict]:
+        """Review pull requests concurrently, yielding one event per PR as it finishes.
+
+        Diffs are fetched with bounded parallelism, the LLM slots are shared with
+        single reviews, and all successful results are committed in one transaction.
+        """
+        diff_slots = asyncio.Semaphore(max(1, settings.BATCH_DIFF_CONCURRENCY))
+
+        async def review_one(target: PullRequestRef) -> tuple[PullRequestRef, str | None, dict]:
+            async with diff_slots:
+                # The head commit is stored with the review so it can be published (and cached) later.
+                pull = await self.github_service.fetch_pull(
+                    token=token,
+                    repo_owner=target.repo_owner,
+                    repo_name=target.repo_name,
+                    pr_number=target.pr_number,
+                )
+                diff, changed_files = await self.github_service.fetch_pr_diff(
+                    repo_owner=target.repo_owner,
+                    repo_name=target.repo_name,
+                    pr_number=target.pr_number,
+                    token=token,
+                )
+            head_sha = (pull.get("head") or {}).get("sha")
+            result_json = await self.analyze(diff, changed_files, f"{target.repo_owner}/{target.repo_name}")
+            return target, head_sha, result_json
+
+        started = perf_counter()
+        yield {"type": "started", "total": len(targets)}
+
+        tasks = [asyncio.create_task(review_one(target)) for target in targets]
+        owners = {task: target for task, target in zip(tasks, targets)}
+        completed: list[tuple[PullRequestRef, str | None, dict]] = []
+        failed = 0
+
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    target = owners[task]
+                    repo_name = f"{target.repo_owner}/{target.repo_name}"
+                    error_event = {"type": "error", "repo_name": repo_name, "pr_number": target.pr_number}
+                    try:
+                        _, head_sha, result_json = task.result()
+                    except HTTPException as exc:
+                        failed += 1
+                        yield {**error_event, "detail": exc.detail}
+                        continue
+                    except Exception as exc:  # noqa: BLE001
+                        failed += 1
+                        logger.exception("Batch review failed for %s#%s", repo_name, target.pr_number)
+                        yield {**error_event, "detail": str(exc)}
+                        continue
+
+                    completed.append((target, head_sha, result_json))
+                    yield {
+                        "type": "result",
+                        "repo_name": repo_name,
+                        "pr_number": target.pr_number,
+                        "severity_summary": summarize_severity(result_json.get("issues", [])),
+                        "changed_files": result_json.get("changed_files", []),
+                        "result_json": result_json,
+                    }
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Started here so finished reviews are kept even when the client disconnects mid-stream.
+            save = asyncio.create_task(asyncio.to_thread(self._save_batch, user_id, completed))
+            _background_saves.add(save)
+            save.add_done_callback(self._save_done)
+
+        try:
+            review_ids = await asyncio.shield(save)
+        except Exception:  # noqa: BLE001
+            # Already logged by _save_done.
+            yield {"type": "error", "detail": "Reviews finished but could not be saved"}
+            return
+        metrics.REVIEW_DURATION_SECONDS.observe(perf_counter() - started, outcome="batch")
+        yield {
+            "type": "summary",
+            "completed": len(completed),
+            "failed": failed,
+            "reviews": [
+                {
+                    "id": review_id,
+                    "repo_name": f"{target.repo_owner}/{target.repo_name}",
+                    "pr_number": target.pr_number,
+                }
+                for review_id, (target, _, _) in zip(review_ids, completed)
+            ],
+        }
+
+    @staticmethod
+    def _save_done(save: asyncio.Task) -> None:
+        _background_saves.discard(save)
+        if not save.cancelled() and save.exception() is not None:
+            logger.error("Saving batch reviews failed", exc_info=save.exception())
+
+    def _save_batch(self, user_id: int, completed: list[tuple[PullRequestRef, str | None, dict]]) -> list[int]:
+        if not completed:
+            return []
+        db = SessionLocal()
+        try:
+            reviews = [
+                Review(
+                    user_id=user_id,
+                    repo_name=f"{target.repo_owner}/{target.repo_name}",
+                    pr_number=target.pr_number,
+                    head_sha=head_sha,
+                    result_json=result_json,
+                )
+                for target, head_sha, result_json in completed
+            ]
+            db.add_all(reviews)
+            with metrics.REVIEW_DB_COMMIT_SECONDS.time():
+                db.flush()
+                review_ids = [review.id for review in reviews]
+                self._record_findings(db, reviews)
+                db.commit()
+            return review_ids
+        finally:
+            db.close()
@@ -0,0 +1,219 @@
+import logging
+import re
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.review import Review
+from app.services.backfill import iter_review_batches
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "review_search"
+
+# One row per finding. SQLite keeps them in an FTS5 table; Postgres uses a plain table with a
+# generated, weighted tsvector column and a GIN index.
+SQLITE_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        message, file, repo_name, suggestion, code_snippet,
+        review_id UNINDEXED, user_id UNINDEXED, pr_number UNINDEXED,
+        line UNINDEXED, severity UNINDEXED,
+        tokenize = 'porter unicode61'
+    )
+    """,
+)
+POSTGRES_DDL = (
+    f"""
+    CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+        id BIGSERIAL PRIMARY KEY,
+        review_id INTEGER NOT NULL REFERENCES reviews (id) ON DELETE CASCADE,
+        user_id INTEGER NOT NULL,
+        repo_name VARCHAR(255) NOT NULL,
+        pr_number INTEGER NOT NULL,
+        file TEXT,
+        line INTEGER,
+        severity VARCHAR(16),
+        message TEXT,
+        suggestion TEXT,
+        code_snippet TEXT,
+        document TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(message, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(file, '') || ' ' || repo_name), 'B')
+            || setweight(
+                to_tsvector('english', coalesce(suggestion, '') || ' ' || coalesce(code_snippet, '')), 'C'
+            )
+        ) STORED
+    )
+    """,
+    f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)",
+    f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_user_severity ON {SEARCH_TABLE} (user_id, severity)",
+    f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_review ON {SEARCH_TABLE} (review_id)",
+)
+
+INSERT_SQL = text(
+    f"""
+    INSERT INTO {SEARCH_TABLE}
+        (review_id, user_id, repo_name, pr_number, file, line, severity, message, suggestion, code_snippet)
+    VALUES
+        (:review_id, :user_id, :repo_name, :pr_number, :file, :line, :severity, :message, :suggestion,
+         :code_snippet)
+    """
+)
+
+DELETE_SQL = text(f"DELETE FROM {SEARCH_TABLE} WHERE review_id IN :review_ids").bindparams(
+    bindparam("review_ids", expanding=True)
+)
+
+
+def create_search_index(connection: Connection) -> None:
+    statements = POSTGRES_DDL if connection.dialect.name == "postgresql" else SQLITE_DDL
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def search_rows(review: Review) -> list[dict]:
+    rows = []
+    for issue in (review.result_json or {}).get("issues", []):
+        if not isinstance(issue, dict) or issue.get("file") == "system":
+            # "system" marks the placeholder written when the LLM failed; it is not a finding.
+            continue
+        line = issue.get("line")
+        rows.append(
+            {
+                "review_id": review.id,
+                "user_id": review.user_id,
+                "repo_name": review.repo_name,
+                "pr_number": review.pr_number,
+                "file": issue.get("file"),
+                "line": line if isinstance(line, int) else None,
+                "severity": issue.get("severity"),
+                "message": issue.get("message"),
+                "suggestion": issue.get("suggestion"),
+                "code_snippet": issue.get("code_snippet"),
+            }
+        )
+    return rows
+
+
+def index_all_reviews(session: Session, batch_size: int, commit: bool = True) -> int:
+    total = 0
+    for batch in iter_review_batches(session, batch_size):
+        rows = [row for review in batch for row in search_rows(review)]
+        if rows:
+            session.execute(INSERT_SQL, rows)
+        if commit:
+            session.commit()
+        total += len(batch)
+        logger.info("Indexed %s reviews for search (total %s)", len(batch), total)
+    return total
+
+
+def _fts5_query(q: str) -> str:
+    # Quote every term so user input can never be parsed as FTS5 syntax; terms are ANDed.
+    return " ".join(f'"{term}"' for term in re.findall(r"\w+", q))
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class ReviewSearchService:
+    def index_reviews(self, db: Session, reviews: list[Review]) -> None:
+        """Add findings to the search index; call after flush so ids exist, before commit."""
+        rows = [row for review in reviews for row in search_rows(review)]
+        if rows:
+            db.execute(INSERT_SQL, rows)
+
+    def remove_reviews(self, db: Session, review_ids: list[int]) -> None:
+        if not review_ids:
+            return
+        # Postgres cascades from reviews; the FTS5 table has no foreign keys.
+        if db.get_bind().dialect.name != "postgresql":
+            db.execute(DELETE_SQL, {"review_ids": review_ids})
+
+    def rebuild(self, db: Session, batch_size: int) -> int:
+        db.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        db.commit()
+        return index_all_reviews(db, batch_size)
+
+    def search(
+        self,
+        db: Session,
+        user_id: int,
+        q: str | None,
+        severity: str | None,
+        file: str | None,
+        limit: int,
+        offset: int,
+    ) -> list[dict]:
+        if db.get_bind().dialect.name == "postgresql":
+            sql, params = self._postgres_query(q, severity, file)
+        else:
+            sql, params = self._sqlite_query(q, severity, file)
+        params.update({"user_id": user_id, "limit": limit, "offset": offset})
+        return [dict(row) for row in db.execute(text(sql), params).mappings()]
+
+    @staticmethod
+    def _filters(severity: str | None, file: str | None, params: dict) -> str:
+        clauses = ""
+        if severity:
+            clauses += " AND severity = :severity"
+            params["severity"] = severity
+        if file:
+            clauses += " AND file LIKE :file ESCAPE '\\'"
+            params["file"] = f"%{_escape_like(file)}%"
+        return clauses
+
+    def _sqlite_query(self, q: str | None, severity: str | None, file: str | None) -> tuple[str, dict]:
+        params: dict = {}
+        match = _fts5_query(q or "")
+        columns = "review_id, repo_name, pr_number, file, line, severity, message, suggestion"
+        if match:
+            params["match"] = match
+            sql = f"""
+                -- bm25() is lower-is-better; negate it so both backends sort by score DESC.
+                SELECT {columns},
+                       snippet({SEARCH_TABLE}, 0, '<<', '>>', '...', 16) AS snippet,
+                       -bm25({SEARCH_TABLE}, 4.0, 2.0, 1.0, 1.0, 1.0) AS score
+                FROM {SEARCH_TABLE}
+                WHERE {SEARCH_TABLE} MATCH :match
+                  AND user_id = :user_id{self._filters(severity, file, params)}
+                ORDER BY score DESC, review_id DESC
+                LIMIT :limit OFFSET :offset
+            """
+        else:
+            sql = f"""
+                SELECT {columns}, NULL AS snippet, NULL AS score
+                FROM {SEARCH_TABLE}
+                WHERE user_id = :user_id{self._filters(severity, file, params)}
+                ORDER BY review_id DESC, rowid
+                LIMIT :limit OFFSET :offset
+            """
+        return sql, params
+
+    def _postgres_query(self, q: str | None, severity: str | None, file: str | None) -> tuple[str, dict]:
+        params: dict = {}
+        columns = "review_id, repo_name, pr_number, file, line, severity, message, suggestion"
+        if q and q.strip():
+            params["q"] = q
+            sql = f"""
+                SELECT {columns},
+                       ts_headline('english', coalesce(message, ''), query,
+                                   'StartSel=<<, StopSel=>>, MaxWords=24, MinWords=8') AS snippet,
+                       ts_rank_cd(document, query) AS score
+                FROM {SEARCH_TABLE}, websearch_to_tsquery('english', :q) AS query
+                WHERE document @@ query AND user_id = :user_id{self._filters(severity, file, params)}
+                ORDER BY score DESC, review_id DESC
+                LIMIT :limit OFFSET :offset
+            """
+        else:
+            sql = f"""
+                SELECT {columns}, NULL AS snippet, NULL AS score
+                FROM {SEARCH_TABLE}
+                WHERE user_id = :user_id{self._filters(severity, file, params)}
+                ORDER BY review_id DESC, id
+                LIMIT :limit OFFSET :offset
+            """
+        return sql, params
@@ -0,0 +1,325 @@
+import ast
+import asyncio
+import logging
+import math
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from time import perf_counter
+from typing import Callable
+
+from app.core import metrics
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# `.txt` is left out on purpose: requirements.txt and CMakeLists.txt are code as far as review goes.
+DOC_SUFFIXES = {".md", ".markdown", ".rst", ".adoc"}
+DOC_NAMES = {"license", "licence", "changelog", "authors", "contributors", "notice", "codeowners"}
+# Under docs/ only these count as docs; conf.py, Sphinx extensions and the like are still code.
+DOC_DIR_SUFFIXES = DOC_SUFFIXES | {".txt", ".png", ".jpg", ".jpeg", ".gif", ".svg"}
+# Dependency and build files are never docs, even under docs/.
+NON_DOC_STEMS = ("requirements", "constraints", "cmakelists", "pipfile", "setup", "pyproject")
+# Leading whitespace is syntax in these, so a re-indent is a real change.
+INDENT_SENSITIVE_SUFFIXES = {".py", ".pyi", ".yaml", ".yml"}
+
+
+@dataclass
+class FileChange:
+    path: str
+    added: list[tuple[int, str]] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    # The hunks' old and new sides in order, context included.
+    before: list[str] = field(default_factory=list)
+    after: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ScanResult:
+    issues: list[dict]
+    skip_reason: str | None = None
+
+
+def parse_diff(diff_text: str) -> list[FileChange]:
+    """Collect added lines (with their new-file line numbers) and removed lines per file."""
+    files: list[FileChange] = []
+    current: FileChange | None = None
+    new_line = 0
+
+    for line in diff_text.splitlines():
+        if line.startswith("diff --git "):
+            match = re.search(r" b/(.+)$", line)
+            current = FileChange(path=match.group(1).strip() if match else "unknown")
+            files.append(current)
+        elif current is None or line.startswith(("+++", "---")):
+            continue
+        elif line.startswith("@@"):
+            match = re.search(r"\+(\d+)", line)
+            new_line = int(match.group(1)) if match else 0
+        elif line.startswith("+"):
+            current.added.append((new_line, line[1:]))
+            current.after.append(line[1:])
+            new_line += 1
+        elif line.startswith("-"):
+            current.removed.append(line[1:])
+            current.before.append(line[1:])
+        elif not line.startswith("\\"):
+            current.before.append(line[1:])
+            current.after.append(line[1:])
+            new_line += 1
+
+    return files
+
+
+def _issue(change: FileChange, line: int, severity: str, message: str, snippet: str, suggestion: str) -> dict:
+    return {
+        "file": change.path,
+        "line": line,
+        "severity": severity,
+        "message": message,
+        "code_snippet": snippet.strip()[:200],
+        "suggestion": suggestion,
+    }
+
+
+SECRET_PATTERNS = (
+    (re.compile(r"AKIA[0-9A-Z]{16}"), "AWS access key id"),
+    (re.compile(r"gh[pousr]_[A-Za-z0-9]{36,}"), "GitHub token"),
+    (re.compile(r"xox[baprs]-[A-Za-z0-9-]{10,}"), "Slack token"),
+    (re.compile(r"sk-[A-Za-z0-9]{32,}"), "API secret key"),
+    (re.compile(r"-----BEGIN (?:RSA |EC |OPENSSH |DSA )?PRIVATE KEY-----"), "private key"),
+)
+SECRET_ASSIGNMENT = re.compile(
+    r"(?i)\b[\w.-]*(password|passwd|secret[_-]?access[_-]?key|secret|api[_-]?key|token|credential)s?\b[\"']?"
+    r"\s*[:=]\s*[\"']([^\"'\s]{8,})[\"']"
+)
+PLACEHOLDER = re.compile(r"(?i)^(x+|\*+|changeme|example|dummy|placeholder|your[_-].*|<.*>|\$\{.*\}|test.*)$")
+
+
+def _entropy(value: str) -> float:
+    counts = {char: value.count(char) for char in set(value)}
+    return -sum(count / len(value) * math.log2(count / len(value)) for count in counts.values())
+
+
+def check_secrets(change: FileChange) -> list[dict]:
+    issues = []
+    for line_number, text in change.added:
+        for pattern, label in SECRET_PATTERNS:
+            if pattern.search(text):
+                issues.append(
+                    _issue(
+                        change,
+                        line_number,
+                        "high",
+                        f"Hardcoded {label} committed to the repository",
+                        text,
+                        "Remove the credential, rotate it, and load it from the environment or a secret manager.",
+                    )
+                )
+                break
+        else:
+            match = SECRET_ASSIGNMENT.search(text)
+            # Low-entropy values are usually placeholders or obviously fake test data.
+            if match and not PLACEHOLDER.match(match.group(2)) and _entropy(match.group(2)) >= 2.5:
+                issues.append(
+                    _issue(
+                        change,
+                        line_number,
+                        "high",
+                        f"Hardcoded {match.group(1).lower()} in source code",
+                        text,
+                        "Read the value from configuration or environment variables instead of source code.",
+                    )
+                )
+    return issues
+
+
+SQL_KEYWORDS = re.compile(r"(?i)\b(select\s.+\sfrom|insert\s+into|update\s+\w+\s+set|delete\s+from)\b")
+SQL_INTERPOLATION = re.compile(r"""["']\s*(\+|%\s*[\w(])|\bf["']|\.format\(|\$\{|["']\s*\.\s*\$""")
+
+
+def check_sql_injection(change: FileChange) -> list[dict]:
+    issues = []
+    for line_number, text in change.added:
+        if SQL_KEYWORDS.search(text) and SQL_INTERPOLATION.search(text):
+            issues.append(
+                _issue(
+                    change,
+                    line_number,
+                    "high",
+                    "SQL query is built by string interpolation, which allows SQL injection",
+                    text,
+                    "Use parameterized queries or the ORM query builder instead of formatting values into SQL.",
+                )
+            )
+    return issues
+
+
+PYTHON_CALL_RULES = {
+    "eval": ("high", "Use of eval() on dynamic input", "Parse the input explicitly (e.g. ast.literal_eval)."),
+    "exec": ("high", "Use of exec() on dynamic input", "Avoid executing dynamically built code."),
+    "pickle.loads": ("medium", "pickle.loads() on untrusted data can execute code", "Use JSON or a safe format."),
+    "yaml.load": ("medium", "yaml.load() without SafeLoader can construct arbitrary objects", "Use yaml.safe_load."),
+    "os.system": ("medium", "Shell command built at runtime", "Use subprocess.run with an argument list."),
+}
+
+
+def _call_name(node: ast.Call) -> str:
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+        return f"{func.value.id}.{func.attr}"
+    return ""
+
+
+def check_python_ast(change: FileChange) -> list[dict]:
+    if not change.path.endswith(".py"):
+        return []
+    issues = []
+    for line_number, text in change.added:
+        try:
+            # Diffs are fragments, so only self-contained added lines can be parsed.
+            tree = ast.parse(text.strip())
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Call):
+                continue
+            name = _call_name(node)
+            keywords = {keyword.arg: keyword.value for keyword in node.keywords}
+            if name == "yaml.load" and "Loader" in keywords:
+                continue
+            rule = PYTHON_CALL_RULES.get(name)
+            shell = keywords.get("shell")
+            if rule is None and name.startswith("subprocess.") and isinstance(shell, ast.Constant) and shell.value:
+                rule = ("medium", "subprocess call with shell=True", "Pass an argument list without shell=True.")
+            if rule:
+                severity, message, suggestion = rule
+                issues.append(_issue(change, line_number, severity, message, text, suggestion))
+    return issues
+
+
+CHECKERS: dict[str, Callable[[FileChange], list[dict]]] = {
+    "secrets": check_secrets,
+    "sql_injection": check_sql_injection,
+    "python_ast": check_python_ast,
+}
+
+
+def is_doc_file(path: str) -> bool:
+    pure = PurePosixPath(path)
+    if pure.stem.lower().startswith(NON_DOC_STEMS):
+        return False
+    return (
+        pure.suffix.lower() in DOC_SUFFIXES
+        or pure.stem.lower() in DOC_NAMES
+        or (
+            bool(pure.parts)
+            and pure.parts[0].lower() in {"docs", "doc"}
+            and pure.suffix.lower() in DOC_DIR_SUFFIXES
+        )
+    )
+
+
+def whitespace_only(path: str, before: list[str], after: list[str]) -> bool:
+    """True when a change's old and new sides (context included) match line for line once whitespace is
+    ignored, so moved or reordered lines still count as a change. Blank lines are ignored; leading
+    indentation still counts in indentation-sensitive files."""
+    keep_indent = PurePosixPath(path).suffix.lower() in INDENT_SENSITIVE_SUFFIXES
+
+    def normalized(lines: list[str]) -> list[str]:
+        result = []
+        for text in lines:
+            if not text.strip():
+                continue
+            indent = text[: len(text) - len(text.lstrip())] if keep_indent else ""
+            result.append(indent + "".join(text.split()))
+        return result
+
+    return normalized(before) == normalized(after)
+
+
+def trivial_reason(changes: list[FileChange]) -> str | None:
+    if not changes:
+        return None
+    if all(is_doc_file(change.path) for change in changes):
+        return "docs_only"
+    # Renames, mode changes and binary files have no lines at all; the minimizer reports those.
+    changed = any(change.added or change.removed for change in changes)
+    if changed and all(whitespace_only(change.path, change.before, change.after) for change in changes):
+        return "whitespace_only"
+    return None
+
+
+def scan_diff(diff_text: str, checker_names: tuple[str, ...]) -> ScanResult:
+    """Run in a worker process: everything here must be picklable and import-safe."""
+    changes = parse_diff(diff_text)
+    issues: list[dict] = []
+    for change in changes:
+        names = checker_names
+        if is_doc_file(change.path):
+            # Docs skip the code checks, but a credential pasted into a README still leaks.
+            names = tuple(name for name in checker_names if name == "secrets")
+        for name in names:
+            issues.extend(CHECKERS[name](change))
+    return ScanResult(issues=issues, skip_reason=trivial_reason(changes))
+
+
+class StaticScanner:
+    """Runs the deterministic checks off the event loop in a lazily created process pool."""
+
+    def __init__(self) -> None:
+        self.enabled = settings.STATIC_SCAN_ENABLED
+        self.workers = settings.STATIC_SCAN_WORKERS
+        self.checkers = tuple(name for name in settings.static_scan_checkers if name in CHECKERS)
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _executor(self) -> ProcessPoolExecutor | None:
+        if self.workers <= 0:
+            return None
+        if self._pool is None:
+            # spawn rather than fork: the server process already runs threads (anyio, the DB pool).
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def start(self) -> None:
+        """Spawn the workers up front so the first review does not pay for process start-up."""
+        executor = self._executor() if self.enabled else None
+        if executor is not None:
+            for _ in range(self.workers):
+                executor.submit(scan_diff, "", self.checkers)
+
+    async def scan(self, diff_text: str) -> ScanResult:
+        if not self.enabled:
+            return ScanResult(issues=[])
+        started = perf_counter()
+        executor = self._executor()
+        loop = asyncio.get_running_loop()
+        if executor is None:
+            result = await asyncio.to_thread(scan_diff, diff_text, self.checkers)
+        else:
+            result = await loop.run_in_executor(executor, scan_diff, diff_text, self.checkers)
+        metrics.STATIC_SCAN_SECONDS.observe(perf_counter() - started)
+        return result
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def merge_issues(llm_issues: list[dict], static_issues: list[dict]) -> list[dict]:
+    """Static findings go first; LLM findings on a line the scan already flagged are dropped."""
+    flagged = {(issue["file"], issue["line"]) for issue in static_issues}
+    return static_issues + [
+        issue for issue in llm_issues if (issue.get("file"), issue.get("line")) not in flagged
+    ]
+
+
+static_scanner = StaticScanner()
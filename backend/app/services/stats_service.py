@@ -0,0 +1,153 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.review import Review
+from app.models.review_archive import ReviewArchive
+from app.models.review_stats import ReviewDailyStats, ReviewFileStats
+from app.services.backfill import iter_review_batches
+from app.services.issue_service import issue_rows
+
+logger = logging.getLogger(__name__)
+
+SEVERITIES = ("low", "medium", "high")
+DAILY_KEYS = ("user_id", "repo_name", "day")
+DAILY_COUNTERS = ("review_count", "low_count", "medium_count", "high_count")
+FILE_KEYS = ("user_id", "repo_name", "file")
+FILE_COUNTERS = ("issue_count", "high_count")
+
+
+class _Rollup:
+    """In-memory aggregation of a set of reviews, keyed like the rollup tables."""
+
+    def __init__(self) -> None:
+        self.daily: dict[tuple, dict] = defaultdict(lambda: dict.fromkeys(DAILY_COUNTERS, 0))
+        self.files: dict[tuple, dict] = defaultdict(
+            lambda: {**dict.fromkeys(FILE_COUNTERS, 0), "last_flagged_at": None}
+        )
+
+    def add(self, review: Review | ReviewArchive, saved_at: datetime) -> None:
+        daily = self.daily[(review.user_id, review.repo_name, saved_at.date())]
+        daily["review_count"] += 1
+        for issue in issue_rows(review):
+            severity = issue["severity"] if issue["severity"] in SEVERITIES else "low"
+            daily[f"{severity}_count"] += 1
+
+            counts = self.files[(review.user_id, review.repo_name, issue["file"])]
+            counts["issue_count"] += 1
+            counts["high_count"] += int(severity == "high")
+            if counts["last_flagged_at"] is None or saved_at > counts["last_flagged_at"]:
+                counts["last_flagged_at"] = saved_at
+
+    @staticmethod
+    def rows(groups: dict[tuple, dict], keys: tuple[str, ...]) -> list[dict]:
+        return [{**dict(zip(keys, key)), **values} for key, values in groups.items()]
+
+
+class ReviewStatsService:
+    def record(self, db: Session, reviews: list[Review], saved_at: datetime | None = None) -> None:
+        """Fold newly saved reviews into the rollups with one upsert per table."""
+        rollup = _Rollup()
+        saved_at = saved_at or datetime.now(timezone.utc)
+        for review in reviews:
+            rollup.add(review, saved_at)
+
+        self._upsert(db, ReviewDailyStats, rollup.rows(rollup.daily, DAILY_KEYS), DAILY_KEYS, DAILY_COUNTERS)
+        self._upsert(
+            db,
+            ReviewFileStats,
+            rollup.rows(rollup.files, FILE_KEYS),
+            FILE_KEYS,
+            FILE_COUNTERS,
+            replace=("last_flagged_at",),
+        )
+
+    @staticmethod
+    def _upsert(
+        db: Session,
+        model,
+        rows: list[dict],
+        keys: tuple[str, ...],
+        counters: tuple[str, ...],
+        replace: tuple[str, ...] = (),
+    ) -> None:
+        if not rows:
+            return
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        table = model.__table__
+        statement = dialect.insert(table).values(rows)
+        updates = {column: table.c[column] + statement.excluded[column] for column in counters}
+        updates.update({column: statement.excluded[column] for column in replace})
+        db.execute(statement.on_conflict_do_update(index_elements=list(keys), set_=updates))
+
+    def rebuild(self, session: Session, batch_size: int, commit: bool = True) -> int:
+        """Recompute both rollups from live and archived reviews."""
+        rollup = _Rollup()
+        total = 0
+        for model in (Review, ReviewArchive):
+            for batch in iter_review_batches(session, batch_size, model=model):
+                for review in batch:
+                    rollup.add(review, review.created_at or datetime.now(timezone.utc))
+                total += len(batch)
+                logger.info("Aggregated %s reviews for stats (total %s)", len(batch), total)
+
+        session.execute(delete(ReviewDailyStats))
+        session.execute(delete(ReviewFileStats))
+        daily_rows = rollup.rows(rollup.daily, DAILY_KEYS)
+        file_rows = rollup.rows(rollup.files, FILE_KEYS)
+        for model, rows in ((ReviewDailyStats, daily_rows), (ReviewFileStats, file_rows)):
+            for start in range(0, len(rows), batch_size):
+                session.execute(insert(model), rows[start : start + batch_size])
+        if commit:
+            session.commit()
+        return total
+
+    def stats(self, db: Session, user_id: int, repo_name: str | None, days: int, top_files: int) -> dict:
+        since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+
+        daily_query = select(ReviewDailyStats).where(
+            ReviewDailyStats.user_id == user_id, ReviewDailyStats.day >= since
+        )
+        files_query = select(ReviewFileStats).where(ReviewFileStats.user_id == user_id)
+        if repo_name:
+            daily_query = daily_query.where(ReviewDailyStats.repo_name == repo_name)
+            files_query = files_query.where(ReviewFileStats.repo_name == repo_name)
+
+        daily = list(db.scalars(daily_query.order_by(ReviewDailyStats.day, ReviewDailyStats.repo_name)))
+        files_query = files_query.order_by(ReviewFileStats.issue_count.desc(), ReviewFileStats.file)
+        files = list(db.scalars(files_query.limit(top_files)))
+
+        totals = dict.fromkeys(("reviews", *SEVERITIES), 0)
+        for row in daily:
+            totals["reviews"] += row.review_count
+            for severity in SEVERITIES:
+                totals[severity] += getattr(row, f"{severity}_count")
+
+        return {
+            "since": since,
+            "days": days,
+            "totals": totals,
+            "daily": [
+                {
+                    "day": row.day,
+                    "repo_name": row.repo_name,
+                    "reviews": row.review_count,
+                    **{severity: getattr(row, f"{severity}_count") for severity in SEVERITIES},
+                }
+                for row in daily
+            ],
+            "top_files": [
+                {
+                    "repo_name": row.repo_name,
+                    "file": row.file,
+                    "issue_count": row.issue_count,
+                    "high_count": row.high_count,
+                    "last_flagged_at": row.last_flagged_at,
+                }
+                for row in files
+            ],
+        }
@@ -1,5 +1,6 @@
 import base64
 import hashlib
+from functools import lru_cache
 
 from cryptography.fernet import Fernet
 
@@ -18,14 +19,16 @@ def _resolve_fernet_key() -> bytes:
     return base64.urlsafe_b64encode(digest)
 
 
-_fernet = Fernet(_resolve_fernet_key())
+@lru_cache
+def _get_fernet() -> Fernet:
+    return Fernet(_resolve_fernet_key())
 
 
 def encrypt_secret(value: str) -> str:
-    token = _fernet.encrypt(value.encode("utf-8"))
+    token = _get_fernet().encrypt(value.encode("utf-8"))
     return token.decode("utf-8")
 
 
 def decrypt_secret(value: str) -> str:
-    decrypted = _fernet.decrypt(value.encode("utf-8"))
+    decrypted = _get_fernet().decrypt(value.encode("utf-8"))
     return decrypted.decode("utf-8")
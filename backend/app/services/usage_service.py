@@ -0,0 +1,142 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.review import Review
+from app.models.review_usage import ReviewLLMUsage
+from app.services.backfill import iter_review_batches
+
+logger = logging.getLogger(__name__)
+
+NS_PER_MS = 1_000_000
+
+
+def _total_duration(usage: dict) -> int:
+    # Older Ollama builds omit total_duration; the phases it would cover are the next best figure.
+    return int(usage.get("total_duration") or 0) or sum(
+        int(usage.get(key) or 0) for key in ("load_duration", "prompt_eval_duration", "eval_duration")
+    )
+
+
+def usage_row(review: Review, created_at: datetime | None = None) -> dict | None:
+    """Flatten `result_json["llm_usage"]`; reviews answered without an LLM call have none."""
+    usage = (review.result_json or {}).get("llm_usage")
+    if not isinstance(usage, dict) or not usage.get("attempts"):
+        return None
+    total = _total_duration(usage)
+    # An escalated cascade review also paid for the triage call; count it in the repo's inference time.
+    if isinstance(usage.get("triage"), dict):
+        total += _total_duration(usage["triage"])
+    row = {
+        "review_id": review.id,
+        "user_id": review.user_id,
+        "repo_name": review.repo_name,
+        "model": str(usage.get("model") or "unknown")[:255],
+        "llm_calls": int(usage.get("attempts") or 0),
+        "parse_failures": int(usage.get("parse_failures") or 0),
+        "cold_loads": int(usage.get("cold_loads") or 0),
+        "prompt_chars": int(usage.get("prompt_chars") or 0),
+        "prompt_tokens": int(usage.get("prompt_eval_count") or 0),
+        "output_tokens": int(usage.get("eval_count") or 0),
+        "prompt_eval_ms": int(usage.get("prompt_eval_duration") or 0) // NS_PER_MS,
+        "eval_ms": int(usage.get("eval_duration") or 0) // NS_PER_MS,
+        "load_ms": int(usage.get("load_duration") or 0) // NS_PER_MS,
+        "total_ms": int(total) // NS_PER_MS,
+    }
+    if created_at is not None:
+        row["created_at"] = created_at
+    return row
+
+
+def backfill_review_usage(session: Session, batch_size: int, commit: bool = True) -> int:
+    total = 0
+    for batch in iter_review_batches(session, batch_size):
+        rows = [row for review in batch if (row := usage_row(review, created_at=review.created_at))]
+        if rows:
+            session.execute(insert(ReviewLLMUsage), rows)
+        if commit:
+            session.commit()
+        total += len(batch)
+        logger.info("Backfilled LLM usage for %s reviews (total %s)", len(batch), total)
+    return total
+
+
+def _per_second(tokens: int, milliseconds: int) -> float | None:
+    return round(tokens / (milliseconds / 1000), 1) if milliseconds else None
+
+
+class ReviewUsageService:
+    def record(self, db: Session, reviews: list[Review]) -> None:
+        """Call after flush so review ids exist, before commit."""
+        rows = [row for review in reviews if (row := usage_row(review))]
+        if rows:
+            db.execute(insert(ReviewLLMUsage), rows)
+
+    def performance(
+        self, db: Session, user_id: int, repo_name: str | None, days: int, top_repos: int
+    ) -> dict:
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        usage = ReviewLLMUsage
+        filters = [usage.user_id == user_id, usage.created_at >= since]
+        if repo_name:
+            filters.append(usage.repo_name == repo_name)
+
+        totals = (
+            func.count().label("reviews"),
+            func.sum(usage.llm_calls).label("llm_calls"),
+            func.sum(usage.cold_loads).label("cold_loads"),
+            func.sum(usage.prompt_tokens).label("prompt_tokens"),
+            func.sum(usage.output_tokens).label("output_tokens"),
+            func.sum(usage.prompt_eval_ms).label("prompt_eval_ms"),
+            func.sum(usage.eval_ms).label("eval_ms"),
+            func.sum(usage.load_ms).label("load_ms"),
+            func.sum(usage.total_ms).label("total_ms"),
+        )
+        by_model = db.execute(
+            select(usage.model, *totals).where(*filters).group_by(usage.model).order_by(usage.model)
+        ).mappings()
+        total_ms = func.sum(usage.total_ms)
+        by_repo = db.execute(
+            select(usage.repo_name, *totals)
+            .where(*filters)
+            .group_by(usage.repo_name)
+            .order_by(total_ms.desc(), usage.repo_name)
+            .limit(top_repos)
+        ).mappings()
+
+        def per_call(value: int, row) -> float:
+            return value / row["llm_calls"] if row["llm_calls"] else 0.0
+
+        return {
+            "since": since,
+            "days": days,
+            "models": [
+                {
+                    "model": row["model"],
+                    "reviews": row["reviews"],
+                    "llm_calls": row["llm_calls"],
+                    "prompt_tokens": row["prompt_tokens"],
+                    "output_tokens": row["output_tokens"],
+                    "prompt_tokens_per_second": _per_second(row["prompt_tokens"], row["prompt_eval_ms"]),
+                    "output_tokens_per_second": _per_second(row["output_tokens"], row["eval_ms"]),
+                    "cold_loads": row["cold_loads"],
+                    "cold_load_rate": round(per_call(row["cold_loads"], row), 3),
+                    "avg_load_ms": round(per_call(row["load_ms"], row), 1),
+                }
+                for row in by_model
+            ],
+            "repos": [
+                {
+                    "repo_name": row["repo_name"],
+                    "reviews": row["reviews"],
+                    "llm_calls": row["llm_calls"],
+                    "prompt_tokens": row["prompt_tokens"],
+                    "output_tokens": row["output_tokens"],
+                    "inference_seconds": round(row["total_ms"] / 1000, 1),
+                    "avg_inference_seconds": round(row["total_ms"] / 1000 / row["reviews"], 2),
+                }
+                for row in by_repo
+            ],
+        }
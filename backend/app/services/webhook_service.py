@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.services.review_service import ReviewService
+from app.services.token_crypto import decrypt_secret
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+REVIEWABLE_ACTIONS = {"opened", "synchronize", "reopened"}
+
+
+@dataclass(frozen=True)
+class WebhookReviewJob:
+    delivery_id: str
+    user_id: int
+    repo_owner: str
+    repo_name: str
+    pr_number: int
+    head_sha: str | None
+
+
+def verify_signature(secret: str, body: bytes, signature_header: str | None) -> bool:
+    if not secret or not signature_header or not signature_header.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature_header)
+
+
+def sign_payload(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def find_connected_users(db: Session, payload: dict) -> list[User]:
+    repository = payload.get("repository") or {}
+    logins = {
+        ((repository.get("owner") or {}).get("login") or "").lower(),
+        ((payload.get("sender") or {}).get("login") or "").lower(),
+    }
+    logins.discard("")
+    if not logins:
+        return []
+
+    return (
+        db.query(User)
+        .filter(User.github_token_encrypted.isnot(None), func.lower(User.github_username).in_(logins))
+        .all()
+    )
+
+
+def build_jobs(delivery_id: str, payload: dict, users: list[User]) -> list[WebhookReviewJob]:
+    repository = payload.get("repository") or {}
+    pull = payload.get("pull_request") or {}
+    owner = (repository.get("owner") or {}).get("login")
+    name = repository.get("name")
+    number = pull.get("number") or payload.get("number")
+    if not owner or not name or not number:
+        return []
+
+    head_sha = (pull.get("head") or {}).get("sha")
+    return [
+        WebhookReviewJob(
+            delivery_id=delivery_id,
+            user_id=user.id,
+            repo_owner=owner,
+            repo_name=name,
+            pr_number=int(number),
+            head_sha=head_sha,
+        )
+        for user in users
+    ]
+
+
+class WebhookReviewQueue:
+    """Bounded background queue that pre-computes reviews for webhook events.
+
+    Delivery ids are remembered in a bounded LRU so GitHub redeliveries are
+    ignored. Deduplication is per worker process.
+    """
+
+    def __init__(self, review_service: ReviewService) -> None:
+        self.review_service = review_service
+        self.max_size = settings.WEBHOOK_QUEUE_SIZE
+        self.worker_count = max(1, settings.WEBHOOK_WORKERS)
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._seen_lock = Lock()
+        self._queue: asyncio.Queue[WebhookReviewJob] | None = None
+        self._workers: list[asyncio.Task] = []
+
+    def _queue_or_create(self) -> asyncio.Queue[WebhookReviewJob]:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+        return self._queue
+
+    def mark_delivery(self, delivery_id: str) -> bool:
+        """Record a delivery id; returns False if it was already seen."""
+        with self._seen_lock:
+            if delivery_id in self._seen:
+                self._seen.move_to_end(delivery_id)
+                return False
+            self._seen[delivery_id] = None
+            while len(self._seen) > settings.WEBHOOK_DEDUP_SIZE:
+                self._seen.popitem(last=False)
+            return True
+
+    def forget_delivery(self, delivery_id: str) -> None:
+        with self._seen_lock:
+            self._seen.pop(delivery_id, None)
+
+    def enqueue(self, jobs: list[WebhookReviewJob]) -> int:
+        queue = self._queue_or_create()
+        if queue.qsize() + len(jobs) > self.max_size:
+            raise HTTPException(status_code=503, detail="Review queue is full")
+        for job in jobs:
+            queue.put_nowait(job)
+        metrics.WEBHOOK_QUEUE_DEPTH.set(queue.qsize())
+        return len(jobs)
+
+    def start(self) -> None:
+        queue = self._queue_or_create()
+        if self._workers:
+            return
+        self._workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.worker_count)]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def _worker(self, queue: asyncio.Queue[WebhookReviewJob]) -> None:
+        while True:
+            job = await queue.get()
+            metrics.WEBHOOK_QUEUE_DEPTH.set(queue.qsize())
+            try:
+                await self.process(job)
+                metrics.WEBHOOK_EVENTS_TOTAL.inc(outcome="reviewed")
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                metrics.WEBHOOK_EVENTS_TOTAL.inc(outcome="review_failed")
+                logger.exception(
+                    "Pre-computed review failed for %s/%s#%s",
+                    job.repo_owner,
+                    job.repo_name,
+                    job.pr_number,
+                )
+            finally:
+                queue.task_done()
+
+    async def process(self, job: WebhookReviewJob) -> None:
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.id == job.user_id).first()
+            if user is None or not user.github_token_encrypted:
+                return
+
+            repo_name = f"{job.repo_owner}/{job.repo_name}"
+            if job.head_sha and self.review_service.find_cached_review(
+                db, user.id, repo_name, job.pr_number, job.head_sha
+            ):
+                return
+
+            await self.review_service.analyze_and_save(
+                db,
+                user_id=user.id,
+                repo_owner=job.repo_owner,
+                repo_name=job.repo_name,
+                pr_number=job.pr_number,
+                token=decrypt_secret(user.github_token_encrypted),
+                head_sha=job.head_sha,
+            )
+        finally:
+            db.close()
@@ -0,0 +1,8 @@
+"""Offline load-test and benchmark suite.
+
+Run from the ``backend`` directory::
+
+    python -m benchmarks.load --requests 200 --concurrency 16
+
+Fake GitHub and Ollama servers run in-process, so no network access is needed.
+"""
@@ -0,0 +1,75 @@
+"""Measure worker cold start: interpreter launch, imports and lifespan init.
+
+Usage (from ``backend``)::
+
+    python -m benchmarks.cold_start --runs 10
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from benchmarks.stats import run_metadata, summarize_latencies, write_results
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+WORKER_SNIPPET = """
+import asyncio, json
+from app.main import app
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        pass
+
+asyncio.run(boot())
+print(json.dumps(app.state.cold_start))
+"""
+
+
+def boot_once(database_url: str) -> tuple[float, dict]:
+    env = {**os.environ, "DATABASE_URL": database_url}
+    started = perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", WORKER_SNIPPET],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = (perf_counter() - started) * 1000
+    return wall_ms, json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.cold_start")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="prism-cold-") as workdir:
+        database_url = f"sqlite:///{Path(workdir) / 'cold.db'}"
+        first_wall, first_phases = boot_once(database_url)
+        warm = [boot_once(database_url) for _ in range(args.runs)]
+
+    scenarios = {"fresh_database": {"wall_ms": round(first_wall, 1), "phases_ms": first_phases}}
+    scenarios["migrated_database"] = {
+        "wall_ms": summarize_latencies([wall for wall, _ in warm]),
+        "phases_ms": {
+            phase: summarize_latencies([phases[phase] for _, phases in warm])
+            for phase in ("import", "init_db", "total")
+        },
+    }
+    print(json.dumps(scenarios, indent=2))
+    output = write_results({"meta": run_metadata({"runs": args.runs}), "scenarios": scenarios}, args.output, "cold-start")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
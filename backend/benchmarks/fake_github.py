@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import random
+from dataclasses import dataclass
+from threading import Lock
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+OWNER = "bench-org"
+
+
+@dataclass
+class FakeGitHubConfig:
+    repos: int = 25
+    pulls_per_repo: int = 3
+    diff_files: int = 4
+    diff_lines_per_file: int = 60
+    latency_ms: float = 40.0
+    jitter_ms: float = 10.0
+    rate_limit: int = 5000
+    seed: int = 7
+
+
+def build_diff(owner: str, repo: str, number: int, files: int, lines_per_file: int, seed: int) -> str:
+    rng = random.Random(f"{seed}:{owner}/{repo}#{number}")
+    chunks: list[str] = []
+    for index in range(files):
+        path = f"src/module_{index}/service_{rng.randint(0, 99)}.py"
+        chunks.append(f"diff --git a/{path} b/{path}")
+        chunks.append(f"index {rng.getrandbits(28):07x}..{rng.getrandbits(28):07x} 100644")
+        chunks.append(f"--- a/{path}")
+        chunks.append(f"+++ b/{path}")
+        chunks.append(f"@@ -1,{lines_per_file} +1,{lines_per_file} @@")
+        for line_no in range(lines_per_file):
+            roll = rng.random()
+            body = f"value_{line_no} = compute(item_{rng.randint(0, 999)}, retries={rng.randint(1, 5)})"
+            if roll < 0.15:
+                chunks.append(f"-{body}")
+                chunks.append(f"+{body.replace('compute', 'compute_fast')}")
+            elif roll < 0.2:
+                chunks.append(f'+query = "SELECT * FROM users WHERE id=" + user_id_{line_no}')
+            else:
+                chunks.append(f" {body}")
+    return "\n".join(chunks) + "\n"
+
+
+def commentable_positions(diff_text: str) -> dict[str, set[int]]:
+    """Positions GitHub accepts for review comments: each line after a file's first `@@`, bar that header."""
+    positions: dict[str, set[int]] = {}
+    path, position = None, None
+    for line in diff_text.splitlines():
+        if line.startswith("diff --git "):
+            path, position = line.rsplit(" b/", 1)[-1], None
+            positions[path] = set()
+        elif path is None:
+            continue
+        elif line.startswith("@@"):
+            position = 0 if position is None else position + 1
+        elif position is not None:
+            position += 1
+            if not line.startswith("\\"):
+                positions[path].add(position)
+    return positions
+
+
+def create_fake_github(config: FakeGitHubConfig | None = None) -> FastAPI:
+    config = config or FakeGitHubConfig()
+    app = FastAPI(title="Fake GitHub")
+    rng = random.Random(config.seed)
+    state = {"remaining": config.rate_limit}
+    lock = Lock()
+    diff_cache: dict[tuple[str, int], str] = {}
+    reviews: list[dict] = []
+
+    async def delay() -> None:
+        if config.latency_ms <= 0 and config.jitter_ms <= 0:
+            return
+        jitter = rng.uniform(-config.jitter_ms, config.jitter_ms)
+        await asyncio.sleep(max(0.0, config.latency_ms + jitter) / 1000)
+
+    def rate_headers() -> dict[str, str]:
+        with lock:
+            state["remaining"] = max(0, state["remaining"] - 1)
+            remaining = state["remaining"]
+        return {
+            "X-RateLimit-Limit": str(config.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Resource": "core",
+        }
+
+    def pull_payload(repo: str, number: int) -> dict:
+        return {
+            "number": number,
+            "title": f"Bench change {number} for {repo}",
+            "html_url": f"https://github.invalid/{OWNER}/{repo}/pull/{number}",
+            "state": "open",
+            "draft": False,
+            "created_at": "2026-01-01T00:00:00Z",
+            "updated_at": "2026-01-02T00:00:00Z",
+            "user": {"login": "bench-author"},
+            "head": {"sha": hashlib.sha1(f"{repo}#{number}".encode("utf-8")).hexdigest()},
+        }
+
+    @app.get("/user")
+    async def user():
+        await delay()
+        return JSONResponse({"login": "bench-user", "id": 1}, headers=rate_headers())
+
+    @app.get("/user/repos")
+    async def user_repos(per_page: int = 100, page: int = 1):
+        await delay()
+        start = (page - 1) * per_page
+        names = [f"repo-{index}" for index in range(config.repos)][start : start + per_page]
+        body = [
+            {
+                "name": name,
+                "full_name": f"{OWNER}/{name}",
+                "owner": {"login": OWNER},
+                "private": False,
+                "html_url": f"https://github.invalid/{OWNER}/{name}",
+            }
+            for name in names
+        ]
+        return JSONResponse(body, headers=rate_headers())
+
+    @app.get("/repos/{owner}/{repo}/pulls")
+    async def list_pulls(owner: str, repo: str, per_page: int = 30):
+        await delay()
+        count = min(per_page, config.pulls_per_repo)
+        return JSONResponse([pull_payload(repo, number) for number in range(1, count + 1)], headers=rate_headers())
+
+    def pull_diff(owner: str, repo: str, number: int) -> str:
+        key = (f"{owner}/{repo}", number)
+        if key not in diff_cache:
+            diff_cache[key] = build_diff(
+                owner, repo, number, config.diff_files, config.diff_lines_per_file, config.seed
+            )
+        return diff_cache[key]
+
+    @app.get("/repos/{owner}/{repo}/pulls/{number}")
+    async def get_pull(owner: str, repo: str, number: int, request: Request):
+        await delay()
+        headers = rate_headers()
+        if "diff" in request.headers.get("accept", ""):
+            return PlainTextResponse(pull_diff(owner, repo, number), headers=headers)
+        return JSONResponse(pull_payload(repo, number), headers=headers)
+
+    @app.post("/repos/{owner}/{repo}/pulls/{number}/reviews")
+    async def create_review(owner: str, repo: str, number: int, request: Request):
+        await delay()
+        headers = rate_headers()
+        body = await request.json()
+        # Like GitHub, reject the whole review if the commit is stale or any comment is outside the diff.
+        if body.get("commit_id") != pull_payload(repo, number)["head"]["sha"]:
+            message = {"message": "commit_id is not part of the pull request"}
+            return JSONResponse(message, 422, headers=headers)
+        positions = commentable_positions(pull_diff(owner, repo, number))
+        for comment in body.get("comments") or []:
+            if comment.get("position") not in positions.get(comment.get("path"), set()):
+                message = {"message": "Pull request review thread position is invalid"}
+                return JSONResponse(message, 422, headers=headers)
+        with lock:
+            review_id = len(reviews) + 1
+            reviews.append({"id": review_id, "repo": f"{owner}/{repo}", "number": number, **body})
+        html_url = f"https://github.invalid/{owner}/{repo}/pull/{number}#pullrequestreview-{review_id}"
+        return JSONResponse({"id": review_id, "html_url": html_url, "state": "COMMENTED"}, headers=headers)
+
+    @app.get("/bench/reviews")
+    async def submitted_reviews():
+        return reviews
+
+    return app
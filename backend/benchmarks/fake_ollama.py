@@ -0,0 +1,245 @@
+import asyncio
+import json
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CHARS_PER_TOKEN = 4
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_keep_alive(value) -> float | None:
+    """Seconds a model stays loaded after a request; None means forever (Ollama's negative values)."""
+    if value is None:
+        return 300.0
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        text = str(value).strip()
+        unit = next((unit for unit in ("ms", "s", "m", "h") if text.endswith(unit)), "")
+        seconds = float(text[: len(text) - len(unit)] or 0) * DURATION_UNITS.get(unit, 1)
+    return None if seconds < 0 else seconds
+
+
+@dataclass
+class FakeOllamaConfig:
+    model: str = "llama3"
+    eval_tokens_per_second: float = 40.0
+    prompt_tokens_per_second: float = 400.0
+    output_tokens: int = 120
+    malformed_rate: float = 0.0
+    cold_load_ms: float = 0.0
+    default_num_ctx: int = 2048
+    prompt_cache: bool = True
+    parallel_slots: int = 4
+    seed: int = 11
+
+
+def _fake_issues(rng: random.Random) -> dict:
+    severities = ("low", "medium", "high")
+    return {
+        "issues": [
+            {
+                "file": f"src/module_{rng.randint(0, 3)}/service_{rng.randint(0, 99)}.py",
+                "line": rng.randint(1, 60),
+                "severity": rng.choice(severities),
+                "message": "Query is built with string concatenation",
+                "code_snippet": 'query = "SELECT * FROM users WHERE id=" + user_id',
+                "suggestion": "Use parameterized queries.",
+            }
+            for _ in range(rng.randint(0, 3))
+        ]
+    }
+
+
+def create_fake_ollama(config: FakeOllamaConfig | None = None) -> FastAPI:
+    config = config or FakeOllamaConfig()
+    app = FastAPI(title="Fake Ollama")
+    rng = random.Random(config.seed)
+    state = {
+        "loaded": config.cold_load_ms <= 0,
+        "expires_at": None,
+        "loads": 0,
+        "num_ctx": config.default_num_ctx,
+    }
+    totals = {
+        "requests": 0,
+        "prompt_tokens": 0,
+        "cached_tokens": 0,
+        "truncated": 0,
+        "prompt_eval_seconds": 0.0,
+    }
+    # Each parallel slot keeps the KV cache of the last prompt it evaluated.
+    slot_prompts: deque[str] = deque(maxlen=max(1, config.parallel_slots))
+    load_lock = asyncio.Lock()
+
+    async def ensure_loaded(keep_alive, num_ctx: int | None = None) -> float:
+        started = time.perf_counter()
+        async with load_lock:
+            expires_at = state["expires_at"]
+            if expires_at is not None and time.monotonic() > expires_at and config.cold_load_ms > 0:
+                state["loaded"] = False
+            if num_ctx and num_ctx != state["num_ctx"]:
+                # A different context size means Ollama reloads the model and drops every cache.
+                state["num_ctx"] = num_ctx
+                state["loaded"] = False
+                slot_prompts.clear()
+            if not state["loaded"]:
+                await asyncio.sleep(config.cold_load_ms / 1000)
+                state["loaded"] = True
+                state["loads"] += 1
+        load_seconds = time.perf_counter() - started
+        ttl = parse_keep_alive(keep_alive)
+        state["expires_at"] = None if ttl is None else time.monotonic() + ttl
+        return load_seconds
+
+    def cached_tokens(prompt: str, prompt_tokens: int) -> int:
+        if not config.prompt_cache or prompt_tokens > state["num_ctx"]:
+            # Over-long prompts are truncated from the front, so no cached prefix survives.
+            return 0
+        best = max((len(os.path.commonprefix([prompt, previous])) for previous in slot_prompts), default=0)
+        return min(prompt_tokens - 1, best // CHARS_PER_TOKEN)
+
+    async def simulate(prompt: str, keep_alive, options: dict) -> tuple[dict, str]:
+        load_seconds = await ensure_loaded(keep_alive, options.get("num_ctx"))
+
+        prompt_tokens = max(1, len(prompt) // CHARS_PER_TOKEN)
+        cached = cached_tokens(prompt, prompt_tokens)
+        evaluated = prompt_tokens - cached
+        prompt_seconds = evaluated / config.prompt_tokens_per_second
+        slot_prompts.append(prompt)
+        totals["requests"] += 1
+        totals["prompt_tokens"] += prompt_tokens
+        totals["cached_tokens"] += cached
+        totals["truncated"] += int(prompt_tokens > state["num_ctx"])
+        totals["prompt_eval_seconds"] += prompt_seconds
+        await asyncio.sleep(prompt_seconds)
+
+        if rng.random() < config.malformed_rate:
+            text = "Sure! Here are the issues I found: the code looks mostly fine."
+        else:
+            text = json.dumps(_fake_issues(rng), separators=(",", ":"))
+
+        stats = {
+            "model": config.model,
+            "done": True,
+            "load_duration": int(load_seconds * 1e9),
+            "prompt_eval_count": evaluated,
+            "prompt_eval_duration": int(prompt_seconds * 1e9),
+            "eval_count": config.output_tokens,
+            "eval_duration": int(config.output_tokens / config.eval_tokens_per_second * 1e9),
+        }
+        return stats, text
+
+    def generate_body(text: str) -> dict:
+        return {"response": text}
+
+    def chat_body(text: str) -> dict:
+        return {"message": {"role": "assistant", "content": text}}
+
+    async def stream_tokens(text: str, stats: dict, started: float, body=generate_body):
+        pieces = [text[i : i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)] or [""]
+        per_piece = config.output_tokens / config.eval_tokens_per_second / len(pieces)
+        for piece in pieces:
+            await asyncio.sleep(per_piece)
+            chunk = {"model": config.model, **body(piece), "done": False}
+            yield json.dumps(chunk) + "\n"
+        final = {**stats, **body(""), "total_duration": int((time.perf_counter() - started) * 1e9)}
+        yield json.dumps(final) + "\n"
+
+    async def respond(request_body: dict, prompt: str, started: float, body):
+        options = request_body.get("options") or {}
+        stats, text = await simulate(prompt, request_body.get("keep_alive"), options)
+
+        if request_body.get("stream", True):
+            return StreamingResponse(
+                stream_tokens(text, stats, started, body), media_type="application/x-ndjson"
+            )
+
+        await asyncio.sleep(stats["eval_duration"] / 1e9)
+        total_duration = int((time.perf_counter() - started) * 1e9)
+        return JSONResponse({**stats, **body(text), "total_duration": total_duration})
+
+    async def load_only(request_body: dict, body) -> dict:
+        options = request_body.get("options") or {}
+        load_seconds = await ensure_loaded(request_body.get("keep_alive"), options.get("num_ctx"))
+        return {
+            "model": config.model,
+            **body(""),
+            "done": True,
+            "done_reason": "load",
+            "load_duration": int(load_seconds * 1e9),
+        }
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": config.model}]}
+
+    @app.get("/api/ps")
+    async def running():
+        return {"models": [{"name": config.model}] if state["loaded"] else [], "loads": state["loads"]}
+
+    @app.get("/bench/stats")
+    async def bench_stats():
+        return {
+            **totals,
+            "prompt_eval_seconds": round(totals["prompt_eval_seconds"], 3),
+            "loads": state["loads"],
+        }
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        started = time.perf_counter()
+        body = await request.json()
+        if "prompt" not in body:
+            # Ollama treats a generate call without a prompt as "load the model".
+            return await load_only(body, generate_body)
+
+        prompt = str(body.get("system") or "") + str(body.get("prompt") or "")
+        return await respond(body, prompt, started, generate_body)
+
+    def render_chat(messages: list[dict]) -> str:
+        # Stand-in for the model's chat template: messages are rendered in order into one prompt.
+        return "".join(f"<|{message.get('role')}|>{message.get('content') or ''}\n" for message in messages)
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        started = time.perf_counter()
+        body = await request.json()
+        messages = body.get("messages") or []
+        if not messages:
+            return await load_only(body, chat_body)
+        return await respond(body, render_chat(messages), started, chat_body)
+
+    # OpenAI-compatible API as served by llama.cpp's llama-server (including its `timings` extension).
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": config.model, "object": "model"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        # These servers load their model at startup and keep it loaded.
+        stats, text = await simulate(render_chat(body.get("messages") or []), -1, {})
+        await asyncio.sleep(stats["eval_duration"] / 1e9)
+        return {
+            "object": "chat.completion",
+            "model": body.get("model") or config.model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": stats["prompt_eval_count"],
+                "completion_tokens": stats["eval_count"],
+                "total_tokens": stats["prompt_eval_count"] + stats["eval_count"],
+            },
+            "timings": {
+                "prompt_ms": stats["prompt_eval_duration"] / 1e6,
+                "predicted_ms": stats["eval_duration"] / 1e6,
+            },
+        }
+
+    return app
@@ -0,0 +1,228 @@
+"""Offline benchmark of the LLM review pipeline (prompt build, Ollama call, parsing) per prompt variant.
+
+Replays a corpus of diffs through ``LLMService.analyze_diff`` against the fake Ollama server (or a local
+Ollama with ``--ollama-url``) and reports prompt size, Ollama prompt-eval/eval time and tokens, retries,
+parse failures and issue counts. A variant is a JSON file overriding any of ``system_prompt`` (or
+``system_prompt_file``), ``options``, ``max_diff_chars``, ``model``, ``triage_model`` and ``max_retries``, and
+``minimize_diff`` (true or ``{"context_lines": .., "max_line_chars": ..}``) to minimize each diff first.
+``--backend openai`` sends the corpus through the OpenAI-compatible backend instead of Ollama's.
+
+Usage (from ``backend``)::
+
+    python -m benchmarks.llm --variant benchmarks/variants/short_context.json --repeat 3
+    python -m benchmarks.llm --compare benchmarks/results/llm-A.json benchmarks/results/llm-B.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+from contextlib import nullcontext
+from dataclasses import asdict
+from pathlib import Path
+from time import perf_counter
+
+from benchmarks.fake_github import build_diff
+from benchmarks.fake_ollama import FakeOllamaConfig, create_fake_ollama
+from benchmarks.servers import ServerThread
+from benchmarks.stats import compare_results, compare_scenarios, run_metadata, summarize_latencies, write_results
+
+CORPUS_DIR = Path(__file__).resolve().parent / "fixtures" / "diffs"
+COMPARE_FIELDS = (
+    "latency_ms.p50",
+    "latency_ms.p95",
+    "prompt_chars.mean",
+    "prompt_tokens.mean",
+    "prompt_eval_ms.p95",
+    "eval_ms.p95",
+    "retries",
+    "parse_failures",
+    "failures",
+    "truncated",
+    "issues",
+)
+
+
+def load_corpus(corpus_dir: Path, generated: int, seed: int) -> list[tuple[str, str]]:
+    corpus = [(path.name, path.read_text(encoding="utf-8")) for path in sorted(corpus_dir.glob("*.diff"))]
+    for number in range(generated):
+        corpus.append((f"generated-{number}", build_diff("bench", "corpus", number, 4, 60, seed)))
+    return corpus
+
+
+def changed_files(diff_text: str) -> list[str]:
+    return re.findall(r"^\+\+\+ b/(.+)$", diff_text, flags=re.MULTILINE)
+
+
+def load_variant(path: Path) -> dict:
+    variant = json.loads(path.read_text(encoding="utf-8"))
+    if "system_prompt_file" in variant:
+        variant["system_prompt"] = (path.parent / variant.pop("system_prompt_file")).read_text(encoding="utf-8")
+    variant.setdefault("name", path.stem)
+    return variant
+
+
+def build_service(variant: dict, ollama_url: str, backend: str):
+    from app.core.config import get_settings
+    from app.services.llm_backends import OllamaBackend, OpenAICompatibleBackend
+    from app.services.llm_service import LLMService
+    from app.services.ollama_pool import OllamaPool
+
+    settings = get_settings()
+    service = LLMService()
+    # The corpus is replayed one diff at a time, so a single slot is enough.
+    if backend == "openai":
+        pool = OllamaPool([ollama_url], health_check_interval=0, health_path=OpenAICompatibleBackend.health_path)
+        service.backend = OpenAICompatibleBackend(pool, 1, settings.LLM_TIMEOUT_SECONDS)
+    else:
+        pool = OllamaPool([ollama_url], health_check_interval=0)
+        service.backend = OllamaBackend(pool, 1, settings.LLM_TIMEOUT_SECONDS, settings.OLLAMA_KEEP_ALIVE)
+    service.system_prompt = variant.get("system_prompt", service.system_prompt)
+    service.options = {**service.options, **variant.get("options", {})}
+    service.max_diff_chars = variant.get("max_diff_chars", service.max_diff_chars)
+    service.model = variant.get("model", service.model)
+    service.max_retries = variant.get("max_retries", service.max_retries)
+    service.triage_model = variant.get("triage_model", service.triage_model)
+    return service
+
+
+def _spread(values: list[float]) -> dict[str, float]:
+    summary = summarize_latencies(values)
+    return {"p50": summary["p50"], "p95": summary["p95"], "mean": summary["mean"], "max": summary["max"]}
+
+
+def minimizer(variant: dict):
+    from app.services.diff_minimizer import minimize_diff
+
+    option = variant.get("minimize_diff")
+    if not option:
+        return None
+    kwargs = option if isinstance(option, dict) else {}
+    return lambda diff_text: minimize_diff(diff_text, **kwargs).text
+
+
+async def run_variant(
+    variant: dict, ollama_url: str, corpus: list[tuple[str, str]], repeat: int, backend: str
+) -> dict:
+    service = build_service(variant, ollama_url, backend)
+    minimize = minimizer(variant)
+    if minimize:
+        corpus = [(name, minimize(diff_text)) for name, diff_text in corpus]
+    calls = []
+    for _ in range(repeat):
+        for name, diff_text in corpus:
+            usage: dict = {}
+            started = perf_counter()
+            result = await service.analyze_diff(diff_text, changed_files(diff_text), usage=usage)
+            issues = result.get("issues", [])
+            calls.append(
+                {
+                    "diff": name,
+                    "latency_ms": (perf_counter() - started) * 1000,
+                    "failed": any(issue.get("file") == "system" for issue in issues),
+                    "issues": len(issues),
+                    **usage,
+                }
+            )
+
+    succeeded = [call for call in calls if not call["failed"]]
+    return {
+        "calls": len(calls),
+        "latency_ms": summarize_latencies([call["latency_ms"] for call in calls]),
+        "prompt_chars": _spread([call["prompt_chars"] for call in calls]),
+        "prompt_tokens": _spread([call.get("prompt_eval_count", 0) for call in calls]),
+        "output_tokens": _spread([call.get("eval_count", 0) for call in calls]),
+        "prompt_eval_ms": _spread([call.get("prompt_eval_duration", 0) / 1e6 for call in calls]),
+        "eval_ms": _spread([call.get("eval_duration", 0) / 1e6 for call in calls]),
+        "retries": sum(call["attempts"] - 1 for call in calls),
+        "parse_failures": sum(call["parse_failures"] for call in calls),
+        "failures": len(calls) - len(succeeded),
+        "truncated": sum(1 for call in calls if call["diff_truncated"]),
+        "issues": sum(call["issues"] for call in succeeded),
+    }
+
+
+def configure_environment(ollama_url: str | None) -> None:
+    # Settings are read at import time, so this must run before anything imports `app`.
+    if ollama_url:
+        os.environ.update({"OLLAMA_BASE_URL": ollama_url, "OLLAMA_BASE_URLS": ollama_url})
+
+
+def report(scenarios: dict) -> str:
+    names = list(scenarios)
+    baseline = {"scenarios": {name: scenarios[names[0]] for name in names[1:]}}
+    lines = [
+        f"{name:<24}calls={summary['calls']} p50={summary['latency_ms']['p50']}ms "
+        f"p95={summary['latency_ms']['p95']}ms prompt_tokens={summary['prompt_tokens']['mean']} "
+        f"retries={summary['retries']} parse_failures={summary['parse_failures']} issues={summary['issues']}"
+        for name, summary in scenarios.items()
+    ]
+    if len(names) > 1:
+        lines.append(f"\nCompared with {names[0]}:")
+        lines.extend(compare_scenarios(baseline, {"scenarios": scenarios}, COMPARE_FIELDS))
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.llm")
+    parser.add_argument("--corpus", type=Path, default=CORPUS_DIR, help="Directory of *.diff files")
+    parser.add_argument("--generate", type=int, default=0, help="Add this many synthetic diffs")
+    parser.add_argument("--variant", type=Path, action="append", default=[], help="Prompt variant JSON")
+    parser.add_argument("--no-baseline", action="store_true", help="Skip the current-settings variant")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--backend", choices=("ollama", "openai"), default="ollama", help="LLM API to call")
+    parser.add_argument("--ollama-url", default=None, help="Use a local server instead of the fake one")
+    parser.add_argument("--ollama-tps", type=float, default=40.0, help="Generated tokens per second")
+    parser.add_argument("--ollama-prompt-tps", type=float, default=400.0)
+    parser.add_argument("--ollama-output-tokens", type=int, default=120)
+    parser.add_argument("--ollama-malformed-rate", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASELINE", "CANDIDATE"))
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.compare:
+        print(compare_results(args.compare[0], args.compare[1], COMPARE_FIELDS))
+        return 0
+
+    configure_environment(args.ollama_url)
+    corpus = load_corpus(args.corpus, args.generate, args.seed)
+    if not corpus:
+        raise SystemExit(f"No *.diff files in {args.corpus} and --generate is 0")
+    variants = ([] if args.no_baseline else [{"name": "baseline"}]) + [load_variant(p) for p in args.variant]
+    ollama = FakeOllamaConfig(
+        eval_tokens_per_second=args.ollama_tps,
+        prompt_tokens_per_second=args.ollama_prompt_tps,
+        output_tokens=args.ollama_output_tokens,
+        malformed_rate=args.ollama_malformed_rate,
+        seed=args.seed,
+    )
+
+    scenarios = {}
+    for variant in variants:
+        # A fresh fake server per variant so its prompt cache does not leak between variants.
+        server = nullcontext() if args.ollama_url else ServerThread(create_fake_ollama(ollama))
+        with server as fake:
+            url = args.ollama_url or fake.base_url
+            scenarios[variant["name"]] = asyncio.run(run_variant(variant, url, corpus, max(1, args.repeat), args.backend))
+
+    print(report(scenarios))
+    config = {
+        "corpus": [name for name, _ in corpus],
+        "repeat": max(1, args.repeat),
+        "backend": args.backend,
+        "variants": variants,
+        "ollama": args.ollama_url or asdict(ollama),
+    }
+    output = write_results({"meta": run_metadata(config), "scenarios": scenarios}, args.output, "llm")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
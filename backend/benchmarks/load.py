@@ -0,0 +1,271 @@
+"""Load driver for the API against in-process fake GitHub and Ollama servers.
+
+Usage (from ``backend``)::
+
+    python -m benchmarks.load --requests 200 --concurrency 16
+    python -m benchmarks.load --compare benchmarks/results/a.json benchmarks/results/b.json
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import asdict
+from itertools import count
+from pathlib import Path
+from time import perf_counter
+
+import httpx
+
+from benchmarks.fake_github import OWNER, FakeGitHubConfig, create_fake_github
+from benchmarks.fake_ollama import FakeOllamaConfig, create_fake_ollama
+from benchmarks.servers import ServerThread
+from benchmarks.stats import compare_results, run_metadata, summarize_latencies, write_results
+
+SCENARIOS = ("auth_login", "auth_me", "reviews", "repos_pending_prs", "review")
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "BenchPassword123"
+
+
+def configure_app_environment(
+    github_url: str, ollama_url: str | list[str], workdir: Path, llm_backend: str = "ollama"
+) -> None:
+    # Settings are read at import time, so this must run before anything imports `app`.
+    ollama_urls = [ollama_url] if isinstance(ollama_url, str) else ollama_url
+    os.environ.update(
+        {
+            "DATABASE_URL": f"sqlite:///{workdir / 'bench.db'}",
+            "GITHUB_API_BASE_URL": github_url,
+            "LLM_BACKEND": llm_backend,
+            "OLLAMA_BASE_URL": ollama_urls[0],
+            "OLLAMA_BASE_URLS": ",".join(ollama_urls),
+            "OPENAI_BASE_URLS": ",".join(ollama_urls),
+            "JWT_SECRET_KEY": "benchmark-secret",
+            "GENERAL_RATE_LIMIT_PER_MIN": "100000000",
+            "REVIEW_RATE_LIMIT_PER_MIN": "100000000",
+            "PROFILING_SAMPLE_RATE": "0",
+            "PROFILING_TOKEN": "",
+        }
+    )
+
+
+def start_api() -> ServerThread:
+    import logging
+
+    from app.main import app
+
+    logging.getLogger("app.request").setLevel(logging.WARNING)
+    return ServerThread(app).start()
+
+
+def connect_bench_user_to_github() -> None:
+    from app.core.database import SessionLocal
+    from app.models.user import User
+    from app.services.token_crypto import encrypt_secret
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == BENCH_EMAIL).first()
+        user.github_token_encrypted = encrypt_secret("bench-github-token")
+        user.github_username = "bench-user"
+        db.commit()
+    finally:
+        db.close()
+
+
+async def seed_user(client: httpx.AsyncClient) -> dict[str, str]:
+    credentials = {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+    response = await client.post("/auth/signup", json=credentials)
+    if response.status_code != 201:
+        response = await client.post("/auth/login", json=credentials)
+    response.raise_for_status()
+    connect_bench_user_to_github()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def build_request_factory(name: str, auth: dict[str, str], github: FakeGitHubConfig):
+    sequence = count()
+
+    def factory() -> tuple[str, str, dict]:
+        index = next(sequence)
+        if name == "auth_login":
+            return "POST", "/auth/login", {"json": {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}}
+        if name == "auth_me":
+            return "GET", "/auth/me", {"headers": auth}
+        if name == "reviews":
+            return "GET", "/reviews", {"headers": auth}
+        if name == "repos_pending_prs":
+            params = {"max_repos": min(github.repos, 100), "pulls_per_repo": github.pulls_per_repo}
+            return "GET", "/github/repos-pending-prs", {"headers": auth, "params": params}
+        if name == "review":
+            payload = {
+                "repo_owner": OWNER,
+                "repo_name": f"repo-{index % max(1, github.repos)}",
+                "pr_number": index % max(1, github.pulls_per_repo) + 1,
+            }
+            return "POST", "/review", {"headers": auth, "json": payload}
+        raise ValueError(f"Unknown scenario: {name}")
+
+    return factory
+
+
+async def run_scenario(client: httpx.AsyncClient, factory, total: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    statuses: Counter[str] = Counter()
+    remaining = iter(range(total))
+
+    async def worker() -> None:
+        for _ in remaining:
+            method, path, kwargs = factory()
+            started = perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as exc:
+                statuses[type(exc).__name__] += 1
+            latencies.append((perf_counter() - started) * 1000)
+
+    wall_started = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = perf_counter() - wall_started
+
+    errors = sum(value for key, value in statuses.items() if not key.startswith("2"))
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "status_counts": dict(statuses),
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(total / wall, 2) if wall else 0.0,
+        "latency_ms": summarize_latencies(latencies),
+    }
+
+
+async def drive(base_url: str, args: argparse.Namespace, github: FakeGitHubConfig) -> dict:
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        auth = await seed_user(client)
+        results: dict[str, dict] = {}
+        for name in args.scenarios:
+            total = args.review_requests if name == "review" else args.requests
+            factory = build_request_factory(name, auth, github)
+            if args.warmup:
+                await run_scenario(client, factory, min(args.warmup, total), args.concurrency)
+            results[name] = await run_scenario(client, factory, total, args.concurrency)
+            summary = results[name]
+            print(
+                f"{name:<20} {summary['throughput_rps']:>8} req/s  "
+                f"p50={summary['latency_ms']['p50']}ms p95={summary['latency_ms']['p95']}ms "
+                f"p99={summary['latency_ms']['p99']}ms errors={summary['errors']}"
+            )
+        return results
+
+
+def collect_ollama_stats(urls: list[str]) -> dict:
+    totals: Counter[str] = Counter()
+    for url in urls:
+        totals.update(httpx.get(f"{url}/bench/stats", timeout=10).json())
+    stats = dict(totals)
+    stats["prompt_eval_seconds"] = round(stats.get("prompt_eval_seconds", 0.0), 3)
+    prompt_tokens = stats.get("prompt_tokens", 0)
+    stats["cached_token_ratio"] = round(stats.get("cached_tokens", 0) / prompt_tokens, 3) if prompt_tokens else 0.0
+    return stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--review-requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--github-repos", type=int, default=25)
+    parser.add_argument("--github-pulls", type=int, default=3)
+    parser.add_argument("--github-latency-ms", type=float, default=40.0)
+    parser.add_argument("--github-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--diff-files", type=int, default=4)
+    parser.add_argument("--diff-lines", type=int, default=60)
+    parser.add_argument("--ollama-tps", type=float, default=40.0, help="Generated tokens per second")
+    parser.add_argument("--ollama-prompt-tps", type=float, default=400.0)
+    parser.add_argument("--ollama-output-tokens", type=int, default=120)
+    parser.add_argument("--ollama-malformed-rate", type=float, default=0.0)
+    parser.add_argument("--ollama-cold-load-ms", type=float, default=0.0)
+    parser.add_argument("--ollama-nodes", type=int, default=1, help="Fake Ollama servers to balance across")
+    parser.add_argument(
+        "--llm-backend", choices=("ollama", "openai"), default="ollama", help="API the app uses to reach the fakes"
+    )
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BASELINE", "CANDIDATE"))
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.compare:
+        fields = ("throughput_rps", "latency_ms.p50", "latency_ms.p95", "latency_ms.p99", "errors")
+        print(compare_results(args.compare[0], args.compare[1], fields))
+        return 0
+
+    github = FakeGitHubConfig(
+        repos=args.github_repos,
+        pulls_per_repo=args.github_pulls,
+        diff_files=args.diff_files,
+        diff_lines_per_file=args.diff_lines,
+        latency_ms=args.github_latency_ms,
+        jitter_ms=args.github_jitter_ms,
+        seed=args.seed,
+    )
+    ollama = FakeOllamaConfig(
+        eval_tokens_per_second=args.ollama_tps,
+        prompt_tokens_per_second=args.ollama_prompt_tps,
+        output_tokens=args.ollama_output_tokens,
+        malformed_rate=args.ollama_malformed_rate,
+        cold_load_ms=args.ollama_cold_load_ms,
+        seed=args.seed,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="prism-bench-") as workdir:
+        with ExitStack() as stack:
+            github_server = stack.enter_context(ServerThread(create_fake_github(github)))
+            ollama_urls = [
+                stack.enter_context(ServerThread(create_fake_ollama(ollama))).base_url
+                for _ in range(max(1, args.ollama_nodes))
+            ]
+            configure_app_environment(github_server.base_url, ollama_urls, Path(workdir), args.llm_backend)
+            api = start_api()
+            try:
+                scenarios = asyncio.run(drive(api.base_url, args, github))
+            finally:
+                api.stop()
+            ollama_stats = collect_ollama_stats(ollama_urls)
+            print(
+                f"ollama prompt tokens={ollama_stats['prompt_tokens']} "
+                f"cached={ollama_stats['cached_tokens']} truncated={ollama_stats['truncated']} "
+                f"prompt_eval={ollama_stats['prompt_eval_seconds']}s"
+            )
+
+    config = {
+        "scenarios": args.scenarios,
+        "requests": args.requests,
+        "review_requests": args.review_requests,
+        "concurrency": args.concurrency,
+        "github": asdict(github),
+        "ollama": asdict(ollama),
+        "llm_backend": args.llm_backend,
+        "ollama_nodes": max(1, args.ollama_nodes),
+    }
+    output = write_results(
+        {"meta": run_metadata(config), "scenarios": scenarios, "ollama": ollama_stats}, args.output, "load"
+    )
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
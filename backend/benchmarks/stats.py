@@ -0,0 +1,84 @@
+import json
+import math
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_latencies(latencies_ms: list[float]) -> dict[str, float]:
+    values = sorted(latencies_ms)
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    return {
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "mean": round(sum(values) / len(values), 2),
+        "max": round(values[-1], 2),
+    }
+
+
+def run_metadata(config: dict) -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "config": config,
+    }
+
+
+def write_results(results: dict, output: Path | None, prefix: str) -> Path:
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"{prefix}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, sort_keys=True), encoding="utf-8")
+    return output
+
+
+def _delta(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def compare_scenarios(baseline: dict, candidate: dict, fields: tuple[str, ...]) -> list[str]:
+    lines = [f"{'scenario':<24}{'metric':<18}{'baseline':>12}{'candidate':>12}{'delta':>10}"]
+    for name, after in candidate.get("scenarios", {}).items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        for field in fields:
+            group, _, key = field.partition(".")
+            old = before.get(group, {}).get(key) if key else before.get(group)
+            new = after.get(group, {}).get(key) if key else after.get(group)
+            if old is None or new is None:
+                continue
+            lines.append(f"{name:<24}{field:<18}{old:>12}{new:>12}{_delta(old, new):>10}")
+    return lines
+
+
+def compare_results(baseline_path: Path, candidate_path: Path, fields: tuple[str, ...]) -> str:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    candidate = json.loads(candidate_path.read_text(encoding="utf-8"))
+    lines = compare_scenarios(baseline, candidate, fields)
+
+    # Fake Ollama counters (prompt tokens evaluated vs served from the prompt cache), when both runs have them.
+    before_ollama, after_ollama = baseline.get("ollama") or {}, candidate.get("ollama") or {}
+    for field in ("prompt_tokens", "cached_tokens", "truncated", "prompt_eval_seconds"):
+        old, new = before_ollama.get(field), after_ollama.get(field)
+        if old is None or new is None:
+            continue
+        lines.append(f"{'ollama':<24}{field:<18}{old:>12}{new:>12}{_delta(old, new):>10}")
+    return "\n".join(lines)
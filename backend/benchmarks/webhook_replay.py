@@ -0,0 +1,104 @@
+"""Replay recorded GitHub webhook payloads against the API, fully offline.
+
+Usage (from ``backend``)::
+
+    python -m benchmarks.webhook_replay benchmarks/fixtures/pull_request_opened.json
+
+Each payload is signed with a throwaway secret and delivered twice (to exercise
+delivery-id de-duplication). The script then waits for the background review and
+checks that a follow-up ``POST /review`` is answered from the pre-computed result.
+Fixture head SHAs match what the fake GitHub reports for the same pull request.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import tempfile
+import uuid
+from pathlib import Path
+from time import perf_counter
+
+import httpx
+
+from benchmarks.fake_github import FakeGitHubConfig, create_fake_github
+from benchmarks.fake_ollama import FakeOllamaConfig, create_fake_ollama
+from benchmarks.load import configure_app_environment, seed_user, start_api
+from benchmarks.servers import ServerThread
+
+WEBHOOK_SECRET = "benchmark-webhook-secret"
+
+
+def cache_hits(metrics_text: str) -> int:
+    match = re.search(r"^review_cache_hits_total (\d+)", metrics_text, re.MULTILINE)
+    return int(match.group(1)) if match else 0
+
+
+async def replay(base_url: str, payload_paths: list[Path], timeout: float) -> int:
+    from app.services.webhook_service import sign_payload
+
+    failures = 0
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        auth = await seed_user(client)
+        for path in payload_paths:
+            body = path.read_bytes()
+            payload = json.loads(body)
+            headers = {
+                "X-GitHub-Event": "pull_request",
+                "X-GitHub-Delivery": str(uuid.uuid4()),
+                "X-Hub-Signature-256": sign_payload(WEBHOOK_SECRET, body),
+                "Content-Type": "application/json",
+            }
+            first = await client.post("/github/webhook", content=body, headers=headers)
+            second = await client.post("/github/webhook", content=body, headers=headers)
+            print(f"{path.name}: delivery -> {first.json()}, redelivery -> {second.json()}")
+
+            started = perf_counter()
+            review_request = {
+                "repo_owner": payload["repository"]["owner"]["login"],
+                "repo_name": payload["repository"]["name"],
+                "pr_number": payload["pull_request"]["number"],
+            }
+            while perf_counter() - started < timeout:
+                reviews = (await client.get("/reviews", headers=auth)).json()
+                if any(review["pr_number"] == review_request["pr_number"] for review in reviews):
+                    break
+                await asyncio.sleep(0.2)
+            else:
+                print(f"{path.name}: background review did not finish within {timeout}s")
+                failures += 1
+                continue
+
+            hits_before = cache_hits((await client.get("/metrics")).text)
+            click_started = perf_counter()
+            response = await client.post("/review", json=review_request, headers=auth)
+            click_ms = (perf_counter() - click_started) * 1000
+            cache_hit = cache_hits((await client.get("/metrics")).text) > hits_before
+            print(f"{path.name}: /review status={response.status_code} in {click_ms:.1f} ms (cache hit: {cache_hit})")
+            failures += 0 if response.status_code == 200 and cache_hit else 1
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.webhook_replay")
+    parser.add_argument("payloads", nargs="+", type=Path)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="prism-webhook-") as workdir:
+        fake_github = create_fake_github(FakeGitHubConfig(latency_ms=5, jitter_ms=0))
+        fake_ollama = create_fake_ollama(FakeOllamaConfig(eval_tokens_per_second=400))
+        with ServerThread(fake_github) as github_server, ServerThread(fake_ollama) as ollama_server:
+            configure_app_environment(github_server.base_url, ollama_server.base_url, Path(workdir))
+            os.environ["GITHUB_WEBHOOK_SECRET"] = WEBHOOK_SECRET
+            api = start_api()
+            try:
+                failures = asyncio.run(replay(api.base_url, args.payloads, args.timeout))
+            finally:
+                api.stop()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())